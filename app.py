@@ -1,11 +1,17 @@
-import math
+"""Legacy single-file calculator API, kept as dict adapters over the shared services."""
 import csv
 import os
 from datetime import datetime
-
-EARTHS_RADIUS_MILES = 3959
-EARTH_RADIUS_KM = 6371
-EARTH_RADIUS_NAUTICAL_MILES = 3440
+from config.constants import (
+    EARTH_RADIUS_KM,
+    EARTH_RADIUS_NAUTICAL_MILES,
+    EARTH_RADIUS_MILES as EARTHS_RADIUS_MILES
+)
+from models.airport import Airport
+from models.airport_columns import AirportColumns
+from services import distance_calculator, route_calculator
+from services.batch_engine import compute_canonical_batch, summarize_route_batch
+from services.pair_dedup import canonicalize_pairs
 
 AIRPORT_DATA = [
     ["Airport_Code", "Airport_Name", "City", "Country", "Latitude", "Longitude"],
@@ -57,151 +63,69 @@ def load_airport_database(filename):
         return {}
     
 def degrees_to_radians(degrees):
-    return degrees * math.pi / 180
+    return distance_calculator.degrees_to_radians(degrees)
 
 def calculate_great_circle_distance(lat1, lon1, lat2, lon2, unit='miles'):
-    #convert coordinates to radians 
-    lat1_rad = degrees_to_radians(lat1)
-    lon1_rad = degrees_to_radians(lon1)
-    lat2_rad = degrees_to_radians(lat2)
-    lon2_rad = degrees_to_radians(lon2)
-    
-    # calculate the differences
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-    
-    #Haversine formula --> a = sin²(Δlat/2) + cos(lat1) × cos(lat2) × sin²(Δlon/2)
-    a = (math.sin(dlat / 2) ** 2 + 
-         math.cos(lat1_rad) * math.cos(lat2_rad) * 
-         math.sin(dlon / 2) ** 2) 
-    
-    # c = 2 × atan2(√a, √(1−a))
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    # choose earths radius based on a desired unit
-    if unit == 'km': 
-        radius = EARTH_RADIUS_KM
-    elif unit == 'nautical_miles':
-        radius = EARTH_RADIUS_NAUTICAL_MILES
-    else:
-        radius = EARTHS_RADIUS_MILES
-        
-    # distance = Radius x c
-    distance = radius * c
-    
-    return round(distance, 2)
+    # Haversine distance rounded to 2 decimals; same engine as services.distance_calculator
+    return distance_calculator.haversine_distance((lat1, lon1), (lat2, lon2), unit)
 
 def calculate_inital_bearing(lat1, lon1, lat2, lon2):
-    """
-    Calculates the initial compass bearing from point 1 to point 2.
-    
-    WHY PILOTS NEED BEARING:
-    - Tells them what compass direction to fly
-    - Essential for navigation planning
-    - Shows you're thinking beyond just distance
-    """
-    
-    lat1_rad = degrees_to_radians(lat1)
-    lat2_rad = degrees_to_radians(lat2)
-    dlon_rad = degrees_to_radians(lon2 - lon1)
-    
-    # Formula for initial bearing
-    y = math.sin(dlon_rad) * math.cos(lat2_rad)
-    x = (math.cos(lat1_rad) * math.sin(lat2_rad) - 
-         math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon_rad))
-    
-    bearing_rad = math.atan2(y, x)
-    bearing_deg = (math.degrees(bearing_rad) + 360) % 360
-    
-    return round(bearing_deg, 1)
+    # Initial compass bearing from point 1 to point 2, rounded to 0.1°
+    return distance_calculator.calculate_initial_bearing((lat1, lon1), (lat2, lon2))
 
 def get_compass_direction(bearing):
     # Converts numeric bearing to compass direction. - Humans think in "Northeast" not "45.7 degrees"
-    directions = [
-        "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
-        "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"
-    ]
-    
-    # Each direction covers 22.5 degrees
-    index = round(bearing / 22.5) % 16
-    return directions[index]
+    return distance_calculator.bearing_to_compass_direction(bearing)
+
+def _to_airport(code, info):
+    # Airport object for one entry of the legacy code -> dict database
+    return Airport(code, info['name'], info['city'], info['country'],
+                   info['latitude'], info['longitude'])
+
+def _airport_to_dict(airport):
+    return {
+        'code': airport.code,
+        'name': airport.name,
+        'city': airport.city,
+        'country': airport.country,
+        'coordinates': airport.get_coordinates()
+    }
+
+def _route_to_dict(route):
+    # Legacy nested-dict view of a FlightRoute
+    hours, minutes = route.get_duration_minutes()
+    return {
+        'origin': _airport_to_dict(route.origin),
+        'destination': _airport_to_dict(route.destination),
+        'distance': {
+            'miles': route.distance_miles,
+            'kilometers': route.distance_km,
+            'nautical_miles': route.distance_nautical_miles
+        },
+        'bearing': route.bearing_degrees,
+        'compass_direction': route.compass_direction,
+        'estimated_flight_time': {
+            'hours': hours,
+            'minutes': minutes,
+            'total_hours': round(route.estimated_flight_hours, 2)
+        }
+    }
 
 def calculate_flight_route(origin_code, destination_code, airports):
-    #Calculates complete flight route information.
-    # - Returns everything needed for one flight
-    
-    #validate airport codes
+    # Calculates complete flight route information as a nested dict.
+    # - Adapter over services.route_calculator; returns None for unknown or identical codes
     if origin_code not in airports:
         print(f"Origin airport '{origin_code}' not found in database!")
         return None
     if destination_code not in airports:
         print(f"Destination airport '{destination_code}' not found in database!")
         return None
-    if origin_code == destination_code:
-        print(f"Origin and destination cannot be the same!")
-        
-    # get airport info
-    origin = airports[origin_code]
-    destination = airports[destination_code]
-    
-    #calculate flight distance
-    distance_miles = calculate_great_circle_distance(
-        origin['latitude'], origin['longitude'], 
-        destination['latitude'], destination['longitude'],
-        'miles'
-    )
-    
-    distance_km = calculate_great_circle_distance(
-        origin['latitude'], origin['longitude'],
-        destination['latitude'], destination['longitude'],
-        'km'
-    )
-    
-    distance_nm = calculate_great_circle_distance(
-        origin['latitude'], origin['longitude'],
-        destination['latitude'], destination['longitude'],
-        'nautical_miles'
-    )
     
-    # calculate bearing and compass direction
-    bearing = calculate_inital_bearing(
-        origin['latitude'], origin['longitude'],
-        destination['latitude'], destination['longitude']
+    route = route_calculator.calculate_flight_route(
+        _to_airport(origin_code, airports[origin_code]),
+        _to_airport(destination_code, airports[destination_code])
     )
-    
-    compass_direction = get_compass_direction(bearing)
-    estimated_flight_hours = distance_miles / 500
-    flight_hours = int(estimated_flight_hours)
-    flight_minutes = int((estimated_flight_hours - flight_hours) * 60)
-    
-    return {
-        'origin': {
-            'code': origin_code,
-            'name': origin['name'],
-            'city': origin['city'],
-            'country': origin['country'],
-            'coordinates': (origin['latitude'], origin['longitude']) 
-        },
-        'destination': {
-            'code': destination_code,
-            'name': destination['name'],
-            'city': destination['city'],
-            'country': destination['country'],
-            'coordinates': (origin['latitude'], origin['longitude'])
-        },
-        'distance': {
-            'miles': distance_miles,
-            'kilometers': distance_km,
-            'nautical_miles': distance_nm
-        },
-        'bearing': bearing,
-        'compass_direction': compass_direction,
-        'estimated_flight_time': {
-            'hours': flight_hours,
-            'minutes': flight_minutes,
-            'total_hours': round(estimated_flight_hours, 2)
-        }
-    }
+    return _route_to_dict(route) if route else None
     
 def display_route_info(route_info):
     # Displays formatted flight route information.
@@ -246,45 +170,35 @@ def display_route_info(route_info):
     print("\n" + "="*70)
     
 def batch_route_analysis(route_list, airports):
-    #Analyzes multiple routes and finds interesting patterns
-    
-    routes_analyzed = []
-    total_distance = 0
-    total_flight_time = 0
-    
+    # Analyzes multiple routes and finds interesting patterns
+    # - Each unique airport pair is computed once by the vectorized batch engine;
+    #   rows with unknown codes or the same airport at both ends are skipped
     print("\n🔍 ANALYZING MULTIPLE ROUTES...")
     print("-" * 50)
-
-    for i, (origin, destination) in enumerate(route_list, 1):
-        print(f"Calculating route {i}: {origin} → {destination}")
-        
-        route_info = calculate_flight_route(origin, destination, airports)
-        if route_info:
-            routes_analyzed.append(route_info)
-            total_distance += route_info['distance']['miles']
-            total_flight_time += route_info['estimated_flight_time']['total_hours']
-            
-    if not routes_analyzed:
-        return {}
     
-    # Find longest and shortest routes
-    routes_by_distance = sorted(routes_analyzed, key=lambda r: r['distance']['miles'])
-    shortest_route = routes_by_distance[0]
-    longest_route = routes_by_distance[-1]
+    columns = AirportColumns.from_airports(
+        {code: _to_airport(code, info) for code, info in airports.items()})
+    canonical = canonicalize_pairs(list(route_list), columns)
+    if canonical.skipped_unknown or canonical.skipped_same_airport:
+        print(f"Skipped {canonical.skipped_unknown} route(s) with unknown airports and "
+              f"{canonical.skipped_same_airport} with the same origin and destination")
+    if canonical.get_kept_count() == 0:
+        return {}
     
-    #calculate averages
-    avg_distance = total_distance / len(routes_analyzed)
-    avg_flight_time = total_flight_time / len(routes_analyzed)
+    batch = compute_canonical_batch(columns, canonical)
+    summary = summarize_route_batch(batch)
+    routes_analyzed = [_route_to_dict(batch.route(i)) for i in range(len(batch))]
+    print(f"Calculated {len(batch)} routes ({canonical.get_unique_count()} unique airport pairs)")
     
     return {
         'routes_analyzed': routes_analyzed,
         'total_routes': len(routes_analyzed),
-        'shortest_route': shortest_route,
-        'longest_route': longest_route,
-        'total_distance_miles': round(total_distance, 2),
-        'average_distance_miles': round(avg_distance, 2),
-        'total_flight_time_hours': round(total_flight_time, 2),
-        'average_flight_time_hours': round(avg_flight_time, 2)
+        'shortest_route': routes_analyzed[batch.argmin()],
+        'longest_route': routes_analyzed[batch.argmax()],
+        'total_distance_miles': round(summary.total_distance_miles, 2),
+        'average_distance_miles': round(summary.average_distance_miles, 2),
+        'total_flight_time_hours': round(summary.total_flight_time_hours, 2),
+        'average_flight_time_hours': round(summary.average_flight_time_hours, 2)
     }
     
 def display_batch_analysis(analysis):
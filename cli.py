@@ -1,45 +1,216 @@
 """Interactive command-line interface for flight planning."""
-import os
-from services.airport_loader import load_airport_database
+import queue
+import shlex
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airports
+from services.batch_stream import process_route_stream
 from services.route_calculator import validate_airport_codes, calculate_flight_route
-from utils.display import display_route_info, display_available_airports
+from services.spatial_index import NearestAirportIndex
+from utils.display import display_route_info, display_available_airports, display_batch_analysis
 from utils.file_io import save_route_analysis
 
-def interactive_route_planner():
+# Routes kept in the session cache (least recently used dropped first)
+ROUTE_CACHE_SIZE = 4096
+DEFAULT_NEAREST_COUNT = 5
+
+SESSION_COMMANDS = ("route", "nearest", "range", "batch", "save", "airports", "help", "quit", "exit", "q")
+
+SESSION_HELP = """
+  COMMANDS:
+   route ORIGIN DEST        Route analysis (or just: ORIGIN DEST)
+   nearest CODE|LAT LON [N] N nearest airports to an airport or a point
+   range CODE MILES         Airports within MILES of an airport
+   batch FILE               Analyze a CSV of origin,destination rows
+   save [FILE]              Save the last route or batch analysis
+   airports                 List available airports
+   help                     Show this help
+   quit                     Leave the planner
+"""
+
+
+class RouteSession:
+    # Interactive planner state that lives for the whole session
+    #
+    # The airport database, columns and nearest-airport index are built once;
+    # routes are cached, and saves go through a background writer thread so
+    # the prompt never waits on disk.
+
+    def __init__(self, airports=None):
+        self.airports = airports if airports is not None else load_airports()
+        self.columns = AirportColumns.from_airports(self.airports)
+        self.index = NearestAirportIndex(self.columns)
+        self.route_cache = OrderedDict()
+        self.last_result = None
+        self.last_name = None
+        self._save_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_saves, daemon=True)
+        self._writer.start()
+
+    def _write_saves(self):
+        while True:
+            item = self._save_queue.get()
+            if item is not None:
+                save_route_analysis(*item)
+            self._save_queue.task_done()
+            if item is None:
+                return
+
+    def get_route(self, origin_code, dest_code):
+        """Cached FlightRoute for a pair of codes, or None if the codes are invalid."""
+        key = (origin_code.strip().upper(), dest_code.strip().upper())
+        if key in self.route_cache:
+            self.route_cache.move_to_end(key)
+            return self.route_cache[key]
+
+        origin, destination = validate_airport_codes(*key, self.airports)
+        if not origin or not destination:
+            return None
+        route = calculate_flight_route(origin, destination)
+        self.route_cache[key] = route
+        if len(self.route_cache) > ROUTE_CACHE_SIZE:
+            self.route_cache.popitem(last=False)
+        return route
+
+    def _point_of(self, code):
+        index = self.columns.index_of(code.strip().upper())
+        if index is None:
+            print(f"  Airport '{code.strip().upper()}' not found in database")
+            return None
+        return index, self.columns.latitudes[index], self.columns.longitudes[index]
+
+    def _print_airports(self, indices, miles):
+        for index, distance in zip(indices, miles):
+            airport = self.columns.airport(index)
+            print(f"   • {airport.code:4s} | {airport.city:<20s} | {distance:>9,.1f} mi")
+
+    def show_route(self, origin_code, dest_code):
+        route = self.get_route(origin_code, dest_code)
+        if route:
+            display_route_info(route)
+            self.last_result = route
+            self.last_name = f"route_{route.origin.code}_to_{route.destination.code}"
+
+    def nearest(self, args):
+        count = DEFAULT_NEAREST_COUNT
+        if len(args) in (1, 2) and not args[0].lstrip('-').replace('.', '', 1).isdigit():
+            point = self._point_of(args[0])
+            if point is None:
+                return
+            exclude, lat, lon = point
+            count = int(args[1]) if len(args) == 2 else count
+        elif len(args) in (2, 3):
+            exclude = None
+            lat, lon = float(args[0]), float(args[1])
+            count = int(args[2]) if len(args) == 3 else count
+        else:
+            print("  Usage: nearest CODE [N] or nearest LAT LON [N]")
+            return
+
+        # One extra so the query airport itself can be dropped
+        indices, miles = self.index.k_nearest(lat, lon, count + (exclude is not None))
+        keep = indices != exclude
+        self._print_airports(indices[keep][:count], miles[keep][:count])
+
+    def within_range(self, args):
+        point = self._point_of(args[0])
+        if point is None:
+            return
+        index, lat, lon = point
+        indices, miles = self.index.within(lat, lon, float(args[1]))
+        keep = indices != index
+        print(f"  {np.count_nonzero(keep)} airports within {float(args[1]):,.0f} miles of {args[0].upper()}")
+        self._print_airports(indices[keep], miles[keep])
+
+    def batch(self, path):
+        with open(path, 'rb') as route_file:
+            partial = process_route_stream(route_file, self.columns)
+        analysis = partial.to_batch_analysis(self.columns)
+        display_batch_analysis(analysis)
+        self.last_result = analysis
+        self.last_name = "batch"
+
+    def save(self, filename=None):
+        if self.last_result is None:
+            print("  Nothing to save yet")
+            return
+        if filename is None:
+            timestamp = int(time.time())
+            filename = f"output/{self.last_name}_{timestamp}.txt"
+        self._save_queue.put((self.last_result, filename))
+        print(f"  Saving to '{filename}' in the background")
+
+    def execute(self, line):
+        """
+        Run one command line.
+
+        Returns:
+            False when the session should end, True otherwise
+        """
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            print(f"  Could not parse command: {e}")
+            return True
+        if not args:
+            return True
+
+        command, rest = args[0].lower(), args[1:]
+        try:
+            if command in ("quit", "exit", "q"):
+                return False
+            elif command == "help":
+                print(SESSION_HELP)
+            elif command == "airports":
+                display_available_airports(self.airports)
+            elif command == "route" and len(rest) == 2:
+                self.show_route(*rest)
+            elif len(args) == 2 and command not in SESSION_COMMANDS:
+                self.show_route(*args)
+            elif command == "nearest" and 1 <= len(rest) <= 3:
+                self.nearest(rest)
+            elif command == "range" and len(rest) == 2:
+                self.within_range(rest)
+            elif command == "batch" and len(rest) == 1:
+                self.batch(rest[0])
+            elif command == "save" and len(rest) <= 1:
+                self.save(*rest)
+            else:
+                print(f"  Unknown command '{line.strip()}'; type 'help' for commands")
+        except (ValueError, OSError) as e:
+            print(f"  Error: {e}")
+        return True
+
+    def close(self):
+        """Finish pending saves and stop the writer thread."""
+        self._save_queue.put(None)
+        self._writer.join()
+
+    def run(self):
+        """Read and execute commands until quit or end of input."""
+        print("\n   INTERACTIVE FLIGHT ROUTE PLANNER")
+        print("="*50)
+        print(f"  {len(self.airports)} airports loaded. Type 'help' for commands.")
+        try:
+            while True:
+                try:
+                    line = input("\nplanner> ")
+                except EOFError:
+                    break
+                if not self.execute(line):
+                    break
+        finally:
+            self.close()
+
+
+def interactive_route_planner(airports=None):
     """Run interactive flight route planning session."""
-    print("\n   INTERACTIVE FLIGHT ROUTE PLANNER")
-    print("="*50)
-    
-    # Load airport database
-    airports = load_airport_database()
+    if airports is None:
+        airports = load_airports()
     if not airports:
         print("  Cannot proceed without airport database")
         return
-    
-    # Show available airports
-    display_available_airports(airports)
-    
-    # Get user input
-    print("\n" + "-"*50)
-    origin_code = input("Enter origin airport code (e.g., LAX): ").strip().upper()
-    dest_code = input("Enter destination airport code (e.g., JFK): ").strip().upper()
-    
-    # Validate and get airport objects
-    origin, destination = validate_airport_codes(origin_code, dest_code, airports)
-    if not origin or not destination:
-        return
-    
-    # Calculate route
-    route = calculate_flight_route(origin, destination)
-    if not route:
-        return
-    
-    # Display results
-    display_route_info(route)
-    
-    # Offer to save
-    save_choice = input("\n  Save this route analysis to file? (y/n): ").strip().lower()
-    if save_choice == 'y':
-        timestamp = int(os.time.time()) # type: ignore
-        filename = f"output/route_{origin.code}_to_{destination.code}_{timestamp}.txt"
-        save_route_analysis(route, filename)
\ No newline at end of file
+    RouteSession(airports).run()
@@ -9,4 +9,37 @@ COMPASS_DIRECTIONS = [
     "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
     "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"
 ]
-COMPASS_SEGMENT_SIZE = 22.5  # degrees per segment
\ No newline at end of file
+COMPASS_SEGMENT_SIZE = 22.5  # degrees per segment
+
+# Assumed average commercial jet speed (for time estimation)
+AVERAGE_CRUISE_SPEED_MPH = 500.0
+
+# Wind-corrected time estimation
+DEFAULT_FLIGHT_LEVEL = 350      # flight level used when none is requested
+WIND_PATH_SAMPLES = 64          # points sampled along each great-circle path
+MIN_GROUND_SPEED_FRACTION = 0.25  # floor on ground speed as a fraction of airspeed
+
+# ETOPS diversion coverage
+ETOPS_DIVERSION_SPEED_MPH = 460.0       # one-engine-inoperative cruise speed, still air
+ETOPS_SAMPLE_SPACING_MILES = 20.0       # spacing of checked points along each leg
+
+# Persistent route result store
+ROUTE_MODEL_VERSION = 1                 # bump when route calculations change
+RESULT_STORE_MAX_ROWS = 2000000         # oldest results pruned beyond this
+
+# Lower bounds of the distance bands used in grouped reports (miles)
+DISTANCE_BANDS_MILES = (0, 500, 1000, 2000, 3000, 4500, 6000, 8000)
+
+# Differential accuracy harness (services.accuracy_harness): largest allowed
+# error of each engine against the extended-precision reference. Distances
+# are in the unit checked, bearings in degrees.
+ACCURACY_TOLERANCES = {
+    "scalar": {"distance": 0.0051, "bearing": 0.0501},       # rounds to 0.01 / 0.1°
+    "vectorized": {"distance": 2e-4, "bearing": 1e-7},       # haversine loses ~1e-4 at antipodes
+    "route_batch": {"distance": 2e-4, "bearing": 0.0501},    # bearing rounded to 0.1°
+    "shared_matrix": {"distance": 0.0015},                   # half a float32 ulp at 20,000 km
+    "all_pairs_tile": {"distance": 0.0015},                  # same float32 tiles
+    "chord_screening": {"distance": 5e-4},                   # far inside SCREENING_MARGIN
+    "global_top_k": {"distance": 2e-4, "bearing": 0.0501},   # reports route_batch values
+    "vector_angle": {"distance": 1e-8},
+}
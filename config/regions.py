@@ -0,0 +1,31 @@
+"""World regions that group countries in explorer views and reports."""
+
+# Countries by world region; anything unlisted is UNKNOWN_REGION
+REGION_BY_COUNTRY = {
+    "USA": "North America",
+    "Canada": "North America",
+    "Mexico": "North America",
+    "UK": "Europe",
+    "France": "Europe",
+    "Germany": "Europe",
+    "Netherlands": "Europe",
+    "Spain": "Europe",
+    "Italy": "Europe",
+    "Japan": "Asia",
+    "China": "Asia",
+    "Singapore": "Asia",
+    "India": "Asia",
+    "South Korea": "Asia",
+    "UAE": "Middle East",
+    "Qatar": "Middle East",
+    "Australia": "Oceania",
+    "New Zealand": "Oceania",
+    "Brazil": "South America",
+    "South Africa": "Africa",
+}
+UNKNOWN_REGION = "Other"
+
+
+def region_of(country):
+    """Return the world region a country belongs to."""
+    return REGION_BY_COUNTRY.get(country, UNKNOWN_REGION)
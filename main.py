@@ -1,20 +1,22 @@
 
 """
 Flight Path Distance Calculator 
+
+Subcommands import only the modules they use, so short invocations such as
+`python main.py route LAX JFK` never load NumPy; run with --profile-startup
+to see where start-up time goes.
 """
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
 import os
 import sys
 
 # Add project root to path for clean imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from services.airport_loader import load_airport_database
-from services.route_calculator import calculate_flight_route
-from utils.display import display_batch_analysis
-from utils.file_io import save_route_analysis
-from cli import interactive_route_planner
-from models.airport import BatchAnalysis
-
 # Popular international routes for demo
 POPULAR_ROUTES = [
     ("LAX", "JFK"),  # US Transcontinental
@@ -25,52 +27,56 @@ POPULAR_ROUTES = [
     ("CDG", "JFK"),  # Europe-US
 ]
 
-def analyze_batch_routes(route_pairs, airports):
-    """Analyze multiple routes and generate summary statistics."""
-    routes = []
-    total_distance = 0.0
-    total_time = 0.0
+def analyze_batch_routes(route_pairs, airports, aircraft=None, workers=1, store=None):
+    """
+    Analyze multiple routes and generate summary statistics.
+    
+    Requests are canonicalized first: codes are normalized, invalid and
+    same-airport rows skipped, and each unique airport pair is computed once
+    (across `workers` processes when > 1) before results are scattered back
+    in request order. With a RouteResultStore, pairs computed by earlier
+    runs are read from it. The returned BatchAnalysis holds a compact RouteBatch.
+    """
+    from models.airport_columns import AirportColumns
+    from services.batch_engine import compute_canonical_batch, summarize_route_batch
+    from services.pair_dedup import canonicalize_pairs
+    
+    columns = AirportColumns.from_airports(airports)
     
     print("\n  Analyzing multiple routes...")
     print("-" * 50)
     
-    for i, (origin_code, dest_code) in enumerate(route_pairs, 1):
-        print(f"  Route {i}/{len(route_pairs)}: {origin_code} → {dest_code}")
-        
-        if origin_code not in airports or dest_code not in airports:
-            print(f"     Skipping invalid route: {origin_code} → {dest_code}")
-            continue
-        
-        route = calculate_flight_route(airports[origin_code], airports[dest_code])
-        if route:
-            routes.append(route)
-            total_distance += route.distance_miles
-            total_time += route.estimated_flight_hours
-    
-    if not routes:
-        raise ValueError("No valid routes to analyze")
-    
-    # Sort by distance for min/max identification
-    routes_sorted = sorted(routes, key=lambda r: r.distance_miles)
-    
-    return BatchAnalysis(
-        routes=routes,
-        total_distance_miles=total_distance,
-        average_distance_miles=total_distance / len(routes),
-        total_flight_time_hours=total_time,
-        average_flight_time_hours=total_time / len(routes),
-        shortest_route=routes_sorted[0],
-        longest_route=routes_sorted[-1]
-    )
+    canonical = canonicalize_pairs(route_pairs, columns)
+    print(f"  {canonical.total_rows} route requests, "
+          f"{canonical.get_unique_count()} unique airport pairs")
+    samples = canonical.validation.samples
+    if canonical.skipped_unknown:
+        bad = samples["unknown_origin"] + samples["unknown_destination"]
+        examples = ", ".join(sorted({f"{o} → {d}" for _, o, d in bad})[:3])
+        print(f"     Skipping {canonical.skipped_unknown} routes with unknown airport codes (e.g. {examples})")
+    if canonical.skipped_same_airport:
+        examples = ", ".join(sorted({o for _, o, _ in samples["same_airport"]})[:3])
+        print(f"     Skipping {canonical.skipped_same_airport} routes with the same origin "
+              f"and destination (e.g. {examples})")
+    
+    batch = compute_canonical_batch(columns, canonical, aircraft=aircraft, workers=workers,
+                                    store=store)
+    return summarize_route_batch(batch)
 
 def main():
-    """Main program entry point."""
+    """Demo: popular routes analysis, then the interactive planner."""
+    from cli import interactive_route_planner
+    from services.airport_loader import load_airports
+    from services.result_store import RouteResultStore
+    from utils.display import display_batch_analysis
+    from utils.file_io import save_route_analysis
+    
     print("\n" + "✈️ " * 25)
     print("   FLIGHT PATH DISTANCE CALCULATOR")
     print("✈️ " * 25)
     
     # Load airport database
-    airports = load_airport_database()
+    airports = load_airports()
     if not airports:
         print("  Exiting due to airport database error")
         return
@@ -78,7 +84,7 @@ def main():
     # Demo batch analysis
     print("\n  Analyzing popular international routes...")
     try:
-        batch_analysis = analyze_batch_routes(POPULAR_ROUTES, airports)
+        batch_analysis = analyze_batch_routes(POPULAR_ROUTES, airports, store=RouteResultStore())
         display_batch_analysis(batch_analysis)
         
         # Save results
@@ -87,15 +93,274 @@ def main():
     except Exception as e:
         print(f"   Batch analysis skipped: {e}")
     
-    # Offer interactive mode
-    while True:
-        print("\n" + "-"*50)
-        choice = input("  Calculate a custom route? (y/n): ").strip().lower()
-        if choice != 'y':
-            break
-        interactive_route_planner()
+    # Offer interactive mode (one session; the database stays loaded)
+    print("\n" + "-"*50)
+    choice = input("  Calculate a custom route? (y/n): ").strip().lower()
+    if choice == 'y':
+        interactive_route_planner(airports)
     
     print("\n  Flight analysis complete! Safe travels!  \n")
 
+def _load_columns():
+    # Airport columns for a subcommand, or None (with a message) if loading failed
+    from models.airport_columns import AirportColumns
+    from services.airport_loader import load_airports
+    
+    airports = load_airports()
+    if not airports:
+        print("  Exiting due to airport database error")
+        return None
+    return AirportColumns.from_airports(airports)
+
+def run_route_command(args):
+    """One route between two airports; never imports NumPy."""
+    from contextlib import redirect_stdout
+    from services.airport_loader import load_airports
+    from services.route_calculator import calculate_flight_route, validate_airport_codes
+    from utils.display import display_route_info
+    
+    # Loader and validation messages go to stderr so stdout carries only the route
+    with redirect_stdout(sys.stderr):
+        airports = load_airports()
+        origin, destination = validate_airport_codes(args.origin, args.destination, airports)
+        route = calculate_flight_route(origin, destination) if origin and destination else None
+    if route is None:
+        return 1
+    
+    if args.brief:
+        print("\t".join(str(value) for value in (
+            route.origin.code, route.destination.code, route.distance_miles, route.distance_km,
+            route.distance_nautical_miles, route.bearing_degrees, route.compass_direction,
+            round(route.estimated_flight_hours, 4))))
+    else:
+        display_route_info(route)
+    return 0
+
+def run_shard_command(args):
+    """Plan, run or merge a sharded job (see services.sharding)."""
+    from services.sharding import merge_shards, pending_shards, plan_shards, run_shard
+    from utils.display import display_batch_analysis
+    
+    columns = _load_columns()
+    if columns is None:
+        return 1
+    
+    if args.shard_command == "plan":
+        shards = plan_shards(columns, args.job_dir, args.shards, kind=args.kind,
+                             route_file=args.routes, aircraft_type=args.aircraft)
+        print(f"  Planned {len(shards)} {args.kind} shards in {args.job_dir}")
+        for shard in shards:
+            print(f"     python main.py shard run {args.job_dir} {shard['id']}")
+    elif args.shard_command == "run":
+        partial = run_shard(args.job_dir, args.shard_id, columns)
+        print(f"  Shard {args.shard_id} complete: {partial.route_count} routes")
+    else:
+        missing = pending_shards(args.job_dir)
+        if missing:
+            print(f"  Cannot merge; shards still pending: {missing}")
+            return 1
+        merged = merge_shards(args.job_dir, columns)
+        display_batch_analysis(merged.to_batch_analysis(columns))
+    return 0
+
+def run_top_command(args):
+    """Show the K longest (or shortest) routes across the whole airport database."""
+    from services.aircraft_performance import load_aircraft_profiles
+    from services.global_top_k import global_top_k_routes
+    from utils.display import display_top_routes
+    
+    columns = _load_columns()
+    if columns is None:
+        return 1
+    aircraft = None
+    if args.aircraft:
+        profiles = load_aircraft_profiles()
+        if args.aircraft.upper() not in profiles:
+            print(f"  Unknown aircraft type '{args.aircraft}'")
+            return 1
+        aircraft = profiles[args.aircraft.upper()]
+    
+    batch = global_top_k_routes(columns, args.k, largest=not args.shortest, aircraft=aircraft)
+    kind = "shortest" if args.shortest else "longest"
+    display_top_routes(batch, f"Top {len(batch)} {kind} routes")
+    return 0
+
+def run_cluster_command(args):
+    """Cluster airports around k hubs, or evaluate a given hub set."""
+    from services.clustering import cluster_airports, evaluate_hubs, load_airport_weights
+    from utils.display import display_clusters
+    
+    columns = _load_columns()
+    if columns is None:
+        return 1
+    weights = load_airport_weights(args.weights, columns) if args.weights else None
+    
+    try:
+        if args.hubs:
+            result = evaluate_hubs(columns, args.hubs.split(","), weights)
+        else:
+            result = cluster_airports(columns, args.k, method=args.method, weights=weights,
+                                      seed=args.seed)
+    except ValueError as e:
+        print(f"  {e}")
+        return 1
+    display_clusters(result, limit=args.limit)
+    return 0
+
+def run_density_command(args):
+    """Rasterize a route CSV into a traffic density grid (.npz) and heat-map PNG."""
+    from services.density_raster import DENSITY_RASTER_NPZ, rasterize_route_file
+    
+    columns = _load_columns()
+    if columns is None:
+        return 1
+    
+    with open(args.routes, 'rb') as route_file:
+        raster = rasterize_route_file(route_file, columns, cell_degrees=args.cell)
+    npz_path = raster.save_npz(args.output or DENSITY_RASTER_NPZ)
+    png_path = raster.save_png(npz_path.with_suffix(".png"))
+    print(f"  Rasterized {int(raster.total_weight):,} legs ({raster.route_count:,} unique routes) "
+          f"onto {raster.grid.shape[0]} x {raster.grid.shape[1]} cells")
+    print(f"  Saved '{npz_path}' and '{png_path}'")
+    return 0
+
+def run_schedule_command(args):
+    """Weekly distance and block hours of a flight schedule, per flight number and country pair."""
+    from services.aircraft_performance import load_aircraft_profiles
+    from services.schedule import load_schedule, summarize_schedule
+    from utils.display import display_schedule_summary
+    
+    columns = _load_columns()
+    if columns is None:
+        return 1
+    aircraft = None
+    if args.aircraft:
+        profiles = load_aircraft_profiles()
+        if args.aircraft.upper() not in profiles:
+            print(f"  Unknown aircraft type '{args.aircraft}'")
+            return 1
+        aircraft = profiles[args.aircraft.upper()]
+    
+    try:
+        with open(args.schedule, 'rb') as schedule_file:
+            schedule = load_schedule(schedule_file, columns)
+        summary = summarize_schedule(schedule, aircraft=aircraft, period_start=args.start,
+                                     period_end=args.end)
+    except ValueError as e:
+        print(f"  {e}")
+        return 1
+    for group_by in ("flight_number", "country_pair"):
+        display_schedule_summary(summary, group_by, limit=args.limit)
+    return 0
+
+def run_publish_command(args):
+    """Publish airport columns and the distance matrix for the web app and other readers."""
+    from services.airport_loader import load_airports
+    from services.shared_store import prune_generations, publish_airport_data
+    
+    airports = load_airports()
+    if not airports:
+        print("  Exiting due to airport database error")
+        return 1
+    publish_airport_data(airports, include_distance_matrix=not args.no_matrix)
+    removed = prune_generations()
+    if removed:
+        print(f"  Removed {removed} old generation(s)")
+    return 0
+
+def build_parser():
+    from services.airport_loader import AIRPORT_BACKENDS
+    
+    parser = argparse.ArgumentParser(description="Flight Path Distance Calculator "
+                                     "(no subcommand runs the demo)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Report run time and the slowest imports on stderr")
+    parser.add_argument("--airports", choices=AIRPORT_BACKENDS,
+                        help="Airport data backend: the CSV, or the indexed SQLite database "
+                             "read on demand (default: $AIRPORT_BACKEND, else csv)")
+    commands = parser.add_subparsers(dest="command")
+    
+    route = commands.add_parser("route", help="One route between two airports (fast start)")
+    route.add_argument("origin")
+    route.add_argument("destination")
+    route.add_argument("--brief", action="store_true",
+                       help="Tab-separated: origin, destination, miles, km, nm, bearing, "
+                            "compass, hours")
+    
+    shard = commands.add_parser("shard", help="Sharded batch / all-pairs jobs")
+    shard_commands = shard.add_subparsers(dest="shard_command", required=True)
+    plan = shard_commands.add_parser("plan", help="Write shard specs for a job")
+    plan.add_argument("job_dir")
+    plan.add_argument("--shards", type=int, required=True)
+    plan.add_argument("--kind", choices=["all_pairs", "batch"], default="all_pairs")
+    plan.add_argument("--routes", help="Route CSV (batch jobs)")
+    plan.add_argument("--aircraft", help="Aircraft type code, e.g. A320")
+    run = shard_commands.add_parser("run", help="Process one shard")
+    run.add_argument("job_dir")
+    run.add_argument("shard_id", type=int)
+    merge = shard_commands.add_parser("merge", help="Combine finished shards")
+    merge.add_argument("job_dir")
+    
+    top = commands.add_parser("top", help="K longest / shortest routes between any two airports")
+    top.add_argument("k", type=int)
+    top.add_argument("--shortest", action="store_true")
+    top.add_argument("--aircraft", help="Aircraft type code, e.g. A320")
+    
+    cluster = commands.add_parser("cluster", help="Group airports into hub catchments")
+    cluster.add_argument("k", type=int, nargs="?", default=3)
+    cluster.add_argument("--method", default="kmedoids", help="kmeans or kmedoids")
+    cluster.add_argument("--weights", help="CSV of Airport_Code,Weight (e.g. traffic)")
+    cluster.add_argument("--hubs", help="Comma-separated hub codes to evaluate instead")
+    cluster.add_argument("--seed", type=int, default=0)
+    cluster.add_argument("--limit", type=int, default=20, help="Clusters to list")
+    
+    density = commands.add_parser("density", help="Route traffic density raster from a route CSV")
+    density.add_argument("routes", help="CSV of origin,destination legs")
+    density.add_argument("--cell", type=float, default=1.0, help="Cell size in degrees")
+    density.add_argument("--output", help="Output .npz path (default output/density_raster.npz)")
+    
+    publish = commands.add_parser("publish", help="Publish memory-mapped airport data "
+                                  "(and distance matrix) for the web app")
+    publish.add_argument("--no-matrix", action="store_true",
+                         help="Columns only, without the N x N distance matrix")
+    
+    schedule = commands.add_parser("schedule", help="Weekly totals of a flight schedule CSV")
+    schedule.add_argument("schedule", help="CSV of flight,origin,destination,days,valid_from,valid_to")
+    schedule.add_argument("--aircraft", help="Aircraft type for block hours and fuel (e.g. A320)")
+    schedule.add_argument("--start", help="First day of the period (YYYY-MM-DD)")
+    schedule.add_argument("--end", help="Last day of the period (YYYY-MM-DD)")
+    schedule.add_argument("--limit", type=int, default=20, help="Groups to list")
+    return parser
+
+COMMANDS = {
+    "route": run_route_command,
+    "shard": run_shard_command,
+    "top": run_top_command,
+    "cluster": run_cluster_command,
+    "density": run_density_command,
+    "schedule": run_schedule_command,
+    "publish": run_publish_command,
+}
+
+def run(argv=None):
+    """Parse arguments and run one subcommand (or the demo); returns the exit code."""
+    args = build_parser().parse_args(argv)
+    if args.airports:
+        from services.airport_loader import AIRPORT_BACKEND_ENV
+        # Through the environment so shard workers and process pools inherit it
+        os.environ[AIRPORT_BACKEND_ENV] = args.airports
+    profiler = None
+    if args.profile_startup:
+        from utils.startup_profile import StartupProfiler
+        profiler = StartupProfiler(started=_STARTED).install()
+    try:
+        if args.command is None:
+            main()
+            return 0
+        return COMMANDS[args.command](args)
+    finally:
+        if profiler is not None:
+            profiler.report()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(run())
@@ -0,0 +1,33 @@
+"""simple data model for aircraft performance profiles"""
+
+class AircraftProfile:
+    # Climb, cruise, descent and taxi performance for one aircraft type
+    def __init__(self, type_code, description, cruise_speed_mph,
+                 climb_minutes, climb_distance_miles,
+                 descent_minutes, descent_distance_miles,
+                 taxi_out_minutes, taxi_in_minutes,
+                 climb_fuel_kg, cruise_fuel_kg_per_hour, descent_fuel_kg,
+                 taxi_fuel_kg_per_minute):
+        self.type_code = type_code
+        self.description = description
+        self.cruise_speed_mph = float(cruise_speed_mph)
+        self.climb_minutes = float(climb_minutes)
+        self.climb_distance_miles = float(climb_distance_miles)
+        self.descent_minutes = float(descent_minutes)
+        self.descent_distance_miles = float(descent_distance_miles)
+        self.taxi_out_minutes = float(taxi_out_minutes)
+        self.taxi_in_minutes = float(taxi_in_minutes)
+        self.climb_fuel_kg = float(climb_fuel_kg)
+        self.cruise_fuel_kg_per_hour = float(cruise_fuel_kg_per_hour)
+        self.descent_fuel_kg = float(descent_fuel_kg)
+        self.taxi_fuel_kg_per_minute = float(taxi_fuel_kg_per_minute)
+
+    def get_transition_miles(self):
+        # Distance covered by climb and descent; shorter legs never reach cruise
+        return self.climb_distance_miles + self.descent_distance_miles
+
+    def get_taxi_hours(self):
+        return (self.taxi_out_minutes + self.taxi_in_minutes) / 60.0
+
+    def __str__(self) -> str:
+        return f"{self.type_code}: {self.description}"
@@ -21,7 +21,8 @@ class FlightRoute:
     # Complete flight route analysis between two airports
     def __init__(self, origin, destination, distance_miles, distance_km,
                  distance_nautical_miles, bearing_degrees, compass_direction,
-                 estimated_flight_hours):
+                 estimated_flight_hours, aircraft_type=None, block_hours=None,
+                 fuel_burn_kg=None):
         
         self.origin = origin
         self.destination = destination
@@ -31,6 +32,10 @@ class FlightRoute:
         self.bearing_degrees = bearing_degrees
         self.compass_direction = compass_direction
         self.estimated_flight_hours = estimated_flight_hours
+        # Only set when the route was estimated with an aircraft profile
+        self.aircraft_type = aircraft_type
+        self.block_hours = block_hours
+        self.fuel_burn_kg = fuel_burn_kg
 
     def get_duration_minutes(self):
         # Return flight time as (hours, minutes) tuple
@@ -43,7 +48,8 @@ class BatchAnalysis:
 
     def __init__(self, routes, total_distance_miles, average_distance_miles,
                  total_flight_time_hours, average_flight_time_hours,
-                 shortest_route, longest_route):
+                 shortest_route, longest_route, total_block_hours=None,
+                 total_fuel_burn_kg=None, total_routes=None):
         self.routes = routes
         self.total_distance_miles = total_distance_miles
         self.average_distance_miles = average_distance_miles
@@ -51,8 +57,14 @@ class BatchAnalysis:
         self.average_flight_time_hours = average_flight_time_hours
         self.shortest_route = shortest_route
         self.longest_route = longest_route
+        self.total_block_hours = total_block_hours
+        self.total_fuel_burn_kg = total_fuel_burn_kg
+        # Streamed analyses keep no per-route list, only the count
+        self.total_routes = total_routes
 
     def get_total_routes(self):
+        if self.total_routes is not None:
+            return self.total_routes
         return len(self.routes)
         
         
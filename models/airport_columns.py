@@ -0,0 +1,63 @@
+"""column-oriented airport data for vectorized calculations"""
+import numpy as np
+from models.airport import Airport
+
+class AirportColumns:
+    # Airports as parallel arrays, sorted by code; row number is the airport index
+    def __init__(self, codes, names, cities, country_ids, country_names,
+                 latitudes, longitudes):
+        self.codes = codes
+        self.names = names
+        self.cities = cities
+        self.country_ids = country_ids
+        self.country_names = list(country_names)
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self._index = None
+        self._airports = {}
+
+    @classmethod
+    def from_airports(cls, airports):
+        # Build columns from the code -> Airport dict returned by the loader
+        # items() lets a lazy repository read every airport in one pass
+        ordered = [airport for _, airport in sorted(airports.items(), key=lambda item: item[0])]
+        country_names = sorted({airport.country for airport in ordered})
+        country_lookup = {name: i for i, name in enumerate(country_names)}
+        columns = cls(
+            codes=np.array([a.code for a in ordered], dtype=str),
+            names=np.array([a.name for a in ordered], dtype=str),
+            cities=np.array([a.city for a in ordered], dtype=str),
+            country_ids=np.array([country_lookup[a.country] for a in ordered], dtype=np.int32),
+            country_names=country_names,
+            latitudes=np.array([a.latitude for a in ordered], dtype=np.float64),
+            longitudes=np.array([a.longitude for a in ordered], dtype=np.float64)
+        )
+        # Reuse the loader's Airport objects when routes are materialized
+        columns._airports = dict(enumerate(ordered))
+        return columns
+
+    def __len__(self):
+        return len(self.codes)
+
+    def index_of(self, code):
+        # Airport index for a code, or None if unknown
+        if self._index is None:
+            self._index = {str(c): i for i, c in enumerate(self.codes)}
+        return self._index.get(code)
+
+    def country_of(self, index):
+        return self.country_names[int(self.country_ids[index])]
+
+    def airport(self, index):
+        # Materialize (and memoize) the Airport object for one row
+        index = int(index)
+        if index not in self._airports:
+            self._airports[index] = Airport(
+                code=str(self.codes[index]),
+                name=str(self.names[index]),
+                city=str(self.cities[index]),
+                country=self.country_of(index),
+                latitude=self.latitudes[index],
+                longitude=self.longitudes[index]
+            )
+        return self._airports[index]
@@ -0,0 +1,130 @@
+"""compact struct-of-arrays container for many flight routes"""
+import numpy as np
+from config.constants import (
+    EARTH_RADIUS_KM,
+    EARTH_RADIUS_MILES,
+    EARTH_RADIUS_NAUTICAL_MILES,
+    COMPASS_DIRECTIONS,
+    COMPASS_SEGMENT_SIZE
+)
+from models.airport import FlightRoute
+
+KM_PER_MILE = EARTH_RADIUS_KM / EARTH_RADIUS_MILES
+NM_PER_MILE = EARTH_RADIUS_NAUTICAL_MILES / EARTH_RADIUS_MILES
+
+# Per-route columns and their storage types; optional columns may be None
+ROUTE_COLUMNS = {
+    'origin_idx': np.int32,
+    'dest_idx': np.int32,
+    'distance_miles': np.float64,
+    'bearing_degrees': np.float32,
+    'flight_hours': np.float32,
+    'block_hours': np.float32,
+    'fuel_burn_kg': np.float32,
+}
+
+class RouteBatch:
+    # Routes stored as parallel typed arrays; FlightRoute objects are built on demand
+    #
+    # distance_miles holds unrounded great-circle distances so km and nautical
+    # miles can be derived exactly; materialized routes round like
+    # haversine_distance does.
+    def __init__(self, columns, origin_idx, dest_idx, distance_miles,
+                 bearing_degrees, flight_hours, block_hours=None,
+                 fuel_burn_kg=None, aircraft_type=None):
+        self.columns = columns
+        self.aircraft_type = aircraft_type
+        values = {
+            'origin_idx': origin_idx,
+            'dest_idx': dest_idx,
+            'distance_miles': distance_miles,
+            'bearing_degrees': bearing_degrees,
+            'flight_hours': flight_hours,
+            'block_hours': block_hours,
+            'fuel_burn_kg': fuel_burn_kg,
+        }
+        for name, dtype in ROUTE_COLUMNS.items():
+            value = values[name]
+            setattr(self, name, None if value is None else np.asarray(value, dtype=dtype))
+
+    @classmethod
+    def concatenate(cls, batches):
+        # Join batches computed over the same airport columns, in order
+        batches = list(batches)
+        first = batches[0]
+        joined = {}
+        for name in ROUTE_COLUMNS:
+            parts = [getattr(batch, name) for batch in batches]
+            joined[name] = None if parts[0] is None else np.concatenate(parts)
+        return cls(first.columns, aircraft_type=first.aircraft_type, **joined)
+
+    def __len__(self):
+        return len(self.origin_idx)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.route(i)
+
+    def __getitem__(self, key):
+        # Integer keys materialize one FlightRoute; slices, masks and index arrays stay compact
+        if isinstance(key, (int, np.integer)):
+            return self.route(key)
+        return self.take(key)
+
+    def take(self, selector):
+        # New batch with the rows picked by a slice, boolean mask or index array
+        selected = {}
+        for name in ROUTE_COLUMNS:
+            column = getattr(self, name)
+            selected[name] = None if column is None else column[selector]
+        return RouteBatch(self.columns, aircraft_type=self.aircraft_type, **selected)
+
+    def filter(self, mask):
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def sort_by(self, field='distance_miles', descending=False):
+        order = np.argsort(getattr(self, field), kind='stable')
+        return self.take(order[::-1] if descending else order)
+
+    def top_k(self, k, field='distance_miles', largest=True):
+        # The k best rows by a column, in ranked order, without a full sort
+        values = getattr(self, field)
+        k = min(k, len(values))
+        if k <= 0:
+            return self.take(slice(0, 0))
+        keys = -values if largest else values
+        candidates = np.argpartition(keys, k - 1)[:k]
+        return self.take(candidates[np.argsort(keys[candidates], kind='stable')])
+
+    def argmin(self, field='distance_miles'):
+        return int(np.argmin(getattr(self, field)))
+
+    def argmax(self, field='distance_miles'):
+        return int(np.argmax(getattr(self, field)))
+
+    def get_nbytes(self):
+        # Memory held by the per-route columns
+        return sum(getattr(self, name).nbytes for name in ROUTE_COLUMNS
+                   if getattr(self, name) is not None)
+
+    def route(self, index):
+        # Materialize one row as a FlightRoute for display or reporting
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        miles = float(self.distance_miles[index])
+        bearing = round(float(self.bearing_degrees[index]), 1)
+        compass = COMPASS_DIRECTIONS[round(bearing / COMPASS_SEGMENT_SIZE) % 16]
+        return FlightRoute(
+            origin=self.columns.airport(self.origin_idx[index]),
+            destination=self.columns.airport(self.dest_idx[index]),
+            distance_miles=round(miles, 2),
+            distance_km=round(miles * KM_PER_MILE, 2),
+            distance_nautical_miles=round(miles * NM_PER_MILE, 2),
+            bearing_degrees=bearing,
+            compass_direction=compass,
+            estimated_flight_hours=float(self.flight_hours[index]),
+            aircraft_type=self.aircraft_type,
+            block_hours=None if self.block_hours is None else float(self.block_hours[index]),
+            fuel_burn_kg=None if self.fuel_burn_kg is None else float(self.fuel_burn_kg[index])
+        )
@@ -0,0 +1,103 @@
+"""
+Flight Path Distance Calculator - All-Pairs Route Explorer
+"""
+import streamlit as st
+import os
+from pathlib import Path
+
+# Add project root to path BEFORE importing our modules
+project_root = Path(__file__).parent.parent
+if str(project_root) not in os.sys.path:
+    os.sys.path.insert(0, str(project_root))
+
+from config.regions import region_of
+from services.route_explorer import airport_mask, distance_histogram, select_routes
+from utils.app_resources import get_max_route_distance, get_shared_airport_data
+
+st.set_page_config(
+    page_title="✈️ Route Explorer",
+    page_icon="🔎",
+    layout="wide"
+)
+
+st.title("🔎 Route Explorer")
+st.caption("Every airport pair, served from a precomputed distance matrix")
+
+shared = get_shared_airport_data()
+if shared is None or shared.distance_matrix is None:
+    st.error("❌ Distance matrix unavailable. Run `python main.py publish` to publish it.")
+    st.stop()
+
+columns = shared.columns
+countries = list(columns.country_names)
+regions = sorted({region_of(country) for country in countries})
+
+# Sidebar filters
+st.sidebar.header("🔎 Filter Routes")
+st.sidebar.markdown("**🛫 From**")
+origin_regions = st.sidebar.multiselect("Origin regions", regions)
+origin_countries = st.sidebar.multiselect("Origin countries", countries)
+st.sidebar.markdown("**🛬 To**")
+dest_regions = st.sidebar.multiselect("Destination regions", regions)
+dest_countries = st.sidebar.multiselect("Destination countries", countries)
+
+max_distance = get_max_route_distance()
+min_miles, max_miles = st.sidebar.slider(
+    "Distance range (miles)", 0.0, max(max_distance, 1.0), (0.0, max(max_distance, 1.0))
+)
+one_direction = st.sidebar.checkbox("Show each pair in one direction only", value=True)
+
+
+@st.cache_resource(max_entries=16)
+def query_routes(origin_countries, origin_regions, dest_countries, dest_regions,
+                 min_miles, max_miles, one_direction):
+    # Kept across reruns so block counts are computed once per filter set
+    return select_routes(
+        columns,
+        shared.distance_matrix,
+        airport_mask(columns, origin_countries, origin_regions),
+        airport_mask(columns, dest_countries, dest_regions),
+        min_miles=min_miles,
+        max_miles=max_miles,
+        one_direction=one_direction
+    )
+
+
+selection = query_routes(tuple(origin_countries), tuple(origin_regions), tuple(dest_countries),
+                         tuple(dest_regions), min_miles, max_miles, one_direction)
+
+st.metric("Matching Routes", f"{len(selection):,}")
+if len(selection) == 0:
+    st.info("👆 No routes match these filters")
+    st.stop()
+
+# Sortable, paginated table
+st.subheader("🗺️ Routes")
+tcol1, tcol2, tcol3, tcol4 = st.columns(4)
+sort_field = tcol1.selectbox("Sort by", ["distance", "origin", "destination"])
+descending = tcol2.checkbox("Descending", value=True)
+page_size = tcol3.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+page_count = max(1, -(-len(selection) // page_size))
+page_number = tcol4.number_input("Page", min_value=1, max_value=page_count, value=1) - 1
+
+page = selection.page(page_number, page_size, sort_field, descending=descending)
+st.dataframe(page.to_rows(), use_container_width=True, hide_index=True)
+st.caption(f"Page {page_number + 1} of {page_count:,}")
+
+# Distance distribution and leaderboards
+hcol, lcol = st.columns([2, 1])
+
+with hcol:
+    st.subheader("📊 Distance Distribution")
+    counts, edges = distance_histogram(selection, bins=24)
+    labels = [f"{edges[i]:,.0f}–{edges[i + 1]:,.0f}" for i in range(len(counts))]
+    st.bar_chart({"Routes": dict(zip(labels, counts.tolist()))})
+
+with lcol:
+    st.subheader("🏆 Leaderboard")
+    st.markdown("**Longest**")
+    st.dataframe(selection.top_k(10, longest=True).to_rows(), hide_index=True,
+                 column_order=["Origin", "Destination", "Distance (mi)"])
+    st.markdown("**Shortest**")
+    st.dataframe(selection.top_k(10, longest=False).to_rows(), hide_index=True,
+                 column_order=["Origin", "Destination", "Distance (mi)"])
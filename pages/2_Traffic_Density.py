@@ -0,0 +1,75 @@
+"""
+Flight Path Distance Calculator - Route Traffic Density
+"""
+import streamlit as st
+import os
+from pathlib import Path
+
+# Add project root to path BEFORE importing our modules
+project_root = Path(__file__).parent.parent
+if str(project_root) not in os.sys.path:
+    os.sys.path.insert(0, str(project_root))
+
+from services.density_raster import (
+    DENSITY_RASTER_NPZ,
+    RASTER_CELL_DEGREES,
+    DensityRaster,
+    rasterize_route_file
+)
+from utils.app_resources import get_airport_columns
+
+st.set_page_config(
+    page_title="✈️ Traffic Density",
+    page_icon="🌍",
+    layout="wide"
+)
+
+st.title("🌍 Route Traffic Density")
+st.caption("How many routes cross each lat/lon cell, from exact great-circle paths")
+
+st.sidebar.header("🌍 Raster Settings")
+# Rasterizing time doubles with each halving of the cell size (about 10 s per
+# 300,000 long-haul routes at 0.5°); finer grids are built with the CLI
+cell_degrees = st.sidebar.select_slider(
+    "Cell size (degrees)", [0.5, 1.0, 2.0, 5.0], value=RASTER_CELL_DEGREES,
+    help="Halving the cell size doubles the build time. For finer grids run "
+         "`python main.py density routes.csv --cell 0.25` and reload this page.")
+log_scale = st.sidebar.checkbox("Logarithmic colour scale", value=True)
+
+uploaded_routes = st.file_uploader("Route legs CSV (origin,destination per leg)", type=["csv", "txt"])
+if uploaded_routes is not None and st.button("▶️ Build Density Raster"):
+    uploaded_routes.seek(0)
+    progress = st.progress(0.0, text="Rasterizing routes...")
+    total_bytes = max(uploaded_routes.size, 1)
+    st.session_state.density_raster = rasterize_route_file(
+        uploaded_routes,
+        get_airport_columns(),
+        cell_degrees=cell_degrees,
+        progress_callback=lambda bytes_read, legs: progress.progress(
+            min(bytes_read / total_bytes, 1.0), text=f"Rasterized {legs:,} legs...")
+    )
+    progress.empty()
+
+raster = st.session_state.get("density_raster")
+if raster is None and DENSITY_RASTER_NPZ.exists():
+    raster = DensityRaster.from_npz(DENSITY_RASTER_NPZ)
+    st.info(f"Showing the saved raster '{DENSITY_RASTER_NPZ.name}' (build with `python main.py density`)")
+
+if raster is None:
+    st.info("👆 Upload a route CSV to build a density raster")
+    st.stop()
+
+mcol1, mcol2, mcol3 = st.columns(3)
+mcol1.metric("Legs", f"{int(raster.total_weight):,}")
+mcol2.metric("Unique Routes", f"{raster.route_count:,}")
+mcol3.metric("Busiest Cell", f"{int(raster.grid.max()):,} legs")
+
+png_bytes = raster.to_png_bytes(log_scale=log_scale)
+st.image(png_bytes, caption=f"{raster.cell_degrees:g}° cells, north up, -180° at the left edge",
+         use_container_width=True)
+
+dcol1, dcol2 = st.columns(2)
+dcol1.download_button("⬇️ Download PNG", data=png_bytes, file_name="density_raster.png",
+                      mime="image/png")
+if dcol2.button("💾 Save raster (.npz)"):
+    st.success(f"Saved '{raster.save_npz()}'")
@@ -0,0 +1,354 @@
+"""Differential accuracy checks of every distance / bearing engine against a high-precision reference."""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+from config.constants import ACCURACY_TOLERANCES, EARTH_RADIUS_MILES
+from models.airport import Airport
+from models.airport_columns import AirportColumns
+from services.all_pairs_job import compute_tile
+from services.batch_engine import compute_route_batch
+from services.distance_calculator import calculate_initial_bearing, haversine_distance
+from services.geo_arrays import earth_radius, haversine_distance_array, initial_bearing_array, unit_vectors
+from services.global_top_k import global_top_k_routes
+from services.screening import _arc_for_chord, chord_distance_array
+from services.shared_store import attach_airport_data, prune_generations, publish_airport_data
+
+ACCURACY_UNITS = ("miles", "km", "nautical_miles")
+ACCURACY_PERCENTILES = (50, 99, 99.9)
+DEFAULT_RANDOM_PAIRS = 100000
+
+# Pairs per published generation, all-pairs tile and top-k search. Each
+# engine computes every pair within a chunk, so work grows with the chunk.
+SHARED_MATRIX_CHUNK = 256
+ALL_PAIRS_TILE_CHUNK = 256
+GLOBAL_TOP_K_CHUNK = 16
+
+# Pairs closer than this to identical or antipodal (radians) have no
+# meaningful initial bearing and are left out of bearing errors
+BEARING_MIN_SEPARATION = 1e-6
+
+
+def random_coordinates(count, rng):
+    """
+    Random coordinate pairs: half uniform over the sphere, half short hops.
+
+    Returns:
+        Tuple of (lat1, lon1, lat2, lon2) arrays in degrees
+    """
+    def on_sphere(size):
+        return np.degrees(np.arcsin(rng.uniform(-1, 1, size))), rng.uniform(-180, 180, size)
+
+    lat1, lon1 = on_sphere(count)
+    lat2, lon2 = on_sphere(count)
+    # Short hops from 1 cm to ~100 miles, where cancellation is worst
+    short = np.arange(count // 2)
+    offset = 10 ** rng.uniform(-7, 0.2, (2, len(short))) * rng.choice([-1, 1], (2, len(short)))
+    lat2[short] = np.clip(lat1[short] + offset[0], -90, 90)
+    lon2[short] = (lon1[short] + offset[1] + 180) % 360 - 180
+    return lat1, lon1, lat2, lon2
+
+
+def adversarial_coordinates():
+    """
+    Hand-picked hard cases, each labelled with its category.
+
+    Covers identical points, poles, the antimeridian, exact and near
+    antipodes, sub-metre separations and the equator / prime meridian.
+
+    Returns:
+        Tuple of (lat1, lon1, lat2, lon2, labels)
+    """
+    cases = []
+
+    def add(label, lat1, lon1, lat2, lon2):
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                                        for v in (lat1, lon1, lat2, lon2)))
+        cases.append((lat1.ravel(), lon1.ravel(), lat2.ravel(), lon2.ravel(), label))
+
+    grid_lat = np.array([-90.0, -89.999999, -45.0, -1e-9, 0.0, 1e-9, 33.9425, 60.0, 89.999999, 90.0])
+    grid_lon = np.array([-180.0, -179.999999, -90.0, -1e-9, 0.0, 1e-9, 45.0, 179.999999, 180.0])
+    lat, lon = (v.ravel() for v in np.meshgrid(grid_lat, grid_lon))
+
+    add("identical", lat, lon, lat, lon)
+    add("pole to pole", [90.0, 90.0, -90.0, 90.0], [0.0, 0.0, 123.0, -180.0],
+        [-90.0, 90.0, -90.0, 90.0], [0.0, 77.0, -57.0, 180.0])
+    add("from pole", 90.0, 0.0, lat, lon)
+    add("to pole", lat, lon, -90.0, 45.0)
+    add("antimeridian", lat, 179.999, lat, -179.999)
+    add("antimeridian ±180", lat, 180.0, lat, -180.0)
+    add("exact antipodes", lat, lon, -lat, np.where(lon > 0, lon - 180.0, lon + 180.0))
+    for offset in (1e-9, 1e-6, 1e-3):
+        add(f"near antipodes ({offset:g}°)", lat, lon, -lat + offset,
+            np.where(lon > 0, lon - 180.0, lon + 180.0) - offset)
+    for offset in (1e-9, 1e-7, 1e-5):
+        add(f"separation {offset:g}°", lat[np.abs(lat) < 90], lon[np.abs(lat) < 90],
+            lat[np.abs(lat) < 90] + offset, lon[np.abs(lat) < 90] + offset)
+    add("equator", 0.0, np.linspace(-180, 180, 37), 0.0, np.linspace(180, -180, 37)[::-1] * 0.5)
+    add("prime meridian", np.linspace(-90, 90, 37), 0.0, np.linspace(90, -90, 37), 0.0)
+
+    lat1, lon1, lat2, lon2, labels = zip(*cases)
+    return (np.concatenate(lat1), np.concatenate(lon1), np.concatenate(lat2), np.concatenate(lon2),
+            np.concatenate([np.full(len(a), label, dtype=object) for a, label in zip(lat1, labels)]))
+
+
+def _reference_vectors(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=np.longdouble))
+    lon = np.radians(np.asarray(lon, dtype=np.longdouble))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def reference_angle(lat1, lon1, lat2, lon2):
+    """
+    Central angle in extended (long double) precision.
+
+    Uses atan2(|a × b|, a · b), which stays well conditioned for identical,
+    nearby and antipodal points alike. On platforms where long double is
+    plain double this is still accurate to a few ulps.
+    """
+    a, b = _reference_vectors(lat1, lon1), _reference_vectors(lat2, lon2)
+    cross = np.cross(a, b)
+    return np.arctan2(np.sqrt((cross * cross).sum(axis=-1)), (a * b).sum(axis=-1))
+
+
+def reference_bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing in degrees (0-360), in extended precision."""
+    lat1 = np.radians(np.asarray(lat1, dtype=np.longdouble))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.longdouble))
+    dlon = np.radians(np.asarray(lon2, dtype=np.longdouble) - np.asarray(lon1, dtype=np.longdouble))
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def _scalar_engine(lat1, lon1, lat2, lon2, unit):
+    pairs = list(zip(zip(lat1.tolist(), lon1.tolist()), zip(lat2.tolist(), lon2.tolist())))
+    return (np.array([haversine_distance(a, b, unit) for a, b in pairs]),
+            np.array([calculate_initial_bearing(a, b) for a, b in pairs]))
+
+
+def _vectorized_engine(lat1, lon1, lat2, lon2, unit):
+    return (haversine_distance_array(lat1, lon1, lat2, lon2, unit),
+            initial_bearing_array(lat1, lon1, lat2, lon2))
+
+
+def _pair_columns(lat1, lon1, lat2, lon2):
+    # Origins first, then destinations: pair i is airport i -> airport count + i
+    count = len(lat1)
+    codes = np.arange(2 * count).astype(str)
+    return AirportColumns(codes, codes, codes, np.zeros(2 * count, dtype=np.int32), ["X"],
+                          np.concatenate([lat1, lat2]), np.concatenate([lon1, lon2]))
+
+
+def _chunks(count, size):
+    for start in range(0, count, size):
+        yield slice(start, min(start + size, count))
+
+
+def _route_batch_engine(lat1, lon1, lat2, lon2, unit):
+    count = len(lat1)
+    batch = compute_route_batch(_pair_columns(lat1, lon1, lat2, lon2),
+                                np.arange(count), np.arange(count, 2 * count))
+    return batch.distance_miles * (earth_radius(unit) / EARTH_RADIUS_MILES), batch.bearing_degrees
+
+
+def _shared_matrix_engine(lat1, lon1, lat2, lon2, unit):
+    # Publish each chunk's airports, attach read-only and look up the pair cells
+    distance = np.full(len(lat1), np.nan)
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        directory = Path(directory)
+        for chunk in _chunks(len(lat1), SHARED_MATRIX_CHUNK):
+            count = chunk.stop - chunk.start
+            lat = np.concatenate([lat1[chunk], lat2[chunk]])
+            lon = np.concatenate([lon1[chunk], lon2[chunk]])
+            # Zero-padded codes keep the published order equal to the pair layout
+            airports = {f"{i:06d}": Airport(f"{i:06d}", "", "", "X", lat[i], lon[i])
+                        for i in range(2 * count)}
+            publish_airport_data(airports, directory)
+            shared = attach_airport_data(directory)
+            distance[chunk] = shared.distance_matrix[np.arange(count), np.arange(count, 2 * count)]
+            del shared
+            prune_generations(directory)
+    return distance * (earth_radius(unit) / EARTH_RADIUS_MILES), None
+
+
+def _all_pairs_tile_engine(lat1, lon1, lat2, lon2, unit):
+    # One origins x destinations tile per chunk; the pairs are its diagonal
+    columns = _pair_columns(lat1, lon1, lat2, lon2)
+    count = len(lat1)
+    distance = np.full(count, np.nan)
+    with tempfile.TemporaryDirectory() as directory:
+        tile = Path(directory) / "tile.npy"
+        for chunk in _chunks(count, ALL_PAIRS_TILE_CHUNK):
+            compute_tile(columns.latitudes, columns.longitudes, (chunk.start, chunk.stop),
+                         (count + chunk.start, count + chunk.stop), tile)
+            distance[chunk] = np.diagonal(np.load(tile))
+    return distance * (earth_radius(unit) / EARTH_RADIUS_MILES), None
+
+
+def _chord_screening_engine(lat1, lon1, lat2, lon2, unit):
+    # Arc recovered from the chord, as screening converts its cut-offs; its
+    # error has to stay well inside SCREENING_MARGIN
+    chord = chord_distance_array(unit_vectors(lat1, lon1), unit_vectors(lat2, lon2), unit)
+    return _arc_for_chord(chord, unit), None
+
+
+def _global_top_k_engine(lat1, lon1, lat2, lon2, unit):
+    # Rank every route within a chunk and read back the requested pairs
+    # NaN marks a pair the search failed to return, which fails the check
+    distance = np.full(len(lat1), np.nan)
+    bearing = np.full(len(lat1), np.nan)
+    for chunk in _chunks(len(lat1), GLOBAL_TOP_K_CHUNK):
+        count = chunk.stop - chunk.start
+        columns = _pair_columns(lat1[chunk], lon1[chunk], lat2[chunk], lon2[chunk])
+        batch = global_top_k_routes(columns, count * (2 * count - 1))
+        # Routes come back with the lower index as origin, so pair i is (i, count + i)
+        pair = batch.dest_idx - batch.origin_idx == count
+        position = batch.origin_idx[pair]
+        distance[chunk.start + position] = batch.distance_miles[pair]
+        bearing[chunk.start + position] = batch.bearing_degrees[pair]
+    return distance * (earth_radius(unit) / EARTH_RADIUS_MILES), bearing
+
+
+def _vector_angle_engine(lat1, lon1, lat2, lon2, unit):
+    # Formulation used by the nearest-airport index and clustering
+    a, b = unit_vectors(lat1, lon1), unit_vectors(lat2, lon2)
+    angle = np.arctan2(np.linalg.norm(np.cross(a, b), axis=1), np.einsum('ij,ij->i', a, b))
+    return angle * earth_radius(unit), None
+
+
+# Engine name -> callable(lat1, lon1, lat2, lon2, unit) returning
+# (distances in unit, initial bearings in degrees or None)
+ACCURACY_ENGINES = {
+    "scalar": _scalar_engine,
+    "vectorized": _vectorized_engine,
+    "route_batch": _route_batch_engine,
+    "shared_matrix": _shared_matrix_engine,
+    "all_pairs_tile": _all_pairs_tile_engine,
+    "chord_screening": _chord_screening_engine,
+    "global_top_k": _global_top_k_engine,
+    "vector_angle": _vector_angle_engine,
+}
+
+
+def _bearing_error(actual, expected):
+    difference = np.abs(np.asarray(actual, dtype=np.float64) - expected.astype(np.float64)) % 360
+    return np.minimum(difference, 360 - difference)
+
+
+class AccuracyReport:
+    # Error statistics per (engine, unit, quantity), checked against tolerances
+    #
+    # Each row holds the sample count, max and percentile absolute errors,
+    # the tolerance and the worst input pair with its case label.
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_rows(self):
+        return list(self.rows)
+
+    def get_failures(self):
+        return [row for row in self.rows if not row['passed']]
+
+    def is_passing(self):
+        return not self.get_failures()
+
+    def format_table(self):
+        lines = [f"   {'Engine':<16s} {'Unit':<15s} {'Quantity':<9s} {'Max':>10s} "
+                 + " ".join(f"{'p' + format(p, 'g'):>10s}" for p in ACCURACY_PERCENTILES)
+                 + f" {'Tolerance':>10s}  Result"]
+        for row in self.rows:
+            lines.append(
+                f"   {row['engine']:<16s} {row['unit']:<15s} {row['quantity']:<9s} {row['max']:>10.3g} "
+                + " ".join(f"{row['percentiles'][p]:>10.3g}" for p in ACCURACY_PERCENTILES)
+                + f" {row['tolerance']:>10.3g}  {'ok' if row['passed'] else 'FAIL'}")
+            if not row['passed']:
+                lat1, lon1, lat2, lon2 = row['worst_pair']
+                lines.append(f"      worst: {row['worst_case']} ({lat1!r}, {lon1!r}) -> ({lat2!r}, {lon2!r})")
+        return "\n".join(lines)
+
+
+def _error_row(engine, unit, quantity, errors, tolerance, coordinates, labels):
+    worst = int(np.argmax(errors))
+    return {
+        'engine': engine,
+        'unit': unit,
+        'quantity': quantity,
+        'count': len(errors),
+        'max': float(errors[worst]),
+        'percentiles': {p: float(np.percentile(errors, p)) for p in ACCURACY_PERCENTILES},
+        'tolerance': tolerance,
+        'passed': bool(errors[worst] <= tolerance),
+        'worst_case': str(labels[worst]),
+        'worst_pair': tuple(float(values[worst]) for values in coordinates),
+    }
+
+
+def run_accuracy_harness(random_pairs=DEFAULT_RANDOM_PAIRS, seed=0, engines=None,
+                         tolerances=None, units=ACCURACY_UNITS):
+    """
+    Run every engine over random and adversarial pairs and compare to the reference.
+
+    Distance errors are absolute, in the query unit; bearing errors are in
+    degrees, measured the short way round the compass and only for pairs
+    whose bearing is defined (BEARING_MIN_SEPARATION).
+
+    Arguments:
+        random_pairs: Random coordinate pairs added to the adversarial set
+        seed: Random seed
+        engines: Engine name -> callable (defaults to ACCURACY_ENGINES)
+        tolerances: Engine name -> {'distance': ..., 'bearing': ...}
+                    (defaults to ACCURACY_TOLERANCES)
+        units: Distance units to check
+
+    Returns:
+        AccuracyReport
+    """
+    engines = ACCURACY_ENGINES if engines is None else engines
+    tolerances = ACCURACY_TOLERANCES if tolerances is None else tolerances
+
+    lat1, lon1, lat2, lon2 = random_coordinates(random_pairs, np.random.default_rng(seed))
+    hard = adversarial_coordinates()
+    coordinates = tuple(np.concatenate([random, extra]) for random, extra in
+                        zip((lat1, lon1, lat2, lon2), hard[:4]))
+    labels = np.concatenate([np.full(random_pairs, "random", dtype=object), hard[4]])
+
+    angle = reference_angle(*coordinates)
+    bearing = reference_bearing(*coordinates)
+    bearing_defined = (angle > BEARING_MIN_SEPARATION) & (np.pi - angle > BEARING_MIN_SEPARATION)
+    bearing_coordinates = tuple(values[bearing_defined] for values in coordinates)
+
+    rows = []
+    for name, engine in engines.items():
+        for unit in units:
+            distance, engine_bearing = engine(*coordinates, unit)
+            expected = (angle * np.longdouble(earth_radius(unit))).astype(np.float64)
+            errors = np.abs(np.asarray(distance, dtype=np.float64) - expected)
+            rows.append(_error_row(name, unit, "distance", errors, tolerances[name]['distance'],
+                                   coordinates, labels))
+            # Bearings do not depend on the unit; check them once
+            if engine_bearing is not None and unit == units[0]:
+                errors = _bearing_error(np.asarray(engine_bearing)[bearing_defined],
+                                        bearing[bearing_defined])
+                rows.append(_error_row(name, "degrees", "bearing", errors, tolerances[name]['bearing'],
+                                       bearing_coordinates, labels[bearing_defined]))
+    return AccuracyReport(rows)
+
+
+if __name__ == "__main__":
+    # python -m services.accuracy_harness [--pairs N] [--seed N]
+    parser = argparse.ArgumentParser(description="Differential accuracy check of distance engines")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_RANDOM_PAIRS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_accuracy_harness(args.pairs, args.seed)
+    print(report.format_table())
+    failures = report.get_failures()
+    print(f"\n  {len(failures)} of {len(report.rows)} checks over tolerance" if failures
+          else f"\n  All {len(report.rows)} checks within tolerance")
+    sys.exit(1 if failures else 0)
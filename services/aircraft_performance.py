@@ -0,0 +1,139 @@
+"""Aircraft performance profiles and table-driven block time / fuel estimates."""
+import csv
+from functools import lru_cache
+import numpy as np
+from models.aircraft import AircraftProfile
+from services.airport_loader import DATA_DIR
+
+AIRCRAFT_PROFILES_CSV = DATA_DIR / "aircraft_profiles.csv"
+
+
+def load_aircraft_profiles(filepath=AIRCRAFT_PROFILES_CSV):
+    """
+    Load aircraft performance profiles from CSV.
+
+    Returns:
+        Dictionary mapping aircraft type codes to AircraftProfile objects
+    """
+    profiles = {}
+
+    try:
+        with open(filepath, 'r') as file:
+            for row in csv.DictReader(file):
+                try:
+                    profile = AircraftProfile(
+                        type_code=row['Aircraft_Type'].strip().upper(),
+                        description=row['Description'].strip(),
+                        cruise_speed_mph=row['Cruise_Speed_MPH'],
+                        climb_minutes=row['Climb_Minutes'],
+                        climb_distance_miles=row['Climb_Distance_Miles'],
+                        descent_minutes=row['Descent_Minutes'],
+                        descent_distance_miles=row['Descent_Distance_Miles'],
+                        taxi_out_minutes=row['Taxi_Out_Minutes'],
+                        taxi_in_minutes=row['Taxi_In_Minutes'],
+                        climb_fuel_kg=row['Climb_Fuel_KG'],
+                        cruise_fuel_kg_per_hour=row['Cruise_Fuel_KG_Per_Hour'],
+                        descent_fuel_kg=row['Descent_Fuel_KG'],
+                        taxi_fuel_kg_per_minute=row['Taxi_Fuel_KG_Per_Minute']
+                    )
+                    profiles[profile.type_code] = profile
+                except (ValueError, KeyError) as e:
+                    print(f"   Skipping invalid aircraft profile: {row.get('Aircraft_Type', 'UNKNOWN')} - Error: {e}")
+                    continue
+
+        print(f"  Loaded {len(profiles)} aircraft profiles from '{filepath.name}'")
+        return profiles
+
+    except FileNotFoundError:
+        print(f"  Aircraft profiles '{filepath.absolute()}' not found!")
+        return {}
+
+
+class PerformanceTable:
+    # Per-type coefficient columns so block time and fuel evaluate as array lookups
+    #
+    # Every profile reduces to a piecewise-linear function of distance: legs
+    # shorter than climb + descent distance scale the climb/descent segments
+    # down proportionally, longer legs add cruise at constant speed.
+
+    def __init__(self, profiles):
+        profiles = list(profiles)
+        self.type_codes = [profile.type_code for profile in profiles]
+        self._index = {code: i for i, code in enumerate(self.type_codes)}
+
+        def column(values):
+            return np.array(list(values), dtype=np.float64)
+
+        transition = column(p.get_transition_miles() for p in profiles)
+        transition_hours = column((p.climb_minutes + p.descent_minutes) / 60.0 for p in profiles)
+        transition_fuel = column(p.climb_fuel_kg + p.descent_fuel_kg for p in profiles)
+        cruise_speed = column(p.cruise_speed_mph for p in profiles)
+        cruise_fuel_per_mile = column(p.cruise_fuel_kg_per_hour / p.cruise_speed_mph for p in profiles)
+
+        self.transition_miles = transition
+        self.short_hours_per_mile = transition_hours / transition
+        self.short_fuel_per_mile = transition_fuel / transition
+        self.long_hours_per_mile = 1.0 / cruise_speed
+        self.long_hours_intercept = transition_hours - transition / cruise_speed
+        self.long_fuel_per_mile = cruise_fuel_per_mile
+        self.long_fuel_intercept = transition_fuel - transition * cruise_fuel_per_mile
+        self.taxi_hours = column(p.get_taxi_hours() for p in profiles)
+        self.taxi_fuel = column(
+            p.taxi_fuel_kg_per_minute * (p.taxi_out_minutes + p.taxi_in_minutes) for p in profiles
+        )
+
+    def index_of(self, type_codes):
+        """
+        Resolve aircraft type codes to table rows.
+
+        Raises:
+            KeyError if any type code is not in the table
+        """
+        if isinstance(type_codes, str):
+            return self._index[type_codes.strip().upper()]
+        return np.array([self._index[code.strip().upper()] for code in type_codes], dtype=np.intp)
+
+    def evaluate(self, distance_miles, type_index):
+        """
+        Evaluate airborne time, block time and fuel burn for legs.
+
+        Arguments:
+            distance_miles: Array of leg distances
+            type_index: Table row per leg (scalar or array, see index_of)
+
+        Returns:
+            Tuple of (airborne_hours, block_hours, fuel_burn_kg) arrays
+        """
+        distance = np.asarray(distance_miles, dtype=np.float64)
+        rows = np.asarray(type_index, dtype=np.intp)
+        short = distance < self.transition_miles[rows]
+
+        airborne_hours = np.where(
+            short,
+            distance * self.short_hours_per_mile[rows],
+            self.long_hours_intercept[rows] + distance * self.long_hours_per_mile[rows]
+        )
+        airborne_fuel = np.where(
+            short,
+            distance * self.short_fuel_per_mile[rows],
+            self.long_fuel_intercept[rows] + distance * self.long_fuel_per_mile[rows]
+        )
+        return (airborne_hours,
+                airborne_hours + self.taxi_hours[rows],
+                airborne_fuel + self.taxi_fuel[rows])
+
+
+@lru_cache(maxsize=None)
+def _single_profile_table(profile):
+    return PerformanceTable([profile])
+
+
+def estimate_route_performance(profile, distance_miles):
+    """
+    Estimate performance for a single leg flown by one aircraft profile.
+
+    Returns:
+        Tuple of (airborne_hours, block_hours, fuel_burn_kg) floats
+    """
+    airborne, block, fuel = _single_profile_table(profile).evaluate(distance_miles, 0)
+    return float(airborne), float(block), float(fuel)
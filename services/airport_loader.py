@@ -8,6 +8,14 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 AIRPORTS_CSV = DATA_DIR / "airports.csv"
 
+# Airport data backends: "csv" parses airports.csv into a dict; "sqlite" opens
+# the indexed database (services.airport_repository) and reads airports on
+# first use. The AIRPORT_BACKEND environment variable overrides the default
+# and is inherited by worker processes.
+AIRPORT_BACKENDS = ("csv", "sqlite")
+DEFAULT_AIRPORT_BACKEND = "csv"
+AIRPORT_BACKEND_ENV = "AIRPORT_BACKEND"
+
 # Default airport data (for auto-generation)
 DEFAULT_AIRPORT_DATA = [
     ["Airport_Code", "Airport_Name", "City", "Country", "Latitude", "Longitude"],
@@ -87,4 +95,28 @@ def load_airport_database(filepath=AIRPORTS_CSV):
         print(f"  Unexpected error loading airports: {e}")
         import traceback
         traceback.print_exc()
-        return {}
\ No newline at end of file
+        return {}
+
+def load_airports(backend=None):
+    """
+    Load the airport database from the selected backend.
+    
+    Arguments:
+        backend: 'csv' or 'sqlite'; defaults to $AIRPORT_BACKEND, then
+                 DEFAULT_AIRPORT_BACKEND
+    
+    Returns:
+        Mapping of airport codes to Airport objects (a dict, or a
+        SQLiteAirportRepository); empty if loading failed
+    
+    Raises:
+        ValueError if the backend is unknown
+    """
+    backend = backend or os.environ.get(AIRPORT_BACKEND_ENV) or DEFAULT_AIRPORT_BACKEND
+    if backend not in AIRPORT_BACKENDS:
+        raise ValueError(f"Unknown airport backend '{backend}'; expected one of {AIRPORT_BACKENDS}")
+    if backend == "csv":
+        return load_airport_database()
+    
+    from services.airport_repository import load_airport_repository
+    return load_airport_repository() or {}
@@ -0,0 +1,201 @@
+"""Indexed SQLite airport database with lazy, per-code lookups."""
+import os
+import sqlite3
+from collections.abc import Mapping
+from pathlib import Path
+from models.airport import Airport
+from services.airport_loader import AIRPORTS_CSV, DATA_DIR, load_airport_database
+
+AIRPORTS_DB = DATA_DIR / "airports.sqlite"
+
+SCHEMA = [
+    """CREATE TABLE airports (
+        id INTEGER PRIMARY KEY,
+        code TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        city TEXT NOT NULL,
+        country TEXT NOT NULL,
+        latitude REAL NOT NULL,
+        longitude REAL NOT NULL
+    )""",
+    "CREATE INDEX airports_country ON airports (country, code)",
+    "CREATE VIRTUAL TABLE airports_rtree USING rtree (id, min_lat, max_lat, min_lon, max_lon)",
+]
+
+AIRPORT_FIELDS = "code, name, city, country, latitude, longitude"
+
+
+def build_airport_database(airports, db_path=AIRPORTS_DB):
+    """
+    Write airports into a new indexed SQLite database.
+
+    The database is built beside the target and renamed into place, so open
+    readers keep their snapshot until they reconnect.
+
+    Arguments:
+        airports: Mapping of code -> Airport (e.g. from load_airport_database)
+        db_path: Destination database file
+
+    Returns:
+        Path of the database
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = db_path.with_suffix(".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        for statement in SCHEMA:
+            connection.execute(statement)
+        rows = [(a.code, a.name, a.city, a.country, a.latitude, a.longitude)
+                for a in (airports[code] for code in sorted(airports))]
+        connection.executemany(f"INSERT INTO airports ({AIRPORT_FIELDS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        connection.execute("INSERT INTO airports_rtree "
+                           "SELECT id, latitude, latitude, longitude, longitude FROM airports")
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(temp_path, db_path)
+    return db_path
+
+
+def _row_to_airport(row):
+    return Airport(code=row[0], name=row[1], city=row[2], country=row[3],
+                   latitude=row[4], longitude=row[5])
+
+
+class SQLiteAirportRepository(Mapping):
+    # Read-only code -> Airport mapping backed by an indexed SQLite file
+    #
+    # Drop-in for the dict returned by load_airport_database: opening is
+    # instant and each Airport is read (and cached) the first time its code
+    # is used; items() and values() read everything in one query for callers
+    # that need every airport. Bounding-box queries go through an R*Tree on
+    # lat/lon and country queries through an index, both executed in SQL.
+    # Streamlit shares one repository across script threads, so the
+    # read-only connection is not tied to the thread that opened it.
+
+    def __init__(self, db_path=AIRPORTS_DB):
+        self.db_path = Path(db_path)
+        self._cache = {}
+        self._connection = None
+        self._pid = None
+        self._length = None
+        self._ordered = None
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                               check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def _fetch(self, where, parameters=()):
+        rows = self._connect().execute(
+            f"SELECT {AIRPORT_FIELDS} FROM airports {where}", parameters).fetchall()
+        airports = []
+        for row in rows:
+            if row[0] not in self._cache:
+                self._cache[row[0]] = _row_to_airport(row)
+            airports.append(self._cache[row[0]])
+        return airports
+
+    def __getitem__(self, code):
+        if code not in self._cache:
+            found = self._fetch("WHERE code = ?", (code,))
+            if not found:
+                raise KeyError(code)
+        return self._cache[code]
+
+    def __contains__(self, code):
+        if code in self._cache:
+            return True
+        return self._connect().execute(
+            "SELECT 1 FROM airports WHERE code = ?", (code,)).fetchone() is not None
+
+    def __iter__(self):
+        for (code,) in self._connect().execute("SELECT code FROM airports ORDER BY code"):
+            yield code
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self._connect().execute("SELECT COUNT(*) FROM airports").fetchone()[0]
+        return self._length
+
+    def _all(self):
+        if self._ordered is None:
+            self._ordered = self._fetch("ORDER BY code")
+        return self._ordered
+
+    def values(self):
+        return list(self._all())
+
+    def items(self):
+        return [(airport.code, airport) for airport in self._all()]
+
+    def get_many(self, codes):
+        # Code -> Airport for the known codes in one query
+        wanted = [code for code in set(codes) if code not in self._cache]
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            self._fetch(f"WHERE code IN ({', '.join('?' * len(chunk))})", chunk)
+        return {code: self._cache[code] for code in codes if code in self._cache}
+
+    def in_country(self, country):
+        """Airports in one country, ordered by code."""
+        return self._fetch("WHERE country = ? ORDER BY code", (country,))
+
+    def in_bounding_box(self, min_lat, max_lat, min_lon, max_lon):
+        """
+        Airports inside a lat/lon box, ordered by code.
+
+        A box with min_lon > max_lon crosses the antimeridian and is split in
+        two. The R*Tree stores float32 bounds rounded outward, so it is only an
+        overlap prefilter; the exact test runs on the float64 coordinates, and
+        airports on the box edges are included.
+        """
+        if min_lon <= max_lon:
+            spans = [(min_lon, max_lon)]
+        else:
+            spans = [(min_lon, 180.0), (-180.0, max_lon)]
+        coarse = " OR ".join("(max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?)"
+                             for _ in spans)
+        exact = " OR ".join("(longitude >= ? AND longitude <= ?)" for _ in spans)
+        parameters = [value for lo, hi in spans for value in (min_lat, max_lat, lo, hi)]
+        parameters += [min_lat, max_lat] + [value for span in spans for value in span]
+        return self._fetch(f"WHERE id IN (SELECT id FROM airports_rtree WHERE {coarse}) "
+                           f"AND latitude >= ? AND latitude <= ? AND ({exact}) ORDER BY code",
+                           parameters)
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+def load_airport_repository(db_path=AIRPORTS_DB):
+    """
+    Open the SQLite airport database, building it from the CSV if it is
+    missing or older than the CSV.
+
+    Returns:
+        SQLiteAirportRepository, or None if the database cannot be built
+    """
+    db_path = Path(db_path)
+    if not db_path.exists() or (AIRPORTS_CSV.exists()
+                                and db_path.stat().st_mtime < AIRPORTS_CSV.stat().st_mtime):
+        print(f"   Airport index missing or stale at '{db_path.absolute()}'. Building from CSV...")
+        airports = load_airport_database(AIRPORTS_CSV)
+        if not airports:
+            return None
+        build_airport_database(airports, db_path)
+    return SQLiteAirportRepository(db_path)
+
+
+if __name__ == "__main__":
+    # Rebuild the index: python -m services.airport_repository
+    path = build_airport_database(load_airport_database())
+    print(f"  Airport index written to '{path}'")
@@ -0,0 +1,199 @@
+"""Resumable, checkpointed all-pairs distance computation."""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airports
+from services.geo_arrays import haversine_distance_array
+from services.shared_store import coordinates_fingerprint
+
+ALL_PAIRS_TILE_SIZE = 2048
+MANIFEST_NAME = "manifest.json"
+
+
+def tile_path(output_dir, row_tile, col_tile):
+    return Path(output_dir) / f"tile_{row_tile:05d}_{col_tile:05d}.npy"
+
+
+def compute_tile(latitudes, longitudes, row_range, col_range, output_path):
+    """
+    Compute one block of the distance matrix (miles, float32) and save it atomically.
+
+    The block is written to a temporary file and renamed into place, so a
+    killed worker never leaves a partial tile behind.
+    """
+    rows = slice(*row_range)
+    cols = slice(*col_range)
+    block = haversine_distance_array(latitudes[rows, None], longitudes[rows, None],
+                                     latitudes[None, cols], longitudes[None, cols])
+    output_path = Path(output_path)
+    temp_path = output_path.with_name(output_path.stem + ".tmp.npy")
+    np.save(temp_path, block.astype(np.float32))
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+_worker_coordinates = {}
+
+
+def _init_worker(latitudes, longitudes):
+    _worker_coordinates['lat'] = latitudes
+    _worker_coordinates['lon'] = longitudes
+
+
+def _tile_task(task):
+    (row_tile, col_tile), row_range, col_range, output_path = task
+    compute_tile(_worker_coordinates['lat'], _worker_coordinates['lon'],
+                 row_range, col_range, output_path)
+    return row_tile, col_tile
+
+
+class AllPairsJob:
+    # All-pairs matrix tiled into blocks; finished tiles are recorded in a manifest
+    #
+    # Only tiles on or above the diagonal are computed because the matrix is
+    # symmetric; load_matrix() mirrors them. Re-running the job skips every
+    # tile in the manifest (or on disk beside a matching manifest), so a
+    # crash costs at most the tiles that were in flight.
+
+    def __init__(self, columns, output_dir, tile_size=ALL_PAIRS_TILE_SIZE):
+        self.columns = columns
+        self.output_dir = Path(output_dir)
+        self.tile_size = tile_size
+        self.fingerprint = coordinates_fingerprint(columns)
+        self.tile_count = -(-len(columns) // tile_size)
+
+    def all_tiles(self):
+        return [(r, c) for r in range(self.tile_count) for c in range(r, self.tile_count)]
+
+    def tile_ranges(self, row_tile, col_tile):
+        n, size = len(self.columns), self.tile_size
+        return ((row_tile * size, min((row_tile + 1) * size, n)),
+                (col_tile * size, min((col_tile + 1) * size, n)))
+
+    def _manifest_path(self):
+        return self.output_dir / MANIFEST_NAME
+
+    def load_manifest(self):
+        """
+        Read completed tiles, adopting any finished tile files not yet recorded.
+
+        Tile files are only adopted beside a manifest for the same airports
+        and tiling; run() writes one before computing any tile. Without it,
+        files already in the directory are recomputed and overwritten.
+
+        Raises:
+            ValueError if the directory holds a job for other airports or tiling
+        """
+        path = self._manifest_path()
+        if not path.exists():
+            return set()
+        manifest = json.loads(path.read_text())
+        if (manifest["fingerprint"] != self.fingerprint or
+                manifest["tile_size"] != self.tile_size):
+            raise ValueError(f"'{self.output_dir}' holds a different all-pairs job "
+                             f"(fingerprint {manifest['fingerprint']}, tile size {manifest['tile_size']})")
+        recorded = {tuple(tile) for tile in manifest["completed"]}
+
+        # Tiles are renamed into place only when complete, so a file finished
+        # after the last manifest write is adopted; an entry whose file has
+        # gone is recomputed
+        completed = {tile for tile in recorded if tile_path(self.output_dir, *tile).exists()}
+        for tile in self.all_tiles():
+            if tile not in completed and tile_path(self.output_dir, *tile).exists():
+                completed.add(tile)
+        return completed
+
+    def _write_manifest(self, completed):
+        manifest = {
+            "fingerprint": self.fingerprint,
+            "airport_count": len(self.columns),
+            "tile_size": self.tile_size,
+            "tile_count": self.tile_count,
+            "completed": sorted(completed),
+        }
+        temp_path = self._manifest_path().with_suffix(".tmp")
+        temp_path.write_text(json.dumps(manifest))
+        os.replace(temp_path, self._manifest_path())
+
+    def pending_tiles(self):
+        completed = self.load_manifest()
+        return [tile for tile in self.all_tiles() if tile not in completed]
+
+    def run(self, workers=1, progress_callback=None):
+        """
+        Compute every tile not yet completed.
+
+        Arguments:
+            workers: Local worker processes (1 runs in this process)
+            progress_callback: Optional callable(completed_tiles, total_tiles)
+
+        Returns:
+            Number of tiles computed by this run
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        completed = self.load_manifest()
+        self._write_manifest(completed)
+        tasks = [(tile, *self.tile_ranges(*tile), tile_path(self.output_dir, *tile))
+                 for tile in self.all_tiles() if tile not in completed]
+        total = len(self.all_tiles())
+
+        def record(tile):
+            completed.add(tile)
+            self._write_manifest(completed)
+            if progress_callback:
+                progress_callback(len(completed), total)
+
+        lat, lon = self.columns.latitudes, self.columns.longitudes
+        if workers <= 1:
+            for task in tasks:
+                compute_tile(lat, lon, task[1], task[2], task[3])
+                record(task[0])
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(np.asarray(lat), np.asarray(lon))) as pool:
+                for future in as_completed([pool.submit(_tile_task, task) for task in tasks]):
+                    record(future.result())
+        return len(tasks)
+
+    def is_complete(self):
+        return not self.pending_tiles()
+
+    def load_matrix(self, out=None):
+        """
+        Assemble the full N x N matrix from finished tiles.
+
+        Arguments:
+            out: Optional preallocated array or memmap to fill
+
+        Raises:
+            ValueError if tiles are still pending
+        """
+        if not self.is_complete():
+            raise ValueError("All-pairs job is not complete; run it again to finish")
+        n = len(self.columns)
+        if out is None:
+            out = np.empty((n, n), dtype=np.float32)
+        for row_tile, col_tile in self.all_tiles():
+            (r0, r1), (c0, c1) = self.tile_ranges(row_tile, col_tile)
+            block = np.load(tile_path(self.output_dir, row_tile, col_tile))
+            out[r0:r1, c0:c1] = block
+            out[c0:c1, r0:r1] = block.T
+        return out
+
+
+if __name__ == "__main__":
+    # python -m services.all_pairs_job OUTPUT_DIR [--workers N] [--tile-size N]
+    parser = argparse.ArgumentParser(description="Resumable all-pairs distance computation")
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tile-size", type=int, default=ALL_PAIRS_TILE_SIZE)
+    args = parser.parse_args()
+
+    job = AllPairsJob(AirportColumns.from_airports(load_airports()),
+                      args.output_dir, args.tile_size)
+    done = job.run(args.workers, lambda finished, total: print(f"  Tiles complete: {finished}/{total}"))
+    print(f"  Computed {done} tiles; job complete: {job.is_complete()}")
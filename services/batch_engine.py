@@ -0,0 +1,353 @@
+"""Vectorized batch route calculations producing compact RouteBatch results."""
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from config.constants import AVERAGE_CRUISE_SPEED_MPH
+from models.airport import BatchAnalysis
+from models.route_batch import RouteBatch
+from services.aircraft_performance import PerformanceTable
+from services.geo_arrays import haversine_distance_array, initial_bearing_array
+from services.shared_store import (
+    SHARED_DATA_DIR,
+    attach_airport_data,
+    coordinates_fingerprint,
+    publish_columns
+)
+
+
+def compute_route_batch(columns, origin_idx, dest_idx, aircraft=None, wind_field=None):
+    """
+    Calculate metrics for many routes at once.
+
+    Mirrors calculate_flight_route: distances are haversine great-circle
+    distances, bearings are rounded to 0.1°, and flight time uses the same
+    aircraft profile and wind rules.
+
+    Arguments:
+        columns: AirportColumns the indices refer to
+        origin_idx: Array of origin airport indices
+        dest_idx: Array of destination airport indices
+        aircraft: Optional AircraftProfile for block time and fuel burn
+        wind_field: Optional WindField for wind-corrected flight time
+
+    Returns:
+        RouteBatch with one row per input pair
+    """
+    origin_idx = np.asarray(origin_idx, dtype=np.intp)
+    dest_idx = np.asarray(dest_idx, dtype=np.intp)
+    lat1, lon1 = columns.latitudes[origin_idx], columns.longitudes[origin_idx]
+    lat2, lon2 = columns.latitudes[dest_idx], columns.longitudes[dest_idx]
+
+    distance = haversine_distance_array(lat1, lon1, lat2, lon2)
+    rounded_miles = np.round(distance, 2)
+    bearing = np.round(initial_bearing_array(lat1, lon1, lat2, lon2), 1)
+
+    cruise_speed = aircraft.cruise_speed_mph if aircraft else AVERAGE_CRUISE_SPEED_MPH
+    still_air_hours = rounded_miles / cruise_speed
+    if wind_field is not None:
+        hours = wind_field.estimate_flight_hours(lat1, lon1, lat2, lon2, cruise_speed_mph=cruise_speed)
+    else:
+        hours = still_air_hours
+
+    block_hours = fuel_burn_kg = None
+    if aircraft:
+        airborne, block_hours, fuel_burn_kg = PerformanceTable([aircraft]).evaluate(rounded_miles, 0)
+        wind_delta = hours - still_air_hours
+        hours = airborne + wind_delta
+        block_hours = block_hours + wind_delta
+
+    return RouteBatch(
+        columns, origin_idx, dest_idx, distance, bearing, hours,
+        block_hours=block_hours,
+        fuel_burn_kg=fuel_burn_kg,
+        aircraft_type=aircraft.type_code if aircraft else None
+    )
+
+
+def summarize_route_batch(batch):
+    """
+    Build a BatchAnalysis over a RouteBatch without materializing every route.
+
+    Raises:
+        ValueError if the batch is empty
+    """
+    if len(batch) == 0:
+        raise ValueError("No valid routes to analyze")
+
+    rounded_miles = np.round(batch.distance_miles, 2)
+    total_distance = float(np.sum(rounded_miles))
+    total_time = float(np.sum(batch.flight_hours, dtype=np.float64))
+
+    return BatchAnalysis(
+        routes=batch,
+        total_distance_miles=total_distance,
+        average_distance_miles=total_distance / len(batch),
+        total_flight_time_hours=total_time,
+        average_flight_time_hours=total_time / len(batch),
+        shortest_route=batch.route(batch.argmin()),
+        longest_route=batch.route(batch.argmax()),
+        total_block_hours=None if batch.block_hours is None else float(np.sum(batch.block_hours, dtype=np.float64)),
+        total_fuel_burn_kg=None if batch.fuel_burn_kg is None else float(np.sum(batch.fuel_burn_kg, dtype=np.float64))
+    )
+
+
+# Pairs per task when the parallel path splits work across processes
+PARALLEL_CHUNK_SIZE = 50000
+
+_worker_state = {}
+
+
+def _init_worker(store_directory, aircraft, wind_field):
+    # Workers map the columns from a store rather than unpickling a copy each
+    columns = attach_airport_data(Path(store_directory)).columns
+    _worker_state.update(columns=columns, aircraft=aircraft, wind_field=wind_field)
+
+
+def _store_directory_for(columns, scratch_directory):
+    # The published store when it holds these columns, else a columns-only
+    # publish into scratch_directory
+    shared = attach_airport_data(SHARED_DATA_DIR)
+    if shared is not None and shared.fingerprint == coordinates_fingerprint(columns):
+        return SHARED_DATA_DIR
+    publish_columns(columns, scratch_directory, include_distance_matrix=False)
+    return scratch_directory
+
+
+def _compute_chunk(chunk):
+    origin_idx, dest_idx = chunk
+    batch = compute_route_batch(_worker_state['columns'], origin_idx, dest_idx,
+                                aircraft=_worker_state['aircraft'],
+                                wind_field=_worker_state['wind_field'])
+    # Ship only the arrays back; the parent reattaches its own columns
+    batch.columns = None
+    return batch
+
+
+def compute_route_batch_parallel(columns, origin_idx, dest_idx, aircraft=None,
+                                 wind_field=None, workers=1, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    compute_route_batch split into chunks across worker processes.
+
+    Falls back to the serial path for one worker or a single chunk. Workers
+    attach to the columns as memory maps (see services.shared_store): the
+    published data when it matches, else a temporary columns-only publish.
+    """
+    origin_idx = np.asarray(origin_idx, dtype=np.intp)
+    dest_idx = np.asarray(dest_idx, dtype=np.intp)
+    if workers <= 1 or len(origin_idx) <= chunk_size:
+        return compute_route_batch(columns, origin_idx, dest_idx, aircraft, wind_field)
+
+    chunks = [(origin_idx[i:i + chunk_size], dest_idx[i:i + chunk_size])
+              for i in range(0, len(origin_idx), chunk_size)]
+    with tempfile.TemporaryDirectory(prefix="route_batch_") as scratch:
+        store_directory = _store_directory_for(columns, Path(scratch))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(store_directory), aircraft, wind_field)) as pool:
+            batch = RouteBatch.concatenate(pool.map(_compute_chunk, chunks))
+    batch.columns = columns
+    return batch
+
+
+def compute_canonical_batch(columns, canonical, aircraft=None, wind_field=None, workers=1,
+                            store=None):
+    """
+    Compute each unique pair once and scatter results back to request order.
+
+    Distance, and with no wind also flight time, block time and fuel, are
+    symmetric and come straight from the unique pair. Bearing is recomputed
+    for pairs that are also requested in reverse, as is flight time when a
+    wind field makes it direction-dependent.
+
+    With a RouteResultStore, unique pairs are read through the store and only
+    misses are computed; wind-corrected results are never stored.
+
+    Arguments:
+        columns: AirportColumns the canonical indices refer to
+        canonical: CanonicalPairs from services.pair_dedup
+        aircraft: Optional AircraftProfile
+        wind_field: Optional WindField
+        workers: Worker processes for the unique-pair computation
+        store: Optional RouteResultStore (services.result_store)
+
+    Returns:
+        RouteBatch with one row per kept request row, in request order
+    """
+    low, high = canonical.low_idx, canonical.high_idx
+    if store is not None and wind_field is None:
+        forward = store.read_through(
+            columns, low, high, aircraft,
+            lambda origin_idx, dest_idx: compute_route_batch_parallel(
+                columns, origin_idx, dest_idx, aircraft, None, workers))
+    else:
+        forward = compute_route_batch_parallel(columns, low, high, aircraft, wind_field, workers)
+
+    needs_reverse = np.zeros(len(low), dtype=bool)
+    needs_reverse[canonical.row_pair[canonical.row_reversed]] = True
+    reverse_rows = np.flatnonzero(needs_reverse)
+
+    reverse = {name: None if getattr(forward, name) is None else getattr(forward, name).copy()
+               for name in ('bearing_degrees', 'flight_hours', 'block_hours', 'fuel_burn_kg')}
+    if wind_field is not None:
+        reversed_batch = compute_route_batch_parallel(columns, high[reverse_rows], low[reverse_rows],
+                                                      aircraft, wind_field, workers)
+        for name in reverse:
+            if reverse[name] is not None:
+                reverse[name][reverse_rows] = getattr(reversed_batch, name)
+    else:
+        lat, lon = columns.latitudes, columns.longitudes
+        hi, lo = high[reverse_rows], low[reverse_rows]
+        reverse['bearing_degrees'][reverse_rows] = np.round(
+            initial_bearing_array(lat[hi], lon[hi], lat[lo], lon[lo]), 1)
+
+    pair = canonical.row_pair
+    flipped = canonical.row_reversed
+
+    def scatter(name):
+        column = getattr(forward, name)
+        if column is None:
+            return None
+        return np.where(flipped, reverse[name][pair], column[pair])
+
+    return RouteBatch(
+        columns,
+        origin_idx=np.where(flipped, high[pair], low[pair]),
+        dest_idx=np.where(flipped, low[pair], high[pair]),
+        distance_miles=forward.distance_miles[pair],
+        bearing_degrees=scatter('bearing_degrees'),
+        flight_hours=scatter('flight_hours'),
+        block_hours=scatter('block_hours'),
+        fuel_burn_kg=scatter('fuel_burn_kg'),
+        aircraft_type=forward.aircraft_type
+    )
+
+
+def _route_record(batch, index):
+    """Plain-dict copy of one batch row, safe to pickle or write as JSON."""
+    def optional(column):
+        return None if column is None else float(column[index])
+
+    return {
+        'origin': str(batch.columns.codes[batch.origin_idx[index]]),
+        'destination': str(batch.columns.codes[batch.dest_idx[index]]),
+        'distance_miles': float(batch.distance_miles[index]),
+        'bearing_degrees': float(batch.bearing_degrees[index]),
+        'flight_hours': float(batch.flight_hours[index]),
+        'block_hours': optional(batch.block_hours),
+        'fuel_burn_kg': optional(batch.fuel_burn_kg),
+        'aircraft_type': batch.aircraft_type,
+    }
+
+
+def _record_to_route(record, columns):
+    """Materialize a route record as a FlightRoute against airport columns."""
+    def optional(name):
+        return None if record[name] is None else [record[name]]
+
+    single = RouteBatch(
+        columns,
+        origin_idx=[columns.index_of(record['origin'])],
+        dest_idx=[columns.index_of(record['destination'])],
+        distance_miles=[record['distance_miles']],
+        bearing_degrees=[record['bearing_degrees']],
+        flight_hours=[record['flight_hours']],
+        block_hours=optional('block_hours'),
+        fuel_burn_kg=optional('fuel_burn_kg'),
+        aircraft_type=record['aircraft_type']
+    )
+    return single.route(0)
+
+
+class BatchPartial:
+    # Mergeable running totals for batch results processed in pieces
+    #
+    # Partials from chunks, threads, processes or machines combine with
+    # merge() and become a BatchAnalysis without keeping every route.
+
+    def __init__(self):
+        self.request_rows = 0
+        self.skipped_unknown = 0
+        self.skipped_same_airport = 0
+        self.route_count = 0
+        self.total_distance_miles = 0.0
+        self.total_flight_time_hours = 0.0
+        self.total_block_hours = None
+        self.total_fuel_burn_kg = None
+        self.shortest = None
+        self.longest = None
+
+    def add_batch(self, batch, canonical=None):
+        """Fold a computed RouteBatch (and its request bookkeeping) into the totals."""
+        if canonical is not None:
+            self.request_rows += canonical.total_rows
+            self.skipped_unknown += canonical.skipped_unknown
+            self.skipped_same_airport += canonical.skipped_same_airport
+        if len(batch) == 0:
+            return self
+
+        self.route_count += len(batch)
+        self.total_distance_miles += float(np.sum(np.round(batch.distance_miles, 2)))
+        self.total_flight_time_hours += float(np.sum(batch.flight_hours, dtype=np.float64))
+        if batch.block_hours is not None:
+            self.total_block_hours = (self.total_block_hours or 0.0) + float(
+                np.sum(batch.block_hours, dtype=np.float64))
+            self.total_fuel_burn_kg = (self.total_fuel_burn_kg or 0.0) + float(
+                np.sum(batch.fuel_burn_kg, dtype=np.float64))
+
+        shortest = _route_record(batch, batch.argmin())
+        longest = _route_record(batch, batch.argmax())
+        self._keep_extremes(shortest, longest)
+        return self
+
+    def _keep_extremes(self, shortest, longest):
+        if shortest and (self.shortest is None or shortest['distance_miles'] < self.shortest['distance_miles']):
+            self.shortest = shortest
+        if longest and (self.longest is None or longest['distance_miles'] > self.longest['distance_miles']):
+            self.longest = longest
+
+    def merge(self, other):
+        """Combine another partial into this one (in place) and return self."""
+        self.request_rows += other.request_rows
+        self.skipped_unknown += other.skipped_unknown
+        self.skipped_same_airport += other.skipped_same_airport
+        self.route_count += other.route_count
+        self.total_distance_miles += other.total_distance_miles
+        self.total_flight_time_hours += other.total_flight_time_hours
+        if other.total_block_hours is not None:
+            self.total_block_hours = (self.total_block_hours or 0.0) + other.total_block_hours
+            self.total_fuel_burn_kg = (self.total_fuel_burn_kg or 0.0) + other.total_fuel_burn_kg
+        self._keep_extremes(other.shortest, other.longest)
+        return self
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        partial = cls()
+        for name in vars(partial):
+            setattr(partial, name, data.get(name, getattr(partial, name)))
+        return partial
+
+    def to_batch_analysis(self, columns):
+        """
+        Summarize the totals as a BatchAnalysis (with no per-route list).
+
+        Raises:
+            ValueError if no routes were added
+        """
+        if self.route_count == 0:
+            raise ValueError("No valid routes to analyze")
+
+        return BatchAnalysis(
+            routes=[],
+            total_distance_miles=self.total_distance_miles,
+            average_distance_miles=self.total_distance_miles / self.route_count,
+            total_flight_time_hours=self.total_flight_time_hours,
+            average_flight_time_hours=self.total_flight_time_hours / self.route_count,
+            shortest_route=_record_to_route(self.shortest, columns),
+            longest_route=_record_to_route(self.longest, columns),
+            total_block_hours=self.total_block_hours,
+            total_fuel_burn_kg=self.total_fuel_burn_kg,
+            total_routes=self.route_count
+        )
@@ -0,0 +1,200 @@
+"""Chunked processing of route files with bounded memory and progress reporting."""
+import csv
+import threading
+import numpy as np
+from config.constants import COMPASS_DIRECTIONS, COMPASS_SEGMENT_SIZE
+from models.route_batch import KM_PER_MILE, NM_PER_MILE
+from services.batch_engine import BatchPartial, compute_canonical_batch
+from services.pair_dedup import canonicalize_pairs
+
+# Request rows parsed and computed together; bounds peak memory per chunk
+ROUTE_FILE_CHUNK_ROWS = 100000
+
+RESULT_HEADER = ["Origin", "Destination", "Distance_Miles", "Distance_KM",
+                 "Distance_NM", "Bearing_Degrees", "Compass_Direction",
+                 "Estimated_Flight_Hours"]
+PERFORMANCE_HEADER = ["Aircraft_Type", "Block_Hours", "Fuel_Burn_KG"]
+
+
+def iter_route_chunks(binary_file, chunk_rows=ROUTE_FILE_CHUNK_ROWS):
+    """
+    Parse a CSV of route pairs lazily, one chunk at a time.
+
+    A header row naming 'origin' and 'dest...' columns is detected and used
+    to locate the codes; otherwise the first two columns are used. Rows with
+    too few fields are passed through as empty codes so they are counted as
+    invalid rather than silently lost.
+
+    Arguments:
+        binary_file: File opened in binary mode (or an upload buffer)
+        chunk_rows: Maximum pairs per chunk
+
+    Yields:
+        Tuple of (list of (origin, destination) pairs, bytes read so far)
+    """
+    origin_col, dest_col = 0, 1
+    pairs = []
+    bytes_read = 0
+    first_row = True
+
+    for raw_line in binary_file:
+        bytes_read += len(raw_line)
+        line = raw_line.decode('utf-8-sig').strip()
+        if not line:
+            continue
+        fields = next(csv.reader([line]))
+
+        if first_row:
+            first_row = False
+            lowered = [field.strip().lower() for field in fields]
+            if any('origin' in field for field in lowered):
+                origin_col = next(i for i, field in enumerate(lowered) if 'origin' in field)
+                dest_col = next((i for i, field in enumerate(lowered) if 'dest' in field), 1)
+                continue
+
+        if len(fields) > max(origin_col, dest_col):
+            pairs.append((fields[origin_col], fields[dest_col]))
+        else:
+            pairs.append(("", ""))
+
+        if len(pairs) >= chunk_rows:
+            yield pairs, bytes_read
+            pairs = []
+
+    if pairs:
+        yield pairs, bytes_read
+
+
+def write_route_rows(batch, writer):
+    """Write every row of a RouteBatch as CSV using column-wise formatting."""
+    codes = batch.columns.codes
+    miles = batch.distance_miles
+    bearing = np.round(batch.bearing_degrees.astype(np.float64), 1)
+    compass = np.array(COMPASS_DIRECTIONS)[
+        np.round(bearing / COMPASS_SEGMENT_SIZE).astype(np.intp) % len(COMPASS_DIRECTIONS)]
+
+    columns = [
+        codes[batch.origin_idx].tolist(),
+        codes[batch.dest_idx].tolist(),
+        np.round(miles, 2).tolist(),
+        np.round(miles * KM_PER_MILE, 2).tolist(),
+        np.round(miles * NM_PER_MILE, 2).tolist(),
+        bearing.tolist(),
+        compass.tolist(),
+        np.round(batch.flight_hours.astype(np.float64), 4).tolist(),
+    ]
+    if batch.block_hours is not None:
+        columns += [
+            [batch.aircraft_type] * len(batch),
+            np.round(batch.block_hours.astype(np.float64), 4).tolist(),
+            np.round(batch.fuel_burn_kg.astype(np.float64), 1).tolist(),
+        ]
+    writer.writerows(zip(*columns))
+
+
+def process_route_stream(binary_file, columns, output_file=None, aircraft=None,
+                         wind_field=None, chunk_rows=ROUTE_FILE_CHUNK_ROWS,
+                         progress_callback=None, grouped=()):
+    """
+    Run the batch engine over a route file chunk by chunk.
+
+    Only one chunk of requests and results is held in memory at a time;
+    totals accumulate in a mergeable BatchPartial.
+
+    Arguments:
+        binary_file: Route CSV opened in binary mode
+        columns: AirportColumns to resolve codes against
+        output_file: Optional text file receiving per-route result rows
+        aircraft: Optional AircraftProfile
+        wind_field: Optional WindField
+        chunk_rows: Request rows per chunk
+        progress_callback: Optional callable(bytes_read, rows_processed)
+        grouped: GroupedPartials (services.grouped_stats) fed every chunk
+
+    Returns:
+        BatchPartial with the totals for the whole file
+    """
+    partial = BatchPartial()
+    writer = None
+    if output_file is not None:
+        writer = csv.writer(output_file)
+        writer.writerow(RESULT_HEADER + (PERFORMANCE_HEADER if aircraft else []))
+
+    for pairs, bytes_read in iter_route_chunks(binary_file, chunk_rows):
+        canonical = canonicalize_pairs(pairs, columns)
+        batch = compute_canonical_batch(columns, canonical, aircraft=aircraft, wind_field=wind_field)
+        partial.add_batch(batch, canonical)
+        for group_partial in grouped:
+            group_partial.add_batch(batch)
+        if writer is not None:
+            write_route_rows(batch, writer)
+        if progress_callback:
+            progress_callback(bytes_read, partial.request_rows)
+
+    return partial
+
+
+class _JobCancelled(Exception):
+    # Raised from the progress callback to stop a cancelled job between chunks
+    pass
+
+
+class BatchJob:
+    # Runs process_route_stream on a background thread so the caller stays responsive
+
+    def __init__(self, binary_file, total_bytes, columns, output_path, aircraft=None,
+                 chunk_rows=ROUTE_FILE_CHUNK_ROWS):
+        self.binary_file = binary_file
+        self.total_bytes = max(int(total_bytes), 1)
+        self.columns = columns
+        self.output_path = output_path
+        self.aircraft = aircraft
+        self.chunk_rows = chunk_rows
+        self.bytes_read = 0
+        self.rows_processed = 0
+        self.partial = None
+        self.error = None
+        self.cancelled = False
+        self._cancel_requested = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        # Stop after the chunk in progress, without waiting; partial stays None
+        self._cancel_requested.set()
+
+    def _progress(self, bytes_read, rows_processed):
+        if self._cancel_requested.is_set():
+            raise _JobCancelled()
+        self.bytes_read = bytes_read
+        self.rows_processed = rows_processed
+
+    def _run(self):
+        try:
+            with open(self.output_path, 'w', newline='') as output_file:
+                self.partial = process_route_stream(
+                    self.binary_file, self.columns, output_file,
+                    aircraft=self.aircraft,
+                    chunk_rows=self.chunk_rows,
+                    progress_callback=self._progress
+                )
+        except _JobCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+
+    def is_done(self):
+        return not self._thread.is_alive()
+
+    def get_progress(self):
+        # Fraction of the input consumed (0.0 - 1.0)
+        if self.is_done():
+            return 1.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.is_done()
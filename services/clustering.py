@@ -0,0 +1,285 @@
+"""Spherical k-means / k-medoids clustering of airports into hub catchments."""
+import csv
+from pathlib import Path
+import numpy as np
+from config.constants import EARTH_RADIUS_MILES
+from services.geo_arrays import unit_vectors, vectors_to_lat_lon
+from services.spatial_index import NearestAirportIndex
+
+CLUSTER_METHODS = ("kmeans", "kmedoids")
+CLUSTER_MAX_ITERATIONS = 50
+# Stop once fewer than this fraction of airports change cluster in a round
+CLUSTER_CHANGE_TOLERANCE = 1e-4
+
+# Airport x center dot products per assignment block; small enough to stay in
+# cache, which is several times faster than one large product
+CLUSTER_BLOCK_CELLS = 262144
+
+# Members nearest each cluster's mean tried as its medoid; bounds the
+# medoid update to candidates x members distances per cluster
+MEDOID_CANDIDATES = 64
+
+DISTANCE_PERCENTILES = (50, 90, 99)
+
+
+def load_airport_weights(filepath, columns, default_weight=0.0):
+    """
+    Load per-airport weights (e.g. annual traffic) from a CSV.
+
+    The file needs 'Airport_Code' and 'Weight' columns; airports not listed
+    get `default_weight`, and codes not in `columns` are skipped.
+
+    Returns:
+        Array of weights aligned with the airport columns
+    """
+    weights = np.full(len(columns), float(default_weight))
+    loaded = skipped = 0
+    with open(filepath, 'r') as file:
+        for row in csv.DictReader(file):
+            index = columns.index_of(row['Airport_Code'].strip().upper())
+            try:
+                weight = float(row['Weight'])
+            except ValueError:
+                index = None
+            if index is None or weight < 0:
+                skipped += 1
+                continue
+            weights[index] = weight
+            loaded += 1
+
+    print(f"  Loaded weights for {loaded} airports from '{Path(filepath).name}'")
+    if skipped:
+        print(f"     Skipped {skipped} rows with unknown codes or invalid weights")
+    return weights
+
+
+def _angles(vectors, centers):
+    # Exact central angle between matched rows (accurate for close points too)
+    return np.arctan2(np.linalg.norm(np.cross(vectors, centers), axis=1),
+                      np.einsum('ij,ij->i', vectors, centers))
+
+
+def _assign(vectors, centers):
+    # Nearest center for every airport: blocked dot products, argmax per row
+    nearest = np.empty(len(vectors), dtype=np.intp)
+    block_rows = max(1, CLUSTER_BLOCK_CELLS // len(centers))
+    for start in range(0, len(vectors), block_rows):
+        block = slice(start, start + block_rows)
+        nearest[block] = np.argmax(vectors[block] @ centers.T, axis=1)
+    return nearest
+
+
+def _kmeans_plus_plus(vectors, weights, k, rng):
+    # Weighted k-means++ seeding: each next seed is drawn with probability
+    # proportional to weight x (1 - cos angle) to the nearest seed so far,
+    # the spherical analogue of squared distance
+    seeds = [int(rng.choice(len(vectors), p=weights / weights.sum()))]
+    nearest_gap = 1.0 - vectors @ vectors[seeds[0]]
+    for _ in range(1, k):
+        score = weights * np.maximum(nearest_gap, 0.0)
+        if score.sum() <= 0:
+            break
+        seeds.append(int(rng.choice(len(vectors), p=score / score.sum())))
+        np.minimum(nearest_gap, 1.0 - vectors @ vectors[seeds[-1]], out=nearest_gap)
+    return np.array(seeds, dtype=np.intp)
+
+
+def _weighted_means(vectors, weights, assignment, k):
+    # Normalized weighted sum of member vectors per cluster (zero rows if empty)
+    sums = np.stack([np.bincount(assignment, weights=weights * vectors[:, axis], minlength=k)
+                     for axis in range(3)], axis=1)
+    norms = np.linalg.norm(sums, axis=1, keepdims=True)
+    return np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+
+
+def _medoids(vectors, weights, assignment, medoids):
+    # Per cluster, the candidate member with the least weighted angle to all members
+    means = _weighted_means(vectors, weights, assignment, len(medoids))
+    members_by_cluster = np.split(np.argsort(assignment, kind='stable'),
+                                  np.cumsum(np.bincount(assignment, minlength=len(medoids)))[:-1])
+    updated = medoids.copy()
+    for cluster, members in enumerate(members_by_cluster):
+        if len(members) == 0:
+            continue
+        closeness = vectors[members] @ means[cluster]
+        count = min(MEDOID_CANDIDATES, len(members))
+        candidates = members[np.argpartition(-closeness, count - 1)[:count]]
+        candidates = np.union1d(candidates, [medoids[cluster]])
+        dots = np.clip(vectors[candidates] @ vectors[members].T, -1.0, 1.0)
+        cost = np.arccos(dots) @ weights[members]
+        updated[cluster] = candidates[np.argmin(cost)]
+    return updated
+
+
+class ClusteringResult:
+    # Hub centers plus every airport's nearest hub and distance to it
+    #
+    # hub_idx holds airport indices for k-medoids and evaluate_hubs; k-means
+    # centers are arbitrary points, so it is None and center_lat/center_lon
+    # give their positions.
+
+    def __init__(self, columns, method, center_vectors, assignment, distance_miles,
+                 weights, hub_idx=None, iterations=0):
+        self.columns = columns
+        self.method = method
+        self.center_lat, self.center_lon = vectors_to_lat_lon(center_vectors)
+        self.assignment = assignment
+        self.distance_miles = distance_miles
+        self.weights = weights
+        self.hub_idx = hub_idx
+        self.iterations = iterations
+
+    def __len__(self):
+        return len(self.center_lat)
+
+    def get_cost(self):
+        # Weighted mean distance from airports to their hub (miles)
+        return float(np.average(self.distance_miles, weights=self.weights))
+
+    def get_cluster_sizes(self):
+        return np.bincount(self.assignment, minlength=len(self))
+
+    def get_hub_label(self, cluster):
+        if self.hub_idx is not None:
+            return str(self.columns.codes[self.hub_idx[cluster]])
+        return f"{self.center_lat[cluster]:.2f}, {self.center_lon[cluster]:.2f}"
+
+    def get_distance_distribution(self, percentiles=DISTANCE_PERCENTILES):
+        return distance_distribution(self.distance_miles, self.weights, percentiles)
+
+    def get_rows(self):
+        """One summary dict per cluster, largest total weight first."""
+        total_weight = np.bincount(self.assignment, weights=self.weights, minlength=len(self))
+        sizes = self.get_cluster_sizes()
+        rows = []
+        for cluster in np.argsort(-total_weight, kind='stable'):
+            members = self.assignment == cluster
+            rows.append({
+                'hub': self.get_hub_label(cluster),
+                'airports': int(sizes[cluster]),
+                'weight': float(total_weight[cluster]),
+                **distance_distribution(self.distance_miles[members], self.weights[members]),
+            })
+        return rows
+
+    def get_airport_rows(self):
+        # Every airport with its nearest hub and distance, in column order
+        return [{'code': str(code), 'hub': self.get_hub_label(cluster),
+                 'distance_miles': round(float(miles), 2)}
+                for code, cluster, miles in zip(self.columns.codes, self.assignment,
+                                                self.distance_miles)]
+
+
+def distance_distribution(distance_miles, weights=None, percentiles=DISTANCE_PERCENTILES):
+    """
+    Weighted mean, percentiles and maximum of airport-to-hub distances.
+
+    Returns:
+        Dict with 'mean_miles', 'p<N>_miles' per percentile and 'max_miles'
+        (all NaN when there are no distances, e.g. for an empty cluster)
+    """
+    distance_miles = np.asarray(distance_miles, dtype=np.float64)
+    if len(distance_miles) == 0:
+        return dict.fromkeys(['mean_miles'] + [f'p{p}_miles' for p in percentiles] + ['max_miles'],
+                             float('nan'))
+    weights = np.ones(len(distance_miles)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if weights.sum() <= 0:
+        weights = np.ones(len(distance_miles))
+
+    order = np.argsort(distance_miles, kind='stable')
+    cumulative = np.cumsum(weights[order]) / weights.sum()
+    summary = {'mean_miles': float(np.average(distance_miles, weights=weights))}
+    for p in percentiles:
+        position = min(np.searchsorted(cumulative, p / 100.0), len(order) - 1)
+        summary[f'p{p}_miles'] = float(distance_miles[order[position]])
+    summary['max_miles'] = float(distance_miles.max())
+    return summary
+
+
+def cluster_airports(columns, k, method="kmeans", weights=None, seed=0,
+                     max_iterations=CLUSTER_MAX_ITERATIONS):
+    """
+    Group airports into k catchments around hubs on the sphere.
+
+    Both methods start from weighted k-means++ seeds and alternate between
+    assigning every airport to its nearest center (blocked dot products, so
+    80k airports x hundreds of centers is a few matrix multiplies) and
+    moving the centers, until almost no assignment changes
+    (CLUSTER_CHANGE_TOLERANCE).
+
+    'kmeans' moves each center to the normalized weighted mean of its
+    members. 'kmedoids' keeps centers on real airports: the new hub is the
+    member with the least weighted distance to the rest, searched among the
+    MEDOID_CANDIDATES members closest to the cluster mean.
+
+    Arguments:
+        columns: AirportColumns to cluster
+        k: Number of clusters
+        method: 'kmeans' or 'kmedoids'
+        weights: Optional per-airport weights (e.g. from load_airport_weights)
+        seed: Random seed for k-means++ seeding
+        max_iterations: Upper bound on assign / update rounds
+
+    Returns:
+        ClusteringResult
+    """
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"Unknown clustering method '{method}'; expected one of {CLUSTER_METHODS}")
+    weights = np.ones(len(columns)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if len(weights) != len(columns) or np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("Weights must be non-negative, one per airport, and not all zero")
+    if not 1 <= k <= np.count_nonzero(weights):
+        raise ValueError(f"k must be between 1 and {np.count_nonzero(weights)} (airports with weight)")
+
+    rng = np.random.default_rng(seed)
+    vectors = unit_vectors(columns.latitudes, columns.longitudes)
+    medoids = _kmeans_plus_plus(vectors, weights, k, rng)
+    centers = vectors[medoids]
+    assignment = _assign(vectors, centers)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        if method == "kmeans":
+            means = _weighted_means(vectors, weights, assignment, len(centers))
+            # Empty (or zero-weight) clusters keep their previous center
+            centers = np.where(np.linalg.norm(means, axis=1, keepdims=True) > 0, means, centers)
+        else:
+            medoids = _medoids(vectors, weights, assignment, medoids)
+            centers = vectors[medoids]
+        updated = _assign(vectors, centers)
+        changed = np.count_nonzero(updated != assignment)
+        assignment = updated
+        if changed <= CLUSTER_CHANGE_TOLERANCE * len(vectors):
+            break
+
+    distance = _angles(vectors, centers[assignment]) * EARTH_RADIUS_MILES
+    return ClusteringResult(columns, method, centers, assignment, distance, weights,
+                            hub_idx=medoids if method == "kmedoids" else None,
+                            iterations=iterations)
+
+
+def evaluate_hubs(columns, hub_codes, weights=None):
+    """
+    Assign every airport to its nearest hub from a candidate hub set.
+
+    Use get_cost / get_distance_distribution on the results of several
+    candidate sets to compare them.
+
+    Raises:
+        ValueError: If a hub code is not a known airport
+    """
+    hub_idx = []
+    for code in hub_codes:
+        index = columns.index_of(code.strip().upper())
+        if index is None:
+            raise ValueError(f"Unknown hub airport '{code}'")
+        hub_idx.append(index)
+    hub_idx = np.array(sorted(set(hub_idx)), dtype=np.intp)
+    weights = np.ones(len(columns)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    mask = np.zeros(len(columns), dtype=bool)
+    mask[hub_idx] = True
+    nearest, distance = NearestAirportIndex(columns, mask).nearest(columns.latitudes, columns.longitudes)
+    assignment = np.searchsorted(hub_idx, nearest)
+    centers = unit_vectors(columns.latitudes[hub_idx], columns.longitudes[hub_idx])
+    return ClusteringResult(columns, "hubs", centers, assignment, distance, weights, hub_idx=hub_idx)
@@ -0,0 +1,160 @@
+"""ETOPS diversion coverage along great-circle routes."""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.constants import (
+    EARTH_RADIUS_MILES,
+    ETOPS_DIVERSION_SPEED_MPH,
+    ETOPS_SAMPLE_SPACING_MILES
+)
+from services.geo_arrays import unit_vectors
+from services.spatial_index import NearestAirportIndex
+
+# Legs handled per task on the parallel path
+ETOPS_LEGS_PER_TASK = 2000
+
+
+class EtopsCoverage:
+    # Diversion coverage per leg, with the uncovered stretches listed separately
+    #
+    # uncovered_* arrays hold one row per gap: the leg it belongs to and its
+    # start/end along-track distance in miles from the origin.
+
+    def __init__(self, limit_minutes, max_diversion_minutes, worst_alternate_idx,
+                 worst_along_track_miles, uncovered_leg, uncovered_start_miles,
+                 uncovered_end_miles):
+        self.limit_minutes = limit_minutes
+        self.max_diversion_minutes = max_diversion_minutes
+        self.worst_alternate_idx = worst_alternate_idx
+        self.worst_along_track_miles = worst_along_track_miles
+        self.uncovered_leg = uncovered_leg
+        self.uncovered_start_miles = uncovered_start_miles
+        self.uncovered_end_miles = uncovered_end_miles
+
+    def is_covered(self):
+        # Boolean per leg: every sampled point is within the limit
+        return self.max_diversion_minutes <= self.limit_minutes
+
+    def gaps_for_leg(self, leg):
+        rows = self.uncovered_leg == leg
+        return list(zip(self.uncovered_start_miles[rows].tolist(),
+                        self.uncovered_end_miles[rows].tolist()))
+
+
+def _sample_legs(start, end, spacing_miles):
+    """
+    Sample every leg at roughly even spacing, flattened across legs.
+
+    Returns:
+        Tuple of (points (T, 3), leg id per point, along-track miles per point)
+    """
+    angle = np.arctan2(np.linalg.norm(np.cross(start, end), axis=1),
+                       np.einsum('ij,ij->i', start, end))
+    counts = np.maximum(np.ceil(angle * EARTH_RADIUS_MILES / spacing_miles).astype(np.intp), 1) + 1
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    leg = np.repeat(np.arange(len(counts)), counts)
+    fraction = (np.arange(offsets[-1]) - offsets[leg]) / (counts[leg] - 1)
+    theta = angle[leg]
+    sin_theta = np.sin(theta)
+    degenerate = sin_theta < 1e-12
+    safe = np.where(degenerate, 1.0, sin_theta)
+    weight_start = np.where(degenerate, 1.0 - fraction, np.sin((1.0 - fraction) * theta) / safe)
+    weight_end = np.where(degenerate, fraction, np.sin(fraction * theta) / safe)
+
+    points = weight_start[:, None] * start[leg] + weight_end[:, None] * end[leg]
+    points /= np.linalg.norm(points, axis=1)[:, None]
+    return points, leg, fraction * theta * EARTH_RADIUS_MILES
+
+
+def _coverage_chunk(index, start, end, limit_minutes, speed_mph, spacing_miles):
+    """Coverage for one group of legs; leg ids in the result are local to the group."""
+    points, leg, along = _sample_legs(start, end, spacing_miles)
+    alternate, miles = index.nearest_vectors(points)
+    minutes = miles / speed_mph * 60.0
+
+    leg_count = len(start)
+    worst = np.full(leg_count, -1.0)
+    np.maximum.at(worst, leg, minutes)
+    # First sample reaching each leg's maximum
+    is_worst = minutes == worst[leg]
+    worst_point = np.full(leg_count, len(points), dtype=np.intp)
+    np.minimum.at(worst_point, leg[is_worst], np.flatnonzero(is_worst))
+
+    uncovered = minutes > limit_minutes
+    new_leg = np.concatenate([[True], leg[1:] != leg[:-1]])
+    last_of_leg = np.concatenate([leg[1:] != leg[:-1], [True]])
+    gap_start = uncovered & (new_leg | ~np.concatenate([[False], uncovered[:-1]]))
+    gap_end = uncovered & (last_of_leg | ~np.concatenate([uncovered[1:], [False]]))
+
+    return (worst, alternate[worst_point], along[worst_point],
+            leg[gap_start], along[gap_start], along[gap_end])
+
+
+_worker_index = {}
+
+
+def _init_worker(index):
+    _worker_index['index'] = index
+
+
+def _coverage_task(args):
+    return _coverage_chunk(_worker_index['index'], *args)
+
+
+def analyze_etops_coverage(columns, origin_idx, dest_idx, limit_minutes,
+                           alternate_mask=None,
+                           diversion_speed_mph=ETOPS_DIVERSION_SPEED_MPH,
+                           sample_spacing_miles=ETOPS_SAMPLE_SPACING_MILES,
+                           workers=1):
+    """
+    Check that every point of each leg is within a diversion time of an alternate.
+
+    Each great-circle leg is sampled every `sample_spacing_miles`; the nearest
+    eligible alternate is found for all samples at once through a
+    NearestAirportIndex, and diversion time assumes still air at
+    `diversion_speed_mph`. Legs are split across `workers` processes.
+
+    Arguments:
+        columns: AirportColumns
+        origin_idx, dest_idx: Arrays of leg endpoint indices
+        limit_minutes: Maximum allowed diversion time (e.g. 180 for ETOPS-180)
+        alternate_mask: Optional boolean mask of eligible alternates (default all)
+        diversion_speed_mph: Diversion speed used to convert miles to minutes
+        sample_spacing_miles: Distance between checked points
+        workers: Worker processes for the leg groups
+
+    Returns:
+        EtopsCoverage
+    """
+    origin_idx = np.atleast_1d(np.asarray(origin_idx, dtype=np.intp))
+    dest_idx = np.atleast_1d(np.asarray(dest_idx, dtype=np.intp))
+    index = NearestAirportIndex(columns, alternate_mask)
+    vectors = unit_vectors(columns.latitudes, columns.longitudes)
+    start, end = vectors[origin_idx], vectors[dest_idx]
+
+    groups = [(start[i:i + ETOPS_LEGS_PER_TASK], end[i:i + ETOPS_LEGS_PER_TASK],
+               limit_minutes, diversion_speed_mph, sample_spacing_miles)
+              for i in range(0, len(origin_idx), ETOPS_LEGS_PER_TASK)]
+
+    if workers > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(index,)) as pool:
+            results = list(pool.map(_coverage_task, groups))
+    else:
+        results = [_coverage_chunk(index, *group) for group in groups]
+
+    if not results:
+        empty = np.zeros(0)
+        return EtopsCoverage(limit_minutes, empty, empty.astype(np.intp), empty,
+                             empty.astype(np.intp), empty, empty)
+
+    leg_offsets = np.arange(len(results)) * ETOPS_LEGS_PER_TASK
+    return EtopsCoverage(
+        limit_minutes=limit_minutes,
+        max_diversion_minutes=np.concatenate([r[0] for r in results]),
+        worst_alternate_idx=np.concatenate([r[1] for r in results]),
+        worst_along_track_miles=np.concatenate([r[2] for r in results]),
+        uncovered_leg=np.concatenate([r[3] + offset for r, offset in zip(results, leg_offsets)]),
+        uncovered_start_miles=np.concatenate([r[4] for r in results]),
+        uncovered_end_miles=np.concatenate([r[5] for r in results])
+    )
@@ -0,0 +1,111 @@
+"""Vectorized great-circle math over NumPy arrays of coordinates."""
+import numpy as np
+from config.constants import (
+    EARTH_RADIUS_KM,
+    EARTH_RADIUS_MILES,
+    EARTH_RADIUS_NAUTICAL_MILES
+)
+
+
+def earth_radius(unit='miles'):
+    """Return Earth's radius in the requested unit ('miles', 'km' or 'nautical_miles')."""
+    if unit == 'km':
+        return EARTH_RADIUS_KM
+    if unit == 'nautical_miles':
+        return EARTH_RADIUS_NAUTICAL_MILES
+    return EARTH_RADIUS_MILES
+
+
+def haversine_distance_array(lat1, lon1, lat2, lon2, unit='miles'):
+    """
+    Great-circle distance for arrays of coordinate pairs.
+
+    Arguments:
+        lat1, lon1: Arrays (or scalars) of first points in decimal degrees
+        lat2, lon2: Arrays (or scalars) of second points in decimal degrees
+        unit: 'miles', 'km', or 'nautical_miles'
+
+    Returns:
+        Array of unrounded distances, broadcast over the inputs
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(np.subtract(lon2, lon1))
+
+    a = (np.sin(dlat / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2)
+    a = np.clip(a, 0.0, 1.0)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return earth_radius(unit) * c
+
+
+def initial_bearing_array(lat1, lon1, lat2, lon2):
+    """
+    Initial bearing for arrays of coordinate pairs.
+
+    Returns:
+        Array of unrounded bearings in degrees (0-360)
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlon_rad = np.radians(np.subtract(lon2, lon1))
+
+    y = np.sin(dlon_rad) * np.cos(lat2_rad)
+    x = (np.cos(lat1_rad) * np.sin(lat2_rad) -
+         np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(dlon_rad))
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def unit_vectors(lat, lon):
+    """Convert latitude/longitude arrays to 3D unit vectors with shape (..., 3)."""
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    cos_lat = np.cos(lat_rad)
+    return np.stack([cos_lat * np.cos(lon_rad),
+                     cos_lat * np.sin(lon_rad),
+                     np.sin(lat_rad)], axis=-1)
+
+
+def vectors_to_lat_lon(vectors):
+    """Convert 3D vectors with shape (..., 3) back to (lat, lon) arrays in degrees."""
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    lat = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    lon = np.degrees(np.arctan2(y, x))
+    return lat, lon
+
+
+def sample_great_circle(lat1, lon1, lat2, lon2, samples):
+    """
+    Sample evenly spaced points along the great circles between coordinate pairs.
+
+    Arguments:
+        lat1, lon1: Arrays of route origins in decimal degrees, shape (n,)
+        lat2, lon2: Arrays of route destinations in decimal degrees, shape (n,)
+        samples: Number of points per route, endpoints included (>= 2)
+
+    Returns:
+        Tuple of (lat, lon) arrays with shape (n, samples)
+    """
+    if samples < 2:
+        raise ValueError("samples must be at least 2")
+
+    start = unit_vectors(np.atleast_1d(lat1), np.atleast_1d(lon1))
+    end = unit_vectors(np.atleast_1d(lat2), np.atleast_1d(lon2))
+
+    # Spherical linear interpolation; identical endpoints fall back to linear
+    cos_angle = np.clip(np.einsum('ij,ij->i', start, end), -1.0, 1.0)
+    angle = np.arccos(cos_angle)[:, None]
+    fractions = np.linspace(0.0, 1.0, samples)[None, :]
+    sin_angle = np.sin(angle)
+    degenerate = sin_angle < 1e-12
+    safe_sin = np.where(degenerate, 1.0, sin_angle)
+
+    weight_start = np.where(degenerate, 1.0 - fractions,
+                            np.sin((1.0 - fractions) * angle) / safe_sin)
+    weight_end = np.where(degenerate, fractions,
+                          np.sin(fractions * angle) / safe_sin)
+
+    points = (weight_start[..., None] * start[:, None, :] +
+              weight_end[..., None] * end[:, None, :])
+    return vectors_to_lat_lon(points)
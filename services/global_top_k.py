@@ -0,0 +1,140 @@
+"""Global top-K longest / shortest routes over all airport pairs, block by block."""
+import heapq
+import numpy as np
+from services.batch_engine import compute_route_batch
+from services.geo_arrays import earth_radius, haversine_distance_array, unit_vectors
+
+# Airports per block; a block pair holds at most GLOBAL_TOP_K_BLOCK² distances
+GLOBAL_TOP_K_BLOCK = 256
+
+# Slack (radians) on cap bounds so rounding never prunes a block that can tie
+CAP_BOUND_SLACK = 1e-9
+# Slack on dot-product screening, far above its floating-point error
+DOT_SCREEN_SLACK = 1e-9
+
+
+def _spatial_order(latitudes, longitudes):
+    # Z-order (Morton) curve over a 1024 x 1024 lat/lon grid, so consecutive
+    # airports are close together and blocks have small bounding caps
+    row = np.clip(((np.asarray(latitudes) + 90.0) / 180.0 * 1024).astype(np.uint32), 0, 1023)
+    col = np.clip(((np.asarray(longitudes) + 180.0) / 360.0 * 1024).astype(np.uint32), 0, 1023)
+    code = np.zeros(len(row), dtype=np.uint64)
+    for bit in range(10):
+        code |= ((row >> bit) & 1).astype(np.uint64) << np.uint64(2 * bit + 1)
+        code |= ((col >> bit) & 1).astype(np.uint64) << np.uint64(2 * bit)
+    return np.argsort(code, kind='stable')
+
+
+def _bounding_caps(vectors, starts, block_size):
+    # Center unit vector and angular radius of the smallest-ish cap per block
+    centers = np.empty((len(starts), 3))
+    radii = np.empty(len(starts))
+    for b, start in enumerate(starts):
+        block = vectors[start:start + block_size]
+        center = block.mean(axis=0)
+        norm = np.linalg.norm(center)
+        if norm < 1e-12:
+            centers[b], radii[b] = block[0], np.pi
+            continue
+        centers[b] = center / norm
+        radii[b] = np.arccos(np.clip((block @ centers[b]).min(), -1.0, 1.0))
+    return centers, radii
+
+
+def _block_pair_bounds(centers, radii, largest):
+    # Best possible central angle between any airport of block a and of block b
+    a, b = np.triu_indices(len(centers))
+    between = np.arccos(np.clip(np.einsum('ij,ij->i', centers[a], centers[b]), -1.0, 1.0))
+    spread = radii[a] + radii[b]
+    if largest:
+        bounds = np.minimum(between + spread, np.pi) + CAP_BOUND_SLACK
+    else:
+        bounds = np.maximum(between - spread, 0.0) - CAP_BOUND_SLACK
+    return a, b, bounds
+
+
+def global_top_k_routes(columns, k, largest=True, aircraft=None, block_size=GLOBAL_TOP_K_BLOCK):
+    """
+    The k longest (or shortest non-trivial) routes between any two airports.
+
+    Airports are put in spatial order and split into blocks with a bounding
+    cap each. Block pairs are visited best cap bound first; within a pair, a
+    matrix of unit-vector dot products screens out everything that cannot
+    beat the current k-th best, and only the survivors get exact haversine
+    distances and enter a bounded heap. Once a block pair's cap bound cannot
+    beat the k-th best, neither can any later pair, so the scan stops.
+    Memory is O(k + block_size²), never N².
+
+    Each unordered pair is reported once, with the lower airport index as
+    origin. Ranking matches sorting every pair by (distance, origin index,
+    destination index); "shortest" skips pairs at zero distance.
+
+    Arguments:
+        columns: AirportColumns to search
+        k: Number of routes to return
+        largest: True for the longest routes, False for the shortest
+        aircraft: Optional AircraftProfile for block time and fuel burn
+        block_size: Airports per block
+
+    Returns:
+        RouteBatch of up to k routes, best first
+    """
+    if k <= 0 or len(columns) < 2:
+        return compute_route_batch(columns, [], [], aircraft)
+
+    order = _spatial_order(columns.latitudes, columns.longitudes)
+    lat, lon = columns.latitudes[order], columns.longitudes[order]
+    vectors = unit_vectors(lat, lon)
+    starts = np.arange(0, len(order), block_size)
+    centers, radii = _bounding_caps(vectors, starts, block_size)
+    block_a, block_b, bounds = _block_pair_bounds(centers, radii, largest)
+    visit = np.argsort(-bounds if largest else bounds, kind='stable')
+
+    # Heap root is the worst kept route: (key, -origin, -destination) with
+    # key = distance (longest) or -distance (shortest)
+    heap = []
+    sign = 1.0 if largest else -1.0
+    for pair in visit:
+        threshold_score = -np.inf
+        if len(heap) == k:
+            threshold_angle = heap[0][0] * sign / earth_radius('miles')
+            if (bounds[pair] < threshold_angle) if largest else (bounds[pair] > threshold_angle):
+                break
+            threshold_score = -sign * np.cos(threshold_angle) - DOT_SCREEN_SLACK
+
+        a0, b0 = starts[block_a[pair]], starts[block_b[pair]]
+        # Screen on dot products (a matrix multiply; farther apart = smaller dot),
+        # then compute exact distances for the survivors only
+        scores = -sign * (vectors[a0:a0 + block_size] @ vectors[b0:b0 + block_size].T)
+        valid = scores >= threshold_score
+        if not largest:
+            # Co-located airports never rank as "shortest"; drop them before the
+            # block's k best are picked so they cannot crowd out real pairs
+            a_lat, a_lon = lat[a0:a0 + block_size, None], lon[a0:a0 + block_size, None]
+            b_lat, b_lon = lat[None, b0:b0 + block_size], lon[None, b0:b0 + block_size]
+            valid &= (a_lat != b_lat) | (a_lon != b_lon)
+        if a0 == b0:
+            valid = np.triu(valid, k=1)
+        i, j = np.nonzero(valid)
+        if len(i) > k:
+            # Keep the block's k best plus anything within the slack of its k-th
+            candidate_scores = scores[i, j]
+            kth = np.partition(candidate_scores, len(i) - k)[len(i) - k]
+            best = candidate_scores >= kth - DOT_SCREEN_SLACK
+            i, j = i[best], j[best]
+
+        i, j = a0 + i, b0 + j
+        keys = sign * haversine_distance_array(lat[i], lon[i], lat[j], lon[j])
+        if not largest:
+            keys, i, j = keys[keys < 0], i[keys < 0], j[keys < 0]
+        low, high = np.minimum(order[i], order[j]), np.maximum(order[i], order[j])
+        for key, o, d in zip(keys.tolist(), low.tolist(), high.tolist()):
+            entry = (key, -o, -d)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    ranked = sorted(heap, reverse=True)
+    return compute_route_batch(columns, [-o for _, o, _ in ranked], [-d for _, _, d in ranked],
+                               aircraft)
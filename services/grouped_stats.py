@@ -0,0 +1,189 @@
+"""Grouped batch statistics by country, region and distance band."""
+import numpy as np
+from config.constants import DISTANCE_BANDS_MILES
+from config.regions import region_of
+
+GROUP_BY_OPTIONS = ("origin_country", "destination_country", "country_pair",
+                    "origin_region", "region_pair", "distance_band")
+
+SUM_FIELDS = ("distance_miles", "flight_hours", "block_hours", "fuel_burn_kg")
+
+
+def distance_band_label(band):
+    """Label for a distance band index, e.g. '1,000-2,000 mi' or '8,000+ mi'."""
+    low = DISTANCE_BANDS_MILES[band]
+    if band + 1 < len(DISTANCE_BANDS_MILES):
+        return f"{low:,}-{DISTANCE_BANDS_MILES[band + 1]:,} mi"
+    return f"{low:,}+ mi"
+
+
+def _group_codes(batch, group_by):
+    """
+    Integer group code for every row of a batch, plus a code -> label function.
+
+    Codes are only meaningful within one batch; partials merge on labels.
+    """
+    columns = batch.columns
+    names = columns.country_names
+    origin_country = columns.country_ids[batch.origin_idx].astype(np.int64)
+    dest_country = columns.country_ids[batch.dest_idx].astype(np.int64)
+
+    if group_by == "origin_country":
+        return origin_country, lambda code: names[code]
+    if group_by == "destination_country":
+        return dest_country, lambda code: names[code]
+    if group_by == "country_pair":
+        count = len(names)
+        return (origin_country * count + dest_country,
+                lambda code: f"{names[code // count]} → {names[code % count]}")
+    if group_by in ("origin_region", "region_pair"):
+        regions = sorted({region_of(name) for name in names})
+        region_ids = np.array([regions.index(region_of(name)) for name in names], dtype=np.int64)
+        if group_by == "origin_region":
+            return region_ids[origin_country], lambda code: regions[code]
+        count = len(regions)
+        return (region_ids[origin_country] * count + region_ids[dest_country],
+                lambda code: f"{regions[code // count]} → {regions[code % count]}")
+    if group_by == "distance_band":
+        bands = np.searchsorted(DISTANCE_BANDS_MILES, np.round(batch.distance_miles, 2), side='right') - 1
+        return np.maximum(bands, 0).astype(np.int64), distance_band_label
+    raise ValueError(f"Unknown grouping '{group_by}'; expected one of {GROUP_BY_OPTIONS}")
+
+
+class GroupedPartial:
+    # Mergeable per-group route counts, sums and distance extremes
+    #
+    # Each batch is reduced with bincount / minimum.at over integer group
+    # codes; only the handful of resulting groups are matched to labels, so
+    # partials from chunks, processes or shards with different airport
+    # columns still merge correctly.
+
+    def __init__(self, group_by):
+        if group_by not in GROUP_BY_OPTIONS:
+            raise ValueError(f"Unknown grouping '{group_by}'; expected one of {GROUP_BY_OPTIONS}")
+        self.group_by = group_by
+        self.labels = []
+        self._positions = {}
+        self.route_count = np.zeros(0, dtype=np.int64)
+        self.sums = {field: np.zeros(0) for field in SUM_FIELDS}
+        self.min_distance = np.zeros(0)
+        self.max_distance = np.zeros(0)
+        self.has_performance = False
+
+    def _positions_of(self, labels):
+        # Position of each label in this partial, adding new groups as needed
+        new = [label for label in labels if label not in self._positions]
+        if new:
+            for label in new:
+                self._positions[label] = len(self.labels)
+                self.labels.append(label)
+            grow = len(new)
+            self.route_count = np.concatenate([self.route_count, np.zeros(grow, dtype=np.int64)])
+            for field in SUM_FIELDS:
+                self.sums[field] = np.concatenate([self.sums[field], np.zeros(grow)])
+            self.min_distance = np.concatenate([self.min_distance, np.full(grow, np.inf)])
+            self.max_distance = np.concatenate([self.max_distance, np.full(grow, -np.inf)])
+        return np.array([self._positions[label] for label in labels], dtype=np.intp)
+
+    def _accumulate(self, labels, count, sums, min_distance, max_distance):
+        positions = self._positions_of(labels)
+        self.route_count[positions] += count
+        for field in SUM_FIELDS:
+            self.sums[field][positions] += sums[field]
+        self.min_distance[positions] = np.minimum(self.min_distance[positions], min_distance)
+        self.max_distance[positions] = np.maximum(self.max_distance[positions], max_distance)
+
+    def add_batch(self, batch):
+        """Fold a RouteBatch into the group totals and return self."""
+        if len(batch) == 0:
+            return self
+        codes, label_of = _group_codes(batch, self.group_by)
+        group_codes, group = np.unique(codes, return_inverse=True)
+        groups = len(group_codes)
+        miles = np.round(batch.distance_miles, 2)
+
+        sums = {'distance_miles': np.bincount(group, weights=miles, minlength=groups),
+                'flight_hours': np.bincount(group, weights=batch.flight_hours, minlength=groups)}
+        if batch.block_hours is not None:
+            self.has_performance = True
+            sums['block_hours'] = np.bincount(group, weights=batch.block_hours, minlength=groups)
+            sums['fuel_burn_kg'] = np.bincount(group, weights=batch.fuel_burn_kg, minlength=groups)
+        else:
+            sums['block_hours'] = sums['fuel_burn_kg'] = np.zeros(groups)
+
+        min_distance = np.full(groups, np.inf)
+        max_distance = np.full(groups, -np.inf)
+        np.minimum.at(min_distance, group, miles)
+        np.maximum.at(max_distance, group, miles)
+
+        self._accumulate([label_of(int(code)) for code in group_codes],
+                         np.bincount(group, minlength=groups), sums, min_distance, max_distance)
+        return self
+
+    def merge(self, other):
+        """Combine another partial with the same grouping (in place) and return self."""
+        if other.group_by != self.group_by:
+            raise ValueError(f"Cannot merge '{other.group_by}' groups into '{self.group_by}'")
+        if other.labels:
+            self._accumulate(other.labels, other.route_count, other.sums,
+                             other.min_distance, other.max_distance)
+        self.has_performance = self.has_performance or other.has_performance
+        return self
+
+    def to_dict(self):
+        return {
+            'group_by': self.group_by,
+            'labels': list(self.labels),
+            'route_count': self.route_count.tolist(),
+            'sums': {field: values.tolist() for field, values in self.sums.items()},
+            'min_distance': self.min_distance.tolist(),
+            'max_distance': self.max_distance.tolist(),
+            'has_performance': self.has_performance,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        partial = cls(data['group_by'])
+        if data['labels']:
+            partial._accumulate(data['labels'], np.array(data['route_count'], dtype=np.int64),
+                                {field: np.array(values) for field, values in data['sums'].items()},
+                                np.array(data['min_distance']), np.array(data['max_distance']))
+        partial.has_performance = data['has_performance']
+        return partial
+
+    def get_rows(self):
+        """
+        One summary dict per group.
+
+        Distance bands come out in band order; other groupings by route
+        count, largest first.
+        """
+        if self.group_by == "distance_band":
+            band_labels = [distance_band_label(i) for i in range(len(DISTANCE_BANDS_MILES))]
+            order = sorted(range(len(self.labels)), key=lambda i: band_labels.index(self.labels[i]))
+        else:
+            order = sorted(range(len(self.labels)), key=lambda i: (-self.route_count[i], self.labels[i]))
+
+        rows = []
+        for i in order:
+            count = int(self.route_count[i])
+            row = {
+                'group': self.labels[i],
+                'routes': count,
+                'total_distance_miles': float(self.sums['distance_miles'][i]),
+                'average_distance_miles': float(self.sums['distance_miles'][i]) / count,
+                'shortest_miles': float(self.min_distance[i]),
+                'longest_miles': float(self.max_distance[i]),
+                'total_flight_hours': float(self.sums['flight_hours'][i]),
+                'average_flight_hours': float(self.sums['flight_hours'][i]) / count,
+            }
+            if self.has_performance:
+                row['total_block_hours'] = float(self.sums['block_hours'][i])
+                row['total_fuel_burn_kg'] = float(self.sums['fuel_burn_kg'][i])
+            rows.append(row)
+        return rows
+
+
+def group_route_batch(batch, group_by):
+    """Grouped statistics for one RouteBatch; see GroupedPartial."""
+    return GroupedPartial(group_by).add_batch(batch)
@@ -0,0 +1,107 @@
+"""Canonicalization and deduplication of batch route requests."""
+import numpy as np
+from services.validation import validate_route_codes
+
+
+class CanonicalPairs:
+    # Unique unordered airport pairs plus the mapping back to the request rows
+
+    def __init__(self, low_idx, high_idx, row_pair, row_reversed, kept_rows,
+                 total_rows, skipped_unknown, skipped_same_airport):
+        self.low_idx = low_idx              # unique pairs, low_idx < high_idx
+        self.high_idx = high_idx
+        self.row_pair = row_pair            # unique pair index for every kept row
+        self.row_reversed = row_reversed    # True when the row flies high -> low
+        self.kept_rows = kept_rows          # positions of kept rows in the request
+        self.total_rows = total_rows
+        self.skipped_unknown = skipped_unknown
+        self.skipped_same_airport = skipped_same_airport
+        self.validation = None              # ValidationReport when built from codes
+
+    def get_unique_count(self):
+        return len(self.low_idx)
+
+    def get_kept_count(self):
+        return len(self.row_pair)
+
+
+def canonicalize_indices(origin_idx, dest_idx, airport_count, kept_rows=None,
+                         total_rows=None, skipped_unknown=0):
+    """
+    Deduplicate already-resolved index pairs into unique unordered pairs.
+
+    Same-airport rows are dropped. Both directions of a pair share one entry.
+
+    Arguments:
+        origin_idx, dest_idx: Arrays of airport indices per request row
+        airport_count: Number of airports the indices refer to
+        kept_rows: Request positions of these rows (defaults to 0..n-1)
+        total_rows: Size of the original request (defaults to len(origin_idx))
+        skipped_unknown: Rows already dropped for unknown codes
+
+    Returns:
+        CanonicalPairs
+    """
+    origin_idx = np.asarray(origin_idx, dtype=np.int64)
+    dest_idx = np.asarray(dest_idx, dtype=np.int64)
+    if kept_rows is None:
+        kept_rows = np.arange(len(origin_idx))
+    if total_rows is None:
+        total_rows = len(origin_idx)
+
+    different = origin_idx != dest_idx
+    origin_idx, dest_idx = origin_idx[different], dest_idx[different]
+    kept_rows = np.asarray(kept_rows)[different]
+
+    low = np.minimum(origin_idx, dest_idx)
+    high = np.maximum(origin_idx, dest_idx)
+    unique_keys, row_pair = np.unique(low * airport_count + high, return_inverse=True)
+
+    return CanonicalPairs(
+        low_idx=unique_keys // airport_count,
+        high_idx=unique_keys % airport_count,
+        row_pair=row_pair.reshape(-1),
+        row_reversed=origin_idx > dest_idx,
+        kept_rows=kept_rows,
+        total_rows=total_rows,
+        skipped_unknown=skipped_unknown,
+        skipped_same_airport=int(np.count_nonzero(~different))
+    )
+
+
+def canonicalize_codes(origin_codes, dest_codes, columns):
+    """
+    Validate arrays of origin/destination codes in bulk and deduplicate them.
+
+    Returns:
+        CanonicalPairs, with the ValidationReport attached as `validation`
+    """
+    report = validate_route_codes(origin_codes, dest_codes, columns)
+    kept_rows = np.flatnonzero(report.known)
+    canonical = canonicalize_indices(report.origin_idx[kept_rows], report.dest_idx[kept_rows],
+                                     len(columns),
+                                     kept_rows=kept_rows,
+                                     total_rows=len(report),
+                                     skipped_unknown=report.get_unknown_count())
+    canonical.validation = report
+    return canonical
+
+
+def canonicalize_pairs(route_pairs, columns):
+    """
+    Normalize codes in (origin, destination) pairs and deduplicate them.
+
+    Codes are stripped and upper-cased; rows with unknown codes or the same
+    airport at both ends are dropped and counted.
+
+    Arguments:
+        route_pairs: Sequence of (origin_code, destination_code) tuples
+        columns: AirportColumns to resolve codes against
+
+    Returns:
+        CanonicalPairs
+    """
+    if len(route_pairs) == 0:
+        return canonicalize_codes(np.zeros(0, dtype=str), np.zeros(0, dtype=str), columns)
+    codes = np.array(route_pairs, dtype=str)
+    return canonicalize_codes(codes[:, 0], codes[:, 1], columns)
@@ -0,0 +1,167 @@
+"""Bulk per-route report generation into a zip/tar archive or sharded directories."""
+import io
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from utils.file_io import REPORT_FOOTER, REPORT_HEADER_TEMPLATE, format_route_report
+
+# Reports rendered per worker task; also the unit of memory held in flight
+REPORT_CHUNK_ROUTES = 2000
+# Report files per directory in 'dir' mode
+REPORTS_PER_SHARD_DIR = 10000
+ARCHIVE_FORMATS = ("zip", "tar", "dir")
+
+
+def report_name(route, row, width=6):
+    # Row number keeps names unique when a pair is requested more than once
+    return f"{row:0{width}d}_route_{route.origin.code}_to_{route.destination.code}.txt"
+
+
+def render_reports(batch, header, first_row=0, width=6):
+    """
+    Render every row of a RouteBatch as a complete report file.
+
+    Returns:
+        List of (file name, UTF-8 bytes) in batch order
+    """
+    return [(report_name(route, first_row + i, width),
+             (header + format_route_report(route) + REPORT_FOOTER).encode())
+            for i, route in enumerate(batch)]
+
+
+_worker_state = {}
+
+
+def _init_worker(columns, header):
+    _worker_state.update(columns=columns, header=header)
+
+
+def _render_task(task):
+    chunk, first_row, width = task
+    chunk.columns = _worker_state['columns']
+    return render_reports(chunk, _worker_state['header'], first_row, width)
+
+
+def _rendered_chunks(batch, header, workers, chunk_size):
+    """Yield rendered chunks in order, keeping at most 2 x workers chunks in flight."""
+    starts = range(0, len(batch), chunk_size)
+    width = max(6, len(str(len(batch))))
+    if workers <= 1:
+        for start in starts:
+            yield render_reports(batch.take(slice(start, start + chunk_size)), header, start, width)
+        return
+
+    def detached(start):
+        # Ship arrays only; workers reattach the columns from their initializer
+        chunk = batch.take(slice(start, start + chunk_size))
+        chunk.columns = None
+        return chunk
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(batch.columns, header)) as pool:
+        pending = deque()
+        for start in starts:
+            pending.append(pool.submit(_render_task, (detached(start), start, width)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _ZipSink:
+    def __init__(self, path, compresslevel):
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.date_time = time.localtime()[:6]
+
+    def add(self, name, data):
+        info = zipfile.ZipInfo(name, self.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.archive.writestr(info, data)
+
+    def close(self):
+        self.archive.close()
+
+
+class _TarSink:
+    def __init__(self, path, compresslevel):
+        mode = 'w:gz' if str(path).endswith(('.tar.gz', '.tgz')) else 'w'
+        kwargs = {'compresslevel': compresslevel} if mode == 'w:gz' else {}
+        self.archive = tarfile.open(path, mode, **kwargs)
+        self.mtime = time.time()
+
+    def add(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self.mtime
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.archive.close()
+
+
+class _DirectorySink:
+    # Plain buffered writes, no fsync; files spread over shard_NNNN directories
+    def __init__(self, path):
+        self.root = Path(path)
+        self.count = 0
+
+    def add(self, name, data):
+        shard = self.root / f"shard_{self.count // REPORTS_PER_SHARD_DIR:04d}"
+        if self.count % REPORTS_PER_SHARD_DIR == 0:
+            shard.mkdir(parents=True, exist_ok=True)
+        (shard / name).write_bytes(data)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def write_report_archive(batch, destination, archive_format="zip", workers=1,
+                         chunk_size=REPORT_CHUNK_ROUTES, compresslevel=1,
+                         progress_callback=None):
+    """
+    Write one save_route_analysis-style report per route into a single archive.
+
+    Reports are rendered from precompiled templates in `workers` processes
+    and streamed into the archive as chunks complete, so memory is bounded
+    by a few chunks regardless of batch size and no file is opened (or
+    synced) per report except in 'dir' mode.
+
+    Arguments:
+        batch: RouteBatch of routes to report on
+        destination: Archive path (.zip, .tar or .tar.gz) or directory for 'dir'
+        archive_format: 'zip', 'tar' or 'dir'
+        workers: Rendering processes
+        chunk_size: Routes per rendering task
+        compresslevel: Deflate level for zip / gzip (1 favours speed)
+        progress_callback: Optional callable(reports_written, total_reports)
+
+    Returns:
+        Number of reports written
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format '{archive_format}'; expected one of {ARCHIVE_FORMATS}")
+
+    destination = Path(destination)
+    if archive_format == "dir":
+        sink = _DirectorySink(destination)
+    else:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        sink = (_ZipSink if archive_format == "zip" else _TarSink)(destination, compresslevel)
+
+    header = REPORT_HEADER_TEMPLATE.format(generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    written = 0
+    try:
+        for reports in _rendered_chunks(batch, header, workers, chunk_size):
+            for name, data in reports:
+                sink.add(name, data)
+            written += len(reports)
+            if progress_callback:
+                progress_callback(written, len(batch))
+    finally:
+        sink.close()
+    return written
@@ -0,0 +1,208 @@
+"""Persistent SQLite store of computed route results shared across runs and processes."""
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+import numpy as np
+from config.constants import AVERAGE_CRUISE_SPEED_MPH, RESULT_STORE_MAX_ROWS, ROUTE_MODEL_VERSION
+from models.route_batch import RouteBatch
+from services.airport_loader import PROJECT_ROOT
+
+RESULT_STORE_PATH = PROJECT_ROOT / "output" / "route_results.sqlite"
+
+# Seconds a writer waits for another process's transaction before failing
+BUSY_TIMEOUT_SECONDS = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS route_results (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    model TEXT NOT NULL,
+    coords_hash TEXT NOT NULL,
+    distance_miles REAL NOT NULL,
+    bearing_degrees REAL NOT NULL,
+    flight_hours REAL NOT NULL,
+    block_hours REAL,
+    fuel_burn_kg REAL,
+    PRIMARY KEY (origin, destination, model, coords_hash)
+)
+"""
+
+
+def model_key(aircraft=None):
+    """
+    Identify the calculation model a result was produced with.
+
+    Covers ROUTE_MODEL_VERSION and every input of the model (the aircraft
+    profile's values, or the average cruise speed), so editing either
+    makes older entries unreachable.
+    """
+    if aircraft is None:
+        return f"{ROUTE_MODEL_VERSION}:generic:{AVERAGE_CRUISE_SPEED_MPH!r}"
+    profile = repr(sorted(vars(aircraft).items())).encode()
+    return f"{ROUTE_MODEL_VERSION}:{aircraft.type_code}:{hashlib.blake2b(profile, digest_size=8).hexdigest()}"
+
+
+def airport_hashes(columns, indices):
+    """Short hash of each airport's coordinates, for the given airport indices."""
+    return {int(i): hashlib.blake2b(
+                np.array([columns.latitudes[i], columns.longitudes[i]], dtype=np.float64).tobytes(),
+                digest_size=6).hexdigest()
+            for i in np.unique(indices)}
+
+
+class RouteResultStore:
+    # Route results keyed by (origin, destination, model, coordinates hash)
+    #
+    # The database runs in WAL mode, so readers never block the single active
+    # writer and several local processes can share one file; writes happen in
+    # one IMMEDIATE transaction per batch. Each process opens its own
+    # connection (reopened after a fork). Moving an airport or changing the
+    # model changes the key, so stale results are never returned; they age
+    # out through size-based pruning, oldest write first.
+
+    def __init__(self, path=RESULT_STORE_PATH, max_rows=RESULT_STORE_MAX_ROWS):
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS lookup "
+                               "(position INTEGER, origin TEXT, destination TEXT, coords_hash TEXT)")
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def _keys(self, columns, origin_idx, dest_idx):
+        hashes = airport_hashes(columns, np.concatenate([origin_idx, dest_idx]))
+        codes = columns.codes
+        return [(str(codes[o]), str(codes[d]), hashes[int(o)] + hashes[int(d)])
+                for o, d in zip(origin_idx.tolist(), dest_idx.tolist())]
+
+    def get_routes(self, columns, origin_idx, dest_idx, aircraft=None):
+        """
+        Look up stored results for many routes in one query.
+
+        Returns:
+            Tuple of (boolean hit mask, RouteBatch of the hit rows in input order)
+        """
+        origin_idx = np.asarray(origin_idx, dtype=np.intp)
+        dest_idx = np.asarray(dest_idx, dtype=np.intp)
+        connection = self._connect()
+        keys = self._keys(columns, origin_idx, dest_idx)
+
+        connection.execute("BEGIN")
+        try:
+            connection.execute("DELETE FROM lookup")
+            connection.executemany("INSERT INTO lookup VALUES (?, ?, ?, ?)",
+                                   [(i, *key) for i, key in enumerate(keys)])
+            rows = connection.execute(
+                "SELECT l.position, r.distance_miles, r.bearing_degrees, r.flight_hours, "
+                "r.block_hours, r.fuel_burn_kg FROM lookup l JOIN route_results r "
+                "ON r.origin = l.origin AND r.destination = l.destination "
+                "AND r.coords_hash = l.coords_hash AND r.model = ? ORDER BY l.position",
+                (model_key(aircraft),)
+            ).fetchall()
+        finally:
+            connection.execute("COMMIT")
+
+        hit = np.zeros(len(keys), dtype=bool)
+        values = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        positions = values[:, 0].astype(np.intp)
+        hit[positions] = True
+        return hit, RouteBatch(
+            columns, origin_idx[positions], dest_idx[positions],
+            distance_miles=values[:, 1],
+            bearing_degrees=values[:, 2],
+            flight_hours=values[:, 3],
+            block_hours=values[:, 4] if aircraft else None,
+            fuel_burn_kg=values[:, 5] if aircraft else None,
+            aircraft_type=aircraft.type_code if aircraft else None
+        )
+
+    def put_routes(self, batch, aircraft=None):
+        """Store every row of a RouteBatch in one transaction, then prune if over size."""
+        if len(batch) == 0:
+            return
+        connection = self._connect()
+        keys = self._keys(batch.columns, batch.origin_idx, batch.dest_idx)
+
+        def optional(column):
+            return [None] * len(batch) if column is None else column.tolist()
+
+        rows = zip(keys, [model_key(aircraft)] * len(batch),
+                   batch.distance_miles.tolist(), batch.bearing_degrees.tolist(),
+                   batch.flight_hours.tolist(), optional(batch.block_hours),
+                   optional(batch.fuel_burn_kg))
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO route_results (origin, destination, coords_hash, model, "
+                "distance_miles, bearing_degrees, flight_hours, block_hours, fuel_burn_kg) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*key, model, *values) for key, model, *values in rows]
+            )
+            if self.max_rows:
+                self._prune(connection, self.max_rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _prune(self, connection, max_rows):
+        # Rows are replaced on rewrite, so the lowest rowids are the oldest writes
+        connection.execute(
+            "DELETE FROM route_results WHERE rowid <= "
+            "(SELECT rowid FROM route_results ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+            (max_rows,)
+        )
+
+    def prune(self, max_rows=None):
+        """Delete the oldest results beyond `max_rows` (defaults to the store limit)."""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        self._prune(connection, self.max_rows if max_rows is None else max_rows)
+        connection.execute("COMMIT")
+
+    def get_row_count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM route_results").fetchone()[0]
+
+    def read_through(self, columns, origin_idx, dest_idx, aircraft, compute):
+        """
+        Return results for every route, computing and storing only the misses.
+
+        Arguments:
+            compute: callable(origin_idx, dest_idx) -> RouteBatch for missing routes
+
+        Returns:
+            RouteBatch in input order
+        """
+        origin_idx = np.asarray(origin_idx, dtype=np.intp)
+        dest_idx = np.asarray(dest_idx, dtype=np.intp)
+        hit, stored = self.get_routes(columns, origin_idx, dest_idx, aircraft)
+        if hit.all():
+            return stored
+
+        missing = np.flatnonzero(~hit)
+        computed = compute(origin_idx[missing], dest_idx[missing])
+        computed.columns = columns
+        self.put_routes(computed, aircraft)
+
+        # Interleave stored and computed rows back into input order
+        combined = RouteBatch.concatenate([stored, computed])
+        order = np.empty(len(origin_idx), dtype=np.intp)
+        order[np.concatenate([np.flatnonzero(hit), missing])] = np.arange(len(origin_idx))
+        return combined.take(order)
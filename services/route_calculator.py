@@ -5,17 +5,19 @@ from services.distance_calculator import (
     bearing_to_compass_direction
 )
 from models.airport import FlightRoute
+from config.constants import AVERAGE_CRUISE_SPEED_MPH
 
-# Assumed average commercial jet speed (for time estimation)
-AVERAGE_CRUISE_SPEED_MPH = 500.0
-
-def calculate_flight_route(origin, destination):
+def calculate_flight_route(origin, destination, wind_field=None, aircraft=None):
     """
     Calculate complete flight route information between two airports.
     
     Arguments:
         origin: Airport object (departure)
         destination: Airport object (arrival)
+        wind_field: Optional WindField; when given, flight time integrates
+            ground speed along the great-circle path instead of still air
+        aircraft: Optional AircraftProfile; when given, flight time follows its
+            climb/cruise/descent profile and block time and fuel are estimated
     
     Returns:
         FlightRoute object with all calculated metrics, or None if invalid
@@ -39,7 +41,24 @@ def calculate_flight_route(origin, destination):
     compass_direction = bearing_to_compass_direction(bearing)
     
     # Estimate flight time
-    estimated_hours = distance_miles / AVERAGE_CRUISE_SPEED_MPH
+    cruise_speed = aircraft.cruise_speed_mph if aircraft else AVERAGE_CRUISE_SPEED_MPH
+    if wind_field is not None:
+        estimated_hours = float(wind_field.estimate_flight_hours(
+            coords_origin[0], coords_origin[1], coords_dest[0], coords_dest[1],
+            cruise_speed_mph=cruise_speed
+        )[0])
+    else:
+        estimated_hours = distance_miles / cruise_speed
+    
+    block_hours = fuel_burn_kg = None
+    if aircraft:
+        # NumPy-backed; imported here so plain route lookups start fast
+        from services.aircraft_performance import estimate_route_performance
+        airborne_hours, block_hours, fuel_burn_kg = estimate_route_performance(aircraft, distance_miles)
+        # Wind shifts the profile's still-air time by the same amount
+        wind_delta = estimated_hours - distance_miles / cruise_speed
+        estimated_hours = airborne_hours + wind_delta
+        block_hours += wind_delta
     
     # Create and return route object
     return FlightRoute(
@@ -50,7 +69,10 @@ def calculate_flight_route(origin, destination):
         distance_nautical_miles=distance_nm,
         bearing_degrees=bearing,
         compass_direction=compass_direction,
-        estimated_flight_hours=estimated_hours
+        estimated_flight_hours=estimated_hours,
+        aircraft_type=aircraft.type_code if aircraft else None,
+        block_hours=block_hours,
+        fuel_burn_kg=fuel_burn_kg
     )
 
 
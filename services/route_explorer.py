@@ -0,0 +1,279 @@
+"""All-pairs route exploration by slicing a precomputed distance matrix."""
+import numpy as np
+from config.constants import AVERAGE_CRUISE_SPEED_MPH
+from config.regions import region_of
+from services.distance_calculator import bearing_to_compass_direction
+from services.geo_arrays import initial_bearing_array
+
+
+def airport_mask(columns, countries=None, regions=None):
+    """
+    Boolean mask of airports in any of the given countries or regions.
+
+    With neither filter given, every airport is selected.
+    """
+    if not countries and not regions:
+        return np.ones(len(columns), dtype=bool)
+
+    wanted = set(countries or [])
+    wanted.update(name for name in columns.country_names if region_of(name) in set(regions or []))
+    wanted_ids = [i for i, name in enumerate(columns.country_names) if name in wanted]
+    return np.isin(columns.country_ids, wanted_ids)
+
+
+class RouteSelection:
+    # Pairs picked out of the distance matrix, held as parallel arrays
+
+    def __init__(self, columns, origin_idx, dest_idx, distance_miles):
+        self.columns = columns
+        self.origin_idx = origin_idx
+        self.dest_idx = dest_idx
+        self.distance_miles = distance_miles
+
+    def __len__(self):
+        return len(self.origin_idx)
+
+    def take(self, selector):
+        return RouteSelection(self.columns, self.origin_idx[selector],
+                              self.dest_idx[selector], self.distance_miles[selector])
+
+    def sort_by(self, field='distance', descending=False):
+        # Sort by 'distance', 'origin' or 'destination' code
+        if field == 'origin':
+            keys = self.origin_idx
+        elif field == 'destination':
+            keys = self.dest_idx
+        else:
+            keys = self.distance_miles
+        order = np.argsort(keys, kind='stable')
+        return self.take(order[::-1] if descending else order)
+
+    def page(self, page_number, page_size):
+        start = page_number * page_size
+        return self.take(slice(start, start + page_size))
+
+    def top_k(self, k, longest=True):
+        k = min(k, len(self))
+        if k <= 0:
+            return self.take(slice(0, 0))
+        keys = -self.distance_miles if longest else self.distance_miles
+        candidates = np.argpartition(keys, k - 1)[:k]
+        return self.take(candidates[np.argsort(keys[candidates], kind='stable')])
+
+    def to_rows(self):
+        # Table rows for display; bearings are computed for these rows only
+        columns = self.columns
+        lat, lon = columns.latitudes, columns.longitudes
+        o, d = self.origin_idx, self.dest_idx
+        bearings = np.round(initial_bearing_array(lat[o], lon[o], lat[d], lon[d]), 1)
+        rows = []
+        for i in range(len(self)):
+            miles = round(float(self.distance_miles[i]), 2)
+            rows.append({
+                "Origin": str(columns.codes[o[i]]),
+                "Origin Country": columns.country_of(o[i]),
+                "Destination": str(columns.codes[d[i]]),
+                "Destination Country": columns.country_of(d[i]),
+                "Distance (mi)": miles,
+                "Bearing (°)": float(bearings[i]),
+                "Direction": bearing_to_compass_direction(float(bearings[i])),
+                "Est. Hours": round(miles / AVERAGE_CRUISE_SPEED_MPH, 2),
+            })
+        return rows
+
+
+# Matrix cells read per block while filtering a selection
+SELECTION_BLOCK_CELLS = 1 << 20
+
+SORT_FIELDS = ("distance", "origin", "destination")
+
+
+def _empty_selection(columns):
+    return RouteSelection(columns, np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp),
+                          np.zeros(0))
+
+
+def _concat_selections(columns, parts):
+    if not parts:
+        return _empty_selection(columns)
+    return RouteSelection(columns, *(np.concatenate([getattr(part, name) for part in parts])
+                                     for name in ('origin_idx', 'dest_idx', 'distance_miles')))
+
+
+class RouteQuery:
+    # Routes between two airport sets, filtered lazily out of the distance matrix
+    #
+    # Nothing is copied up front: matrix rows are read a block at a time,
+    # filtered, and reduced to a count, a histogram, a top-k or a single page.
+    # Blocks follow origin order, or destination order when paging by
+    # destination (the matrix is symmetric, so destination rows work too).
+    # Counts per block are cached, so paging only reads the blocks it shows.
+    # Distance order needs every block; the best routes found are kept per
+    # direction, grown by doubling, so paging rescans only O(log pages) times.
+
+    def __init__(self, columns, distance_matrix, origin_mask, dest_mask, min_miles=0.0,
+                 max_miles=None, one_direction=True, block_cells=SELECTION_BLOCK_CELLS):
+        self.columns = columns
+        self.distance_matrix = distance_matrix
+        self.origin_mask = np.asarray(origin_mask, dtype=bool)
+        self.dest_mask = np.asarray(dest_mask, dtype=bool)
+        self.origins = np.flatnonzero(self.origin_mask)
+        self.destinations = np.flatnonzero(self.dest_mask)
+        self.min_miles = min_miles
+        self.max_miles = max_miles
+        self.one_direction = one_direction
+        self.block_rows = max(1, block_cells // max(distance_matrix.shape[1], 1))
+        self._counts = {}
+        self._range = None
+        self._best_kept = {}
+
+    def _blocks(self, by_destination):
+        rows = self.destinations if by_destination else self.origins
+        return [rows[i:i + self.block_rows] for i in range(0, len(rows), self.block_rows)]
+
+    def _matches(self, row_ids, by_destination):
+        # Matching routes for one block of matrix rows, in (row, column) order
+        if by_destination:
+            origin, dest, other = self.origins[None, :], row_ids[:, None], self.origins
+        else:
+            origin, dest, other = row_ids[:, None], self.destinations[None, :], self.destinations
+        values = np.asarray(self.distance_matrix[row_ids])[:, other]
+
+        keep = origin != dest
+        if self.one_direction:
+            # A pair appears twice only when both airports are in both sets
+            both = self.dest_mask[origin] & self.origin_mask[dest]
+            keep &= ~both | (origin < dest)
+        keep &= values >= self.min_miles
+        if self.max_miles is not None:
+            keep &= values <= self.max_miles
+
+        rows, cols = np.nonzero(keep)
+        if by_destination:
+            origin_idx, dest_idx = self.origins[cols], row_ids[rows]
+        else:
+            origin_idx, dest_idx = row_ids[rows], self.destinations[cols]
+        return RouteSelection(self.columns, origin_idx, dest_idx, values[rows, cols].astype(np.float64))
+
+    def _block_counts(self, by_destination=False):
+        if by_destination not in self._counts:
+            counts, low, high = [], np.inf, -np.inf
+            for block in self._blocks(by_destination):
+                matches = self._matches(block, by_destination)
+                counts.append(len(matches))
+                if len(matches):
+                    low = min(low, matches.distance_miles.min())
+                    high = max(high, matches.distance_miles.max())
+            self._counts[by_destination] = np.array(counts, dtype=np.int64)
+            if self._range is None and np.isfinite(low):
+                self._range = (float(low), float(high))
+        return self._counts[by_destination]
+
+    def __len__(self):
+        return int(self._block_counts().sum())
+
+    def _slice(self, start, stop, by_destination):
+        # Routes [start, stop) in block order, reading only the overlapping blocks
+        ends = np.cumsum(self._block_counts(by_destination))
+        parts = []
+        blocks = self._blocks(by_destination)
+        for b in range(int(np.searchsorted(ends, start, side='right')), len(blocks)):
+            block_start = ends[b] - self._counts[by_destination][b]
+            if block_start >= stop:
+                break
+            matches = self._matches(blocks[b], by_destination)
+            parts.append(matches.take(slice(max(start - block_start, 0), stop - block_start)))
+        return _concat_selections(self.columns, parts)
+
+    def _best(self, count, descending):
+        # The `count` first routes by (distance, origin, destination), or all
+        # reversed, sliced from the kept prefix when it is long enough
+        if count <= 0:
+            return _empty_selection(self.columns)
+        kept_count, kept = self._best_kept.get(descending, (0, None))
+        if kept is None or count > kept_count:
+            kept_count = max(count, 2 * kept_count)
+            kept = self._scan_best(kept_count, descending)
+            self._best_kept[descending] = (kept_count, kept)
+        return kept.take(slice(0, count))
+
+    def _scan_best(self, count, descending):
+        # One pass over every block keeping the `count` best routes
+        sign = -1.0 if descending else 1.0
+        best = _empty_selection(self.columns)
+        for block in self._blocks(False):
+            merged = _concat_selections(self.columns, [best, self._matches(block, False)])
+            key = sign * merged.distance_miles
+            if len(merged) > count:
+                kth = np.partition(key, count - 1)[count - 1]
+                merged = merged.take(key <= kth)
+                key = sign * merged.distance_miles
+            order = np.lexsort((sign * merged.dest_idx, sign * merged.origin_idx, key))
+            best = merged.take(order[:count])
+        return best
+
+    def page(self, page_number, page_size, sort_field='distance', descending=False):
+        """One page of routes sorted by 'distance', 'origin' or 'destination' code."""
+        if sort_field not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{sort_field}'; expected one of {SORT_FIELDS}")
+        total = len(self)
+        start = page_number * page_size
+        stop = min(start + page_size, total)
+        if start >= stop:
+            return _empty_selection(self.columns)
+        if sort_field == 'distance':
+            return self._best(stop, descending).take(slice(start, stop))
+        by_destination = sort_field == 'destination'
+        if descending:
+            return self._slice(total - stop, total - start, by_destination).take(slice(None, None, -1))
+        return self._slice(start, stop, by_destination)
+
+    def top_k(self, k, longest=True):
+        return self._best(k, descending=longest)
+
+    def histogram(self, bins=20):
+        """(counts, bin_edges) of matching route distances, accumulated block by block."""
+        if len(self) == 0:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1)
+        counts = np.zeros(bins, dtype=np.int64)
+        for block in self._blocks(False):
+            block_counts, edges = np.histogram(self._matches(block, False).distance_miles,
+                                               bins=bins, range=self._range)
+            counts += block_counts
+        return counts, edges
+
+    def materialize(self):
+        # Every matching route as a RouteSelection, in origin order
+        return _concat_selections(self.columns, [self._matches(block, False)
+                                                 for block in self._blocks(False)])
+
+    def to_rows(self):
+        return self.materialize().to_rows()
+
+
+def select_routes(columns, distance_matrix, origin_mask, dest_mask,
+                  min_miles=0.0, max_miles=None, one_direction=True):
+    """
+    Select routes between two airport sets from the precomputed matrix.
+
+    Arguments:
+        columns: AirportColumns the matrix rows/columns follow
+        distance_matrix: N x N symmetric distances in miles (may be a read-only memmap)
+        origin_mask, dest_mask: Boolean airport masks (see airport_mask)
+        min_miles, max_miles: Inclusive distance range filter
+        one_direction: Keep only one direction of pairs present both ways
+
+    Returns:
+        RouteQuery; the matrix is read lazily when it is counted or paged
+    """
+    return RouteQuery(columns, distance_matrix, origin_mask, dest_mask,
+                      min_miles=min_miles, max_miles=max_miles, one_direction=one_direction)
+
+
+def distance_histogram(selection, bins=20):
+    """Return (counts, bin_edges) of route distances in miles."""
+    if isinstance(selection, RouteQuery):
+        return selection.histogram(bins)
+    if len(selection) == 0:
+        return np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1)
+    return np.histogram(selection.distance_miles, bins=bins)
@@ -0,0 +1,143 @@
+"""Route corridor queries: airports near a great-circle track."""
+import numpy as np
+from config.constants import EARTH_RADIUS_MILES
+from models.airport_columns import AirportColumns
+from services.geo_arrays import unit_vectors
+
+# Routes tested against all airports per block; bounds the candidate matrix size
+CORRIDOR_BLOCK_CELLS = 4000000
+
+
+def _angle_between(u, v):
+    """Angle in radians between unit vectors along the last axis (stable for small angles)."""
+    cross = np.linalg.norm(np.cross(u, v), axis=-1)
+    return np.arctan2(cross, np.einsum('...i,...i->...', u, v))
+
+
+class CorridorResult:
+    # Airports near each route in flat arrays, grouped by route and ordered along track
+    #
+    # Rows for route i are offsets[i]:offsets[i + 1]. Cross-track distance is
+    # signed: positive to the left of the direction of travel.
+
+    def __init__(self, route, airport_idx, along_track_miles, cross_track_miles,
+                 distance_to_route_miles, offsets):
+        self.route = route
+        self.airport_idx = airport_idx
+        self.along_track_miles = along_track_miles
+        self.cross_track_miles = cross_track_miles
+        self.distance_to_route_miles = distance_to_route_miles
+        self.offsets = offsets
+
+    def get_route_count(self):
+        return len(self.offsets) - 1
+
+    def for_route(self, index):
+        # (airport_idx, along_track_miles, cross_track_miles) for one route
+        rows = slice(self.offsets[index], self.offsets[index + 1])
+        return (self.airport_idx[rows], self.along_track_miles[rows],
+                self.cross_track_miles[rows])
+
+
+def corridor_query(columns, origin_idx, dest_idx, max_miles, include_endpoints=False):
+    """
+    Find airports within a distance of each route's great-circle segment.
+
+    Candidates are pruned with a bounding cap per route (centered on the
+    route midpoint, radius half the route length plus the corridor width)
+    using one dot product per airport; exact cross-track and along-track
+    distances are computed only for the survivors. Airports beyond either
+    end of the segment are measured to the nearer endpoint.
+
+    Arguments:
+        columns: AirportColumns
+        origin_idx, dest_idx: Arrays of route endpoint indices
+        max_miles: Corridor half-width in miles
+        include_endpoints: Also report the route's own origin and destination
+
+    Returns:
+        CorridorResult
+    """
+    origin_idx = np.atleast_1d(np.asarray(origin_idx, dtype=np.intp))
+    dest_idx = np.atleast_1d(np.asarray(dest_idx, dtype=np.intp))
+    vectors = unit_vectors(columns.latitudes, columns.longitudes)
+    width = max_miles / EARTH_RADIUS_MILES
+
+    start, end = vectors[origin_idx], vectors[dest_idx]
+    normal = np.cross(start, end)
+    normal_length = np.linalg.norm(normal, axis=1)
+    valid = normal_length > 1e-12   # identical or antipodal endpoints have no unique track
+    normal = normal / np.where(valid, normal_length, 1.0)[:, None]
+    route_angle = _angle_between(start, end)
+
+    midpoint = start + end
+    midpoint /= np.maximum(np.linalg.norm(midpoint, axis=1), 1e-300)[:, None]
+    cap_cos = np.cos(np.minimum(route_angle / 2 + width, np.pi))
+
+    block_rows = max(1, CORRIDOR_BLOCK_CELLS // max(len(columns), 1))
+    parts = []
+    for block_start in range(0, len(origin_idx), block_rows):
+        block = slice(block_start, block_start + block_rows)
+        inside = (midpoint[block] @ vectors.T) >= cap_cos[block, None]
+        inside &= valid[block, None]
+        if not include_endpoints:
+            rows = np.arange(inside.shape[0])
+            inside[rows, origin_idx[block]] = False
+            inside[rows, dest_idx[block]] = False
+        route_rows, airports = np.nonzero(inside)
+        parts.append((route_rows + block_start, airports))
+
+    route = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.intp)
+    airport = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0, dtype=np.intp)
+
+    # Exact geometry for the surviving candidates only
+    points = vectors[airport]
+    track_normal = normal[route]
+    offset = np.einsum('ij,ij->i', points, track_normal)
+    cross_track = np.arcsin(np.clip(offset, -1.0, 1.0))
+    projected = points - offset[:, None] * track_normal
+    along_track = np.arctan2(
+        np.einsum('ij,ij->i', np.cross(start[route], projected), track_normal),
+        np.einsum('ij,ij->i', start[route], projected)
+    )
+
+    on_segment = (along_track >= 0) & (along_track <= route_angle[route])
+    to_endpoint = np.minimum(_angle_between(points, start[route]),
+                             _angle_between(points, end[route]))
+    distance = np.where(on_segment, np.abs(cross_track), to_endpoint)
+
+    keep = distance <= width
+    route, airport = route[keep], airport[keep]
+    along_track, cross_track, distance = along_track[keep], cross_track[keep], distance[keep]
+
+    order = np.lexsort((along_track, route))
+    route = route[order]
+    return CorridorResult(
+        route=route,
+        airport_idx=airport[order],
+        along_track_miles=along_track[order] * EARTH_RADIUS_MILES,
+        cross_track_miles=cross_track[order] * EARTH_RADIUS_MILES,
+        distance_to_route_miles=distance[order] * EARTH_RADIUS_MILES,
+        offsets=np.searchsorted(route, np.arange(len(origin_idx) + 1))
+    )
+
+
+def airports_along_route(airports, origin_code, dest_code, max_miles, columns=None):
+    """
+    List airports within a corridor of a single route, ordered along the track.
+
+    Returns:
+        List of (Airport, along_track_miles, cross_track_miles) tuples
+    """
+    if columns is None:
+        columns = AirportColumns.from_airports(airports)
+
+    origin = columns.index_of(origin_code.strip().upper())
+    destination = columns.index_of(dest_code.strip().upper())
+    if origin is None or destination is None:
+        raise ValueError(f"Unknown airport code in route {origin_code} → {dest_code}")
+
+    result = corridor_query(columns, [origin], [destination], max_miles)
+    indices, along, cross = result.for_route(0)
+    return [(columns.airport(i), round(float(a), 2), round(float(c), 2))
+            for i, a, c in zip(indices, along, cross)]
@@ -0,0 +1,455 @@
+"""Flight schedule ingestion, operating-day arithmetic and per-period schedule totals."""
+import csv
+from datetime import timedelta
+import numpy as np
+from services.batch_engine import compute_canonical_batch
+from services.grouped_stats import SUM_FIELDS
+from services.pair_dedup import canonicalize_indices
+from services.validation import validate_route_codes
+
+# Schedule rows parsed together; a year of a large airline is a few of these
+SCHEDULE_CHUNK_ROWS = 100000
+
+SCHEDULE_FIELDS = ("flight_number", "origin", "destination", "days", "valid_from", "valid_to")
+
+# Header keywords per field, checked in order; headerless files use SCHEDULE_FIELDS order
+SCHEDULE_HEADER_KEYWORDS = {
+    "flight_number": ("flight", "number"),
+    "origin": ("origin", "from_airport", "dep"),
+    "destination": ("dest", "to_airport", "arr"),
+    "days": ("day", "frequency", "dow"),
+    "valid_from": ("valid_from", "from", "start", "effective", "begin"),
+    "valid_to": ("valid_to", "to", "end", "until", "discontinue"),
+}
+
+SCHEDULE_GROUPS = ("flight_number", "country_pair")
+
+# Bit i of a day mask is weekday i (Monday = 0), i.e. SSIM day digit i + 1
+_DAY_COUNTS = np.array([bin(mask).count("1") for mask in range(128)], dtype=np.int64)
+
+
+def _partial_week_table():
+    # Operating days in the first `length` days of a week starting on `weekday`,
+    # indexed [mask, weekday, length] for length 0..6
+    table = np.zeros((128, 7, 7), dtype=np.int64)
+    for weekday in range(7):
+        for length in range(7):
+            window = sum(1 << ((weekday + i) % 7) for i in range(length))
+            table[:, weekday, length] = _DAY_COUNTS[np.arange(128) & window]
+    return table
+
+
+_PARTIAL_WEEK = _partial_week_table()
+
+_day_mask_cache = {}
+
+
+def parse_day_mask(text):
+    """
+    Weekday bit mask for an operating-days field.
+
+    Every digit 1-7 (Monday-Sunday) in the text is an operating day, so
+    '1234567', '1.3.5..', ' 2 4 6 ' and '135' are all accepted.
+
+    Returns:
+        Integer mask (0 when the field names no day)
+    """
+    mask = _day_mask_cache.get(text)
+    if mask is None:
+        mask = 0
+        for char in text:
+            if "1" <= char <= "7":
+                mask |= 1 << (ord(char) - ord("1"))
+        if len(_day_mask_cache) < 4096:
+            _day_mask_cache[text] = mask
+    return mask
+
+
+def day_mask_label(mask):
+    """SSIM-style days label for a mask, e.g. '1.3.5..'."""
+    return "".join(str(day + 1) if mask >> day & 1 else "." for day in range(7))
+
+
+def weekday_of(dates):
+    """Weekday (Monday = 0) of datetime64[D] values."""
+    # 1970-01-01 was a Thursday
+    return (np.asarray(dates, dtype="datetime64[D]").astype(np.int64) + 3) % 7
+
+
+def count_operating_days(day_masks, first, last):
+    """
+    Number of operating days between two dates (inclusive), without expanding them.
+
+    Whole weeks contribute the mask's day count each; the remaining partial
+    week is a table lookup on (mask, starting weekday, remaining days).
+
+    Arguments:
+        day_masks: Array of weekday masks
+        first, last: Arrays (or scalars) of datetime64[D] period bounds
+
+    Returns:
+        Array of operating-day counts (0 where last < first)
+    """
+    day_masks = np.asarray(day_masks, dtype=np.int64)
+    first = np.asarray(first, dtype="datetime64[D]")
+    days = np.maximum((np.asarray(last, dtype="datetime64[D]") - first).astype(np.int64) + 1, 0)
+    weeks, remainder = np.divmod(days, 7)
+    return weeks * _DAY_COUNTS[day_masks] + _PARTIAL_WEEK[day_masks, weekday_of(first), remainder]
+
+
+def _find_columns(header):
+    # Field -> column position from a header row, or None if it is not a header
+    lowered = [field.strip().lower().replace(" ", "_") for field in header]
+    if not any("origin" in field or "dest" in field for field in lowered):
+        return None
+    positions = {}
+    for name, keywords in SCHEDULE_HEADER_KEYWORDS.items():
+        taken = set(positions.values())
+        positions[name] = next((i for keyword in keywords for i, field in enumerate(lowered)
+                                if i not in taken and keyword in field), None)
+    missing = [name for name, position in positions.items() if position is None]
+    if missing:
+        raise ValueError(f"Schedule header {header} has no column for {missing}")
+    return positions
+
+
+def iter_schedule_chunks(binary_file, chunk_rows=SCHEDULE_CHUNK_ROWS):
+    """
+    Parse a schedule CSV lazily, one chunk at a time.
+
+    A header row is detected (it names origin/destination columns) and used
+    to locate the SCHEDULE_FIELDS; otherwise columns are taken in that order.
+    Short rows come through as empty fields so they are counted as invalid.
+
+    Arguments:
+        binary_file: File opened in binary mode (or an upload buffer)
+        chunk_rows: Maximum schedule rows per chunk
+
+    Yields:
+        Tuple of (dict of field name -> list of strings, bytes read so far)
+    """
+    positions = dict(zip(SCHEDULE_FIELDS, range(len(SCHEDULE_FIELDS))))
+    width = len(SCHEDULE_FIELDS)
+    rows = []
+    bytes_read = 0
+    first_row = True
+
+    for raw_line in binary_file:
+        bytes_read += len(raw_line)
+        line = raw_line.decode("utf-8-sig").strip()
+        if not line:
+            continue
+        fields = next(csv.reader([line]))
+
+        if first_row:
+            first_row = False
+            found = _find_columns(fields)
+            if found is not None:
+                positions = found
+                width = max(found.values()) + 1
+                continue
+
+        rows.append(fields if len(fields) >= width else fields + [""] * (width - len(fields)))
+        if len(rows) >= chunk_rows:
+            yield {name: [row[i] for row in rows] for name, i in positions.items()}, bytes_read
+            rows = []
+
+    if rows:
+        yield {name: [row[i] for row in rows] for name, i in positions.items()}, bytes_read
+
+
+def _parse_dates(texts):
+    # datetime64[D] per ISO date string; NaT where a value does not parse
+    texts = [text.strip() for text in texts]
+    try:
+        return np.array(texts, dtype="datetime64[D]")
+    except ValueError:
+        dates = np.full(len(texts), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, text in enumerate(texts):
+            try:
+                dates[i] = np.datetime64(text, "D")
+            except ValueError:
+                pass
+        return dates
+
+
+class FlightSchedule:
+    # Schedule rows as parallel arrays; one row is a flight number's weekly
+    # pattern between two airports over a validity period
+    #
+    # Legs are never stored: operating_days() counts them arithmetically
+    # and iter_legs() expands them lazily, one dated leg at a time.
+
+    def __init__(self, columns, flight_numbers, origin_idx, dest_idx, day_masks,
+                 valid_from, valid_to, skipped=None):
+        self.columns = columns
+        self.flight_numbers = flight_numbers
+        self.origin_idx = origin_idx
+        self.dest_idx = dest_idx
+        self.day_masks = day_masks
+        self.valid_from = valid_from
+        self.valid_to = valid_to
+        # Rows dropped while loading, by reason
+        self.skipped = dict(skipped or {})
+
+    def __len__(self):
+        return len(self.flight_numbers)
+
+    def get_period(self):
+        # (first, last) date covered by any row, or (None, None) when empty
+        if len(self) == 0:
+            return None, None
+        return self.valid_from.min(), self.valid_to.max()
+
+    def get_skipped_count(self):
+        return sum(self.skipped.values())
+
+    def _clip(self, period_start, period_end):
+        first, last = self.valid_from, self.valid_to
+        if period_start is not None:
+            first = np.maximum(first, np.datetime64(period_start, "D"))
+        if period_end is not None:
+            last = np.minimum(last, np.datetime64(period_end, "D"))
+        return first, last
+
+    def operating_days(self, period_start=None, period_end=None):
+        """Dated legs per row within the (optional) period, counted without expansion."""
+        first, last = self._clip(period_start, period_end)
+        return count_operating_days(self.day_masks, first, last)
+
+    def iter_legs(self, period_start=None, period_end=None):
+        """
+        Expand rows into dated legs lazily.
+
+        Yields:
+            Tuple of (flight_number, origin_code, destination_code, datetime.date),
+            row by row and in date order within a row
+        """
+        codes = self.columns.codes
+        first_dates, last_dates = self._clip(period_start, period_end)
+        week = timedelta(days=7)
+        for row in range(len(self)):
+            first, last = first_dates[row].item(), last_dates[row].item()
+            if first > last:
+                continue
+            mask = int(self.day_masks[row])
+            offsets = sorted((day - first.weekday()) % 7 for day in range(7) if mask >> day & 1)
+            flight, origin, destination = (str(self.flight_numbers[row]),
+                                           str(codes[self.origin_idx[row]]),
+                                           str(codes[self.dest_idx[row]]))
+            week_start = first
+            while week_start <= last:
+                for offset in offsets:
+                    date = week_start + timedelta(days=offset)
+                    if date > last:
+                        break
+                    yield flight, origin, destination, date
+                week_start += week
+
+    @classmethod
+    def concatenate(cls, columns, schedules):
+        schedules = list(schedules)
+        skipped = {}
+        for schedule in schedules:
+            for reason, count in schedule.skipped.items():
+                skipped[reason] = skipped.get(reason, 0) + count
+
+        def join(name, dtype):
+            parts = [getattr(schedule, name) for schedule in schedules]
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+        return cls(columns, join("flight_numbers", str), join("origin_idx", np.int64),
+                   join("dest_idx", np.int64), join("day_masks", np.int64),
+                   join("valid_from", "datetime64[D]"), join("valid_to", "datetime64[D]"),
+                   skipped)
+
+
+def _schedule_from_chunk(fields, columns):
+    # Validate one parsed chunk into a FlightSchedule holding its usable rows
+    report = validate_route_codes(fields["origin"], fields["destination"], columns)
+    day_masks = np.array([parse_day_mask(text) for text in fields["days"]], dtype=np.int64)
+    valid_from = _parse_dates(fields["valid_from"])
+    valid_to = _parse_dates(fields["valid_to"])
+    well_formed = ((day_masks > 0) & ~np.isnat(valid_from) & ~np.isnat(valid_to)
+                   & (valid_from <= valid_to))
+    keep = report.valid & well_formed
+
+    flight_numbers = np.char.upper(np.char.strip(np.asarray(fields["flight_number"], dtype=str)))
+    return FlightSchedule(
+        columns, flight_numbers[keep], report.origin_idx[keep], report.dest_idx[keep],
+        day_masks[keep], valid_from[keep], valid_to[keep],
+        skipped={
+            "unknown_airport": report.get_unknown_count(),
+            "same_airport": int(np.count_nonzero(report.known & ~report.valid)),
+            "invalid_days_or_dates": int(np.count_nonzero(report.valid & ~well_formed)),
+        }
+    )
+
+
+def load_schedule(binary_file, columns, chunk_rows=SCHEDULE_CHUNK_ROWS, progress_callback=None):
+    """
+    Stream a schedule CSV into a compact FlightSchedule.
+
+    Expected fields are flight number, origin, destination, operating days
+    (SSIM digits, e.g. '1.3.5..') and an ISO validity period. Rows with
+    unknown airports, the same airport at both ends, no operating day or
+    unparseable/inverted dates are dropped and counted in `skipped`.
+
+    Arguments:
+        binary_file: Schedule CSV opened in binary mode
+        columns: AirportColumns to resolve codes against
+        chunk_rows: Rows parsed and validated together
+        progress_callback: Optional callable(bytes_read, rows_loaded)
+
+    Returns:
+        FlightSchedule
+
+    Raises:
+        ValueError if a header row lacks one of the schedule fields
+    """
+    parts = []
+    rows_loaded = 0
+    for fields, bytes_read in iter_schedule_chunks(binary_file, chunk_rows):
+        parts.append(_schedule_from_chunk(fields, columns))
+        rows_loaded += len(parts[-1])
+        if progress_callback:
+            progress_callback(bytes_read, rows_loaded)
+    return FlightSchedule.concatenate(columns, parts)
+
+
+class ScheduleSummary:
+    # Leg counts and period totals of a schedule, per flight number and per country pair
+    #
+    # Each group holds labels, schedule rows, legs and leg-weighted sums of
+    # SUM_FIELDS over the period; weekly figures divide by the period's
+    # length in weeks.
+
+    def __init__(self, period_start, period_end, groups, total_legs, unique_pairs,
+                 schedule_rows, has_performance, skipped=None):
+        self.period_start = period_start
+        self.period_end = period_end
+        self.groups = groups
+        self.total_legs = total_legs
+        self.unique_pairs = unique_pairs
+        self.schedule_rows = schedule_rows
+        self.has_performance = has_performance
+        self.skipped = dict(skipped or {})
+
+    def get_weeks(self):
+        if self.period_start is None:
+            return 0.0
+        days = int((self.period_end - self.period_start).astype(np.int64)) + 1
+        return days / 7.0
+
+    def get_totals(self):
+        # Whole-schedule sums over the period (any group adds up to these)
+        group = self.groups["flight_number"]
+        return {field: float(group["sums"][field].sum()) for field in SUM_FIELDS}
+
+    def get_rows(self, group_by="flight_number", sort_by="weekly_distance_miles"):
+        """
+        One dict per group with period totals and weekly averages.
+
+        Block hours and fuel are None unless the summary used an aircraft profile.
+        Rows sort alphabetically by 'label', or largest first by any numeric
+        field (None counting as zero).
+
+        Raises:
+            ValueError for an unknown grouping or sort field
+        """
+        if group_by not in self.groups:
+            raise ValueError(f"Unknown grouping '{group_by}'; expected one of {SCHEDULE_GROUPS}")
+        group = self.groups[group_by]
+        weeks = self.get_weeks() or 1.0
+        rows = []
+        for i, label in enumerate(group["labels"]):
+            row = {"label": label,
+                   "schedule_rows": int(group["schedule_rows"][i]),
+                   "legs": int(group["legs"][i]),
+                   "weekly_legs": int(group["legs"][i]) / weeks}
+            for field in SUM_FIELDS:
+                total = float(group["sums"][field][i])
+                if field in ("block_hours", "fuel_burn_kg") and not self.has_performance:
+                    row[field] = row[f"weekly_{field}"] = None
+                else:
+                    row[field] = total
+                    row[f"weekly_{field}"] = total / weeks
+            rows.append(row)
+        if rows and sort_by not in rows[0]:
+            raise ValueError(f"Unknown sort field '{sort_by}'")
+        if sort_by == "label":
+            return sorted(rows, key=lambda row: row["label"])
+        return sorted(rows, key=lambda row: row[sort_by] or 0.0, reverse=True)
+
+
+def _group_totals(codes, labels_of, legs, metrics):
+    # Leg-weighted sums per distinct integer code
+    group_codes, group = np.unique(codes, return_inverse=True)
+    groups = len(group_codes)
+    weights = legs.astype(np.float64)
+    return {
+        "labels": labels_of(group_codes),
+        "schedule_rows": np.bincount(group, minlength=groups),
+        "legs": np.bincount(group, weights=weights, minlength=groups).astype(np.int64),
+        "sums": {field: np.bincount(group, weights=weights * values, minlength=groups)
+                 for field, values in metrics.items()},
+    }
+
+
+def summarize_schedule(schedule, aircraft=None, period_start=None, period_end=None, store=None):
+    """
+    Totals of a schedule's dated legs per flight number and per country pair.
+
+    Operating days are counted per row without expanding legs; route metrics
+    are computed once per unique airport pair (reverse direction included)
+    and joined back to the rows, then weighted by each row's leg count.
+
+    Arguments:
+        schedule: FlightSchedule from load_schedule
+        aircraft: Optional AircraftProfile for block hours and fuel
+        period_start, period_end: Optional dates bounding the period
+            (default: the schedule's own first and last dates)
+        store: Optional RouteResultStore for the per-pair results
+
+    Returns:
+        ScheduleSummary
+    """
+    first, last = schedule.get_period()
+    period_start = first if period_start is None else np.datetime64(period_start, "D")
+    period_end = last if period_end is None else np.datetime64(period_end, "D")
+    columns = schedule.columns
+
+    legs = schedule.operating_days(period_start, period_end)
+    active = np.flatnonzero(legs > 0)
+    canonical = canonicalize_indices(schedule.origin_idx[active], schedule.dest_idx[active],
+                                     len(columns), kept_rows=active)
+    batch = compute_canonical_batch(columns, canonical, aircraft=aircraft, store=store)
+    rows = canonical.kept_rows
+    legs = legs[rows]
+
+    metrics = {"distance_miles": np.round(batch.distance_miles, 2),
+               "flight_hours": np.asarray(batch.flight_hours, dtype=np.float64)}
+    for field in ("block_hours", "fuel_burn_kg"):
+        values = getattr(batch, field)
+        metrics[field] = np.zeros(len(batch)) if values is None else np.asarray(values, dtype=np.float64)
+
+    flight_labels, flight_codes = np.unique(schedule.flight_numbers[rows], return_inverse=True)
+    names = columns.country_names
+    count = len(names)
+    country_codes = (columns.country_ids[schedule.origin_idx[rows]].astype(np.int64) * count
+                     + columns.country_ids[schedule.dest_idx[rows]])
+    groups = {
+        "flight_number": _group_totals(flight_codes.reshape(-1), lambda codes: flight_labels[codes].tolist(),
+                                       legs, metrics),
+        "country_pair": _group_totals(country_codes, lambda codes: [
+            f"{names[code // count]} → {names[code % count]}" for code in codes.tolist()], legs, metrics),
+    }
+
+    return ScheduleSummary(
+        period_start, period_end, groups,
+        total_legs=int(legs.sum()),
+        unique_pairs=canonical.get_unique_count(),
+        schedule_rows=len(rows),
+        has_performance=batch.block_hours is not None,
+        skipped=schedule.skipped
+    )
@@ -0,0 +1,254 @@
+"""
+Split batch and all-pairs jobs into shards that independent workers process.
+
+A coordinator writes a shard manifest into a job directory on a shared
+filesystem; each worker (any machine, any process) runs one shard by id and
+writes its outputs plus a partial summary; a merge step combines them.
+"""
+import csv
+import json
+import os
+from pathlib import Path
+import numpy as np
+from numpy.lib.format import open_memmap
+from services.aircraft_performance import load_aircraft_profiles
+from services.batch_engine import BatchPartial, compute_canonical_batch, compute_route_batch
+from services.batch_stream import (
+    PERFORMANCE_HEADER,
+    RESULT_HEADER,
+    ROUTE_FILE_CHUNK_ROWS,
+    iter_route_chunks,
+    write_route_rows
+)
+from services.geo_arrays import haversine_distance_array
+from services.pair_dedup import canonicalize_indices, canonicalize_pairs
+from services.shared_store import MATRIX_BLOCK_ROWS, coordinates_fingerprint
+
+SHARD_MANIFEST_NAME = "shards.json"
+SHARD_KINDS = ("batch", "all_pairs")
+
+# Most pairs summarized per compute_route_batch call in all-pairs shards;
+# bounds the RouteBatch arrays to tens of MB however many airports there are
+ALL_PAIRS_SUMMARY_PAIRS = 1 << 20
+
+
+def _write_json(path, data):
+    temp_path = Path(path).with_suffix(".tmp")
+    temp_path.write_text(json.dumps(data))
+    os.replace(temp_path, path)
+
+
+def plan_shards(columns, job_dir, shard_count, kind="all_pairs", route_file=None,
+                aircraft_type=None):
+    """
+    Split the airport index range into shards and write the shard manifest.
+
+    Batch shards own the request rows whose origin falls in their range
+    (rows with unknown codes go to shard 0); all-pairs shards own full rows
+    of the distance matrix and summarize each pair once, from its lower index.
+
+    Arguments:
+        columns: AirportColumns the job runs against
+        job_dir: Directory shared by the coordinator and all workers
+        shard_count: Number of shards
+        kind: 'batch' or 'all_pairs'
+        route_file: Route CSV for batch jobs
+        aircraft_type: Optional aircraft profile type code
+
+    Returns:
+        List of shard spec dicts (id, start, end, output, partial)
+    """
+    if kind not in SHARD_KINDS:
+        raise ValueError(f"Unknown shard kind '{kind}'; expected one of {SHARD_KINDS}")
+    if kind == "batch" and route_file is None:
+        raise ValueError("Batch shards need a route file")
+
+    job_dir = Path(job_dir)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    shard_count = max(1, min(shard_count, len(columns)))
+    bounds = np.linspace(0, len(columns), shard_count + 1).astype(int)
+    suffix = ".csv" if kind == "batch" else ".npy"
+
+    shards = [{
+        "id": i,
+        "start": int(bounds[i]),
+        "end": int(bounds[i + 1]),
+        "output": f"shard-{i:04d}{suffix}",
+        "partial": f"shard-{i:04d}.partial.json",
+    } for i in range(shard_count)]
+
+    _write_json(job_dir / SHARD_MANIFEST_NAME, {
+        "kind": kind,
+        "fingerprint": coordinates_fingerprint(columns),
+        "airport_count": len(columns),
+        "route_file": str(Path(route_file).resolve()) if route_file else None,
+        "aircraft_type": aircraft_type,
+        "shards": shards,
+    })
+    return shards
+
+
+def load_shard_manifest(job_dir, columns=None):
+    """
+    Read a job's shard manifest.
+
+    Raises:
+        ValueError if `columns` differ from the airports the job was planned with
+    """
+    manifest = json.loads((Path(job_dir) / SHARD_MANIFEST_NAME).read_text())
+    if columns is not None and coordinates_fingerprint(columns) != manifest["fingerprint"]:
+        raise ValueError(f"Airport data does not match shard job in '{job_dir}'")
+    return manifest
+
+
+def _manifest_aircraft(manifest):
+    if not manifest["aircraft_type"]:
+        return None
+    profiles = load_aircraft_profiles()
+    if manifest["aircraft_type"] not in profiles:
+        raise ValueError(f"Unknown aircraft type '{manifest['aircraft_type']}'")
+    return profiles[manifest["aircraft_type"]]
+
+
+def _run_batch_shard(columns, manifest, shard, output_path, aircraft):
+    partial = BatchPartial()
+    start, end = shard["start"], shard["end"]
+    temp_path = output_path.with_suffix(".tmp")
+
+    with open(manifest["route_file"], 'rb') as route_file, \
+            open(temp_path, 'w', newline='') as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(RESULT_HEADER + (PERFORMANCE_HEADER if aircraft else []))
+
+        for pairs, _ in iter_route_chunks(route_file, ROUTE_FILE_CHUNK_ROWS):
+            resolved = canonicalize_pairs(pairs, columns)
+            reversed_rows = resolved.row_reversed
+            low, high = resolved.low_idx[resolved.row_pair], resolved.high_idx[resolved.row_pair]
+            origin = np.where(reversed_rows, high, low)
+            destination = np.where(reversed_rows, low, high)
+
+            # Unknown and same-airport rows are dropped before pairing; shard 0 counts them
+            same_airport = resolved.skipped_same_airport
+            owned = (origin >= start) & (origin < end)
+            canonical = canonicalize_indices(
+                origin[owned], destination[owned], len(columns),
+                kept_rows=resolved.kept_rows[owned],
+                total_rows=int(np.count_nonzero(owned)),
+                skipped_unknown=resolved.skipped_unknown if shard["id"] == 0 else 0
+            )
+            if shard["id"] == 0:
+                canonical.total_rows += resolved.skipped_unknown + same_airport
+                canonical.skipped_same_airport = same_airport
+
+            batch = compute_canonical_batch(columns, canonical, aircraft=aircraft)
+            partial.add_batch(batch, canonical)
+            write_route_rows(batch, writer)
+
+    os.replace(temp_path, output_path)
+    return partial
+
+
+def _run_all_pairs_shard(columns, shard, output_path, aircraft):
+    partial = BatchPartial()
+    start, end = shard["start"], shard["end"]
+    lat, lon = columns.latitudes, columns.longitudes
+    temp_path = output_path.with_suffix(".tmp.npy")
+    rows = open_memmap(temp_path, mode='w+', dtype=np.float32, shape=(end - start, len(columns)))
+
+    for block_start in range(start, end, MATRIX_BLOCK_ROWS):
+        block_end = min(block_start + MATRIX_BLOCK_ROWS, end)
+        rows[block_start - start:block_end - start] = haversine_distance_array(
+            lat[block_start:block_end, None], lon[block_start:block_end, None],
+            lat[None, :], lon[None, :]
+        )
+        # Each unordered pair is summarized once, by the shard owning its lower
+        # index, a column sub-block at a time
+        width = max(1, ALL_PAIRS_SUMMARY_PAIRS // (block_end - block_start))
+        for col_start in range(block_start + 1, len(columns), width):
+            col_end = min(col_start + width, len(columns))
+            origin_idx, dest_idx = np.nonzero(
+                np.arange(block_start, block_end)[:, None] < np.arange(col_start, col_end)[None, :])
+            partial.add_batch(compute_route_batch(columns, origin_idx + block_start,
+                                                  dest_idx + col_start, aircraft=aircraft))
+
+    partial.request_rows = partial.route_count
+    rows.flush()
+    del rows
+    os.replace(temp_path, output_path)
+    return partial
+
+
+def run_shard(job_dir, shard_id, columns):
+    """
+    Process one shard and write its output and partial summary.
+
+    The partial summary is written last (atomically), so its presence marks
+    the shard as finished; re-running a shard simply overwrites it.
+
+    Returns:
+        BatchPartial for the shard
+    """
+    job_dir = Path(job_dir)
+    manifest = load_shard_manifest(job_dir, columns)
+    if not 0 <= shard_id < len(manifest["shards"]):
+        raise ValueError(f"Shard {shard_id} is not in '{job_dir}'")
+    shard = manifest["shards"][shard_id]
+    aircraft = _manifest_aircraft(manifest)
+    output_path = job_dir / shard["output"]
+
+    if manifest["kind"] == "batch":
+        partial = _run_batch_shard(columns, manifest, shard, output_path, aircraft)
+    else:
+        partial = _run_all_pairs_shard(columns, shard, output_path, aircraft)
+
+    _write_json(job_dir / shard["partial"], partial.to_dict())
+    return partial
+
+
+def pending_shards(job_dir):
+    manifest = load_shard_manifest(job_dir)
+    return [shard["id"] for shard in manifest["shards"]
+            if not (Path(job_dir) / shard["partial"]).exists()]
+
+
+def merge_shards(job_dir, columns):
+    """
+    Combine finished shards into one partial and one output file.
+
+    Batch jobs concatenate shard CSVs into results.csv (grouped by shard);
+    all-pairs jobs assemble distance_matrix.npy. The merged partial is
+    also written to merged.json.
+
+    Raises:
+        ValueError if any shard has not finished
+
+    Returns:
+        BatchPartial for the whole job
+    """
+    job_dir = Path(job_dir)
+    manifest = load_shard_manifest(job_dir, columns)
+    missing = pending_shards(job_dir)
+    if missing:
+        raise ValueError(f"Shards not finished: {missing}")
+
+    merged = BatchPartial()
+    for shard in manifest["shards"]:
+        merged.merge(BatchPartial.from_dict(json.loads((job_dir / shard["partial"]).read_text())))
+
+    if manifest["kind"] == "batch":
+        with open(job_dir / "results.csv", 'w', newline='') as output_file:
+            for i, shard in enumerate(manifest["shards"]):
+                with open(job_dir / shard["output"], newline='') as shard_file:
+                    if i > 0:
+                        shard_file.readline()
+                    output_file.writelines(shard_file)
+    else:
+        n = len(columns)
+        matrix = open_memmap(job_dir / "distance_matrix.npy", mode='w+', dtype=np.float32, shape=(n, n))
+        for shard in manifest["shards"]:
+            matrix[shard["start"]:shard["end"]] = np.load(job_dir / shard["output"], mmap_mode='r')
+        matrix.flush()
+        del matrix
+
+    _write_json(job_dir / "merged.json", merged.to_dict())
+    return merged
@@ -0,0 +1,176 @@
+"""
+Publish airport columns and the distance matrix as memory-mapped files.
+
+One loader process writes the arrays once; every other process or Streamlit
+session attaches read-only. The OS page cache backs all attachments with the
+same physical pages, so memory stays flat as the number of readers grows.
+"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from models.airport_columns import AirportColumns
+from services.airport_loader import PROJECT_ROOT, load_airports
+from services.geo_arrays import haversine_distance_array
+
+SHARED_DATA_DIR = PROJECT_ROOT / "output" / "shared"
+MANIFEST_NAME = "manifest.json"
+STRING_COLUMNS = ("codes", "names", "cities")
+NUMERIC_COLUMNS = ("country_ids", "latitudes", "longitudes")
+
+# Rows of the distance matrix computed per block while publishing
+MATRIX_BLOCK_ROWS = 512
+
+
+def coordinates_fingerprint(columns):
+    """Hash of airport codes and coordinates identifying a published generation."""
+    digest = hashlib.sha256()
+    digest.update("\n".join(str(code) for code in columns.codes).encode())
+    digest.update(np.ascontiguousarray(columns.latitudes, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(columns.longitudes, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def fill_distance_matrix(columns, out, block_rows=MATRIX_BLOCK_ROWS):
+    """Write all-pairs distances in miles into `out` (N x N) one row block at a time."""
+    lat, lon = columns.latitudes, columns.longitudes
+    for start in range(0, len(columns), block_rows):
+        stop = min(start + block_rows, len(columns))
+        out[start:stop] = haversine_distance_array(
+            lat[start:stop, None], lon[start:stop, None], lat[None, :], lon[None, :]
+        )
+    return out
+
+
+def _save_array(path, array):
+    """Save an array atomically so readers never map a partial file."""
+    temp_path = path.with_suffix(".tmp.npy")
+    np.save(temp_path, array)
+    os.replace(temp_path, path)
+
+
+def publish_airport_data(airports, directory=SHARED_DATA_DIR, include_distance_matrix=True):
+    """
+    Publish airport columns (and optionally the distance matrix) for sharing.
+
+    Each publish writes a new generation directory and then swaps the manifest,
+    so processes still attached to an older generation keep valid mappings.
+
+    Arguments:
+        airports: Mapping of code -> Airport from load_airports
+        directory: Root directory for the shared files
+        include_distance_matrix: Also publish the N x N float32 matrix in miles
+
+    Returns:
+        Path to the generation directory that was published
+    """
+    columns = AirportColumns.from_airports(airports)
+    generation = publish_columns(columns, directory, include_distance_matrix)
+    print(f"  Published {len(columns)} airports to '{generation}'")
+    return generation
+
+
+def publish_columns(columns, directory, include_distance_matrix=True):
+    """
+    Publish already-built AirportColumns; see publish_airport_data.
+
+    Returns:
+        Path to the generation directory that was published
+    """
+    fingerprint = coordinates_fingerprint(columns)
+    generation = directory / f"generation-{fingerprint}"
+    generation.mkdir(parents=True, exist_ok=True)
+
+    for name in STRING_COLUMNS + NUMERIC_COLUMNS:
+        _save_array(generation / f"{name}.npy", getattr(columns, name))
+
+    if include_distance_matrix and not (generation / "distance_matrix.npy").exists():
+        temp_path = generation / "distance_matrix.tmp.npy"
+        matrix = np.lib.format.open_memmap(temp_path, mode="w+", dtype=np.float32,
+                                           shape=(len(columns), len(columns)))
+        fill_distance_matrix(columns, matrix)
+        matrix.flush()
+        del matrix
+        os.replace(temp_path, generation / "distance_matrix.npy")
+
+    manifest = {
+        "generation": generation.name,
+        "fingerprint": fingerprint,
+        "airport_count": len(columns),
+        "country_names": columns.country_names,
+        "has_distance_matrix": (generation / "distance_matrix.npy").exists(),
+    }
+    temp_manifest = directory / (MANIFEST_NAME + ".tmp")
+    temp_manifest.write_text(json.dumps(manifest, indent=2))
+    os.replace(temp_manifest, directory / MANIFEST_NAME)
+    return generation
+
+
+def prune_generations(directory=SHARED_DATA_DIR):
+    """Delete generation directories no longer referenced by the manifest."""
+    manifest_path = directory / MANIFEST_NAME
+    if not manifest_path.exists():
+        return 0
+    current = json.loads(manifest_path.read_text())["generation"]
+    removed = 0
+    for path in directory.glob("generation-*"):
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+class SharedAirportData:
+    # Read-only, zero-copy attachment to a published generation
+
+    def __init__(self, columns, distance_matrix, fingerprint):
+        self.columns = columns
+        self.distance_matrix = distance_matrix
+        self.fingerprint = fingerprint
+
+
+def attach_airport_data(directory=SHARED_DATA_DIR):
+    """
+    Attach to the currently published airport data.
+
+    Returns:
+        SharedAirportData whose arrays are read-only memory maps, or None if
+        nothing has been published yet
+    """
+    manifest_path = directory / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    generation = directory / manifest["generation"]
+    arrays = {name: np.load(generation / f"{name}.npy", mmap_mode="r")
+              for name in STRING_COLUMNS + NUMERIC_COLUMNS}
+    columns = AirportColumns(country_names=manifest["country_names"], **arrays)
+
+    distance_matrix = None
+    if manifest["has_distance_matrix"]:
+        distance_matrix = np.load(generation / "distance_matrix.npy", mmap_mode="r")
+
+    return SharedAirportData(columns, distance_matrix, manifest["fingerprint"])
+
+
+def attach_or_publish(airports=None, directory=SHARED_DATA_DIR):
+    """Attach to published data, publishing first if it is missing or stale."""
+    shared = attach_airport_data(directory)
+    if airports is None and shared is not None:
+        return shared
+
+    if airports is None:
+        airports = load_airports()
+    expected = coordinates_fingerprint(AirportColumns.from_airports(airports))
+    if shared is None or shared.fingerprint != expected:
+        publish_airport_data(airports, directory)
+        shared = attach_airport_data(directory)
+    return shared
+
+
+if __name__ == "__main__":
+    # Loader process: python -m services.shared_store
+    publish_airport_data(load_airports())
+    prune_generations()
@@ -0,0 +1,155 @@
+"""Nearest-airport lookups over precomputed unit vectors."""
+import numpy as np
+from config.constants import EARTH_RADIUS_MILES
+from services.geo_arrays import unit_vectors
+
+# Query points compared against all indexed airports per block
+NEAREST_BLOCK_CELLS = 8000000
+
+# Batches at least this large are answered through the candidate grid
+GRID_QUERY_THRESHOLD = 20000
+GRID_CELL_DEGREES = 1.0
+GRID_QUERY_CHUNK = 100000
+
+
+class NearestAirportIndex:
+    # Unit vectors of a fixed airport subset; queries run as blocked dot products
+    #
+    # The nearest airport on a sphere is the one with the largest dot product,
+    # so a small query block is a single matrix multiply plus argmax. Large
+    # batches go through a lat/lon grid that lists, per cell, every airport
+    # that can be nearest to some point in the cell: those within the cell
+    # center's nearest distance plus twice the cell's radius.
+
+    def __init__(self, columns, mask=None, cell_degrees=GRID_CELL_DEGREES):
+        if mask is None:
+            self.airport_idx = np.arange(len(columns))
+        else:
+            self.airport_idx = np.flatnonzero(mask)
+        self.vectors = unit_vectors(columns.latitudes[self.airport_idx],
+                                    columns.longitudes[self.airport_idx])
+        self.cell_degrees = cell_degrees
+        self._grid = None
+
+    def __len__(self):
+        return len(self.airport_idx)
+
+    def _grid_shape(self):
+        return int(np.ceil(180.0 / self.cell_degrees)), int(np.ceil(360.0 / self.cell_degrees))
+
+    def _cells_of(self, query_vectors):
+        rows, cols = self._grid_shape()
+        lat = np.degrees(np.arcsin(np.clip(query_vectors[:, 2], -1.0, 1.0)))
+        lon = np.degrees(np.arctan2(query_vectors[:, 1], query_vectors[:, 0]))
+        row = np.clip(np.floor((lat + 90.0) / self.cell_degrees).astype(np.intp), 0, rows - 1)
+        col = np.floor((lon + 180.0) / self.cell_degrees).astype(np.intp) % cols
+        return row * cols + col
+
+    def _build_grid(self):
+        rows, cols = self._grid_shape()
+        cell_lat = -90.0 + (np.arange(rows) + 0.5) * self.cell_degrees
+        cell_lon = -180.0 + (np.arange(cols) + 0.5) * self.cell_degrees
+        centers = unit_vectors(np.repeat(cell_lat, cols), np.tile(cell_lon, rows))
+        cell_radius = np.radians(self.cell_degrees * np.sqrt(2.0) / 2.0)
+
+        counts = np.empty(len(centers), dtype=np.intp)
+        candidates = []
+        block_rows = max(1, NEAREST_BLOCK_CELLS // len(self))
+        for start in range(0, len(centers), block_rows):
+            dots = centers[start:start + block_rows] @ self.vectors.T
+            nearest_angle = np.arccos(np.clip(dots.max(axis=1), -1.0, 1.0))
+            bound = np.cos(np.minimum(nearest_angle + 2 * cell_radius, np.pi)) - 1e-12
+            inside = dots >= bound[:, None]
+            counts[start:start + block_rows] = inside.sum(axis=1)
+            candidates.append(np.nonzero(inside)[1])
+
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._grid = (offsets, counts, np.concatenate(candidates))
+
+    def _nearest_by_grid(self, query_vectors):
+        if self._grid is None:
+            self._build_grid()
+        offsets, counts, candidates = self._grid
+        nearest = np.empty(len(query_vectors), dtype=np.intp)
+
+        for start in range(0, len(query_vectors), GRID_QUERY_CHUNK):
+            block = query_vectors[start:start + GRID_QUERY_CHUNK]
+            cells = self._cells_of(block)
+            per_query = counts[cells]
+            segment_starts = np.concatenate([[0], np.cumsum(per_query)[:-1]])
+            query_of_pair = np.repeat(np.arange(len(block)), per_query)
+            position = offsets[cells][query_of_pair] + (
+                np.arange(per_query.sum()) - segment_starts[query_of_pair])
+            candidate = candidates[position]
+
+            dots = np.einsum('ij,ij->i', block[query_of_pair], self.vectors[candidate])
+            best = np.maximum.reduceat(dots, segment_starts)
+            is_best = np.flatnonzero(dots == best[query_of_pair])
+            _, first = np.unique(query_of_pair[is_best], return_index=True)
+            nearest[start:start + len(block)] = candidate[is_best[first]]
+
+        return nearest
+
+    def _nearest_by_scan(self, query_vectors):
+        nearest = np.empty(len(query_vectors), dtype=np.intp)
+        block_rows = max(1, NEAREST_BLOCK_CELLS // len(self))
+        for start in range(0, len(query_vectors), block_rows):
+            block = slice(start, start + block_rows)
+            nearest[block] = np.argmax(query_vectors[block] @ self.vectors.T, axis=1)
+        return nearest
+
+    def nearest_vectors(self, query_vectors):
+        """
+        Nearest indexed airport for each query unit vector.
+
+        Returns:
+            Tuple of (airport indices, distances in miles)
+        """
+        if len(self) == 0:
+            raise ValueError("Nearest-airport index is empty")
+
+        query_vectors = np.asarray(query_vectors, dtype=np.float64).reshape(-1, 3)
+        if len(query_vectors) >= GRID_QUERY_THRESHOLD:
+            nearest = self._nearest_by_grid(query_vectors)
+        else:
+            nearest = self._nearest_by_scan(query_vectors)
+
+        # Exact angle from the cross product stays accurate for close airports
+        matched = self.vectors[nearest]
+        angle = np.arctan2(np.linalg.norm(np.cross(query_vectors, matched), axis=1),
+                           np.einsum('ij,ij->i', query_vectors, matched))
+        return self.airport_idx[nearest], angle * EARTH_RADIUS_MILES
+
+    def nearest(self, lat, lon):
+        """Nearest indexed airport for arrays of coordinates; see nearest_vectors."""
+        return self.nearest_vectors(unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon)))
+
+    def k_nearest(self, lat, lon, count):
+        """
+        The `count` indexed airports closest to one point, nearest first.
+
+        One dot product per airport and a partial selection, so a query is
+        O(N) with only the `count` winners sorted.
+
+        Returns:
+            Tuple of (airport indices, distances in miles)
+        """
+        point = unit_vectors(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+        dots = self.vectors @ point
+        count = min(max(int(count), 0), len(dots))
+        if count < len(dots):
+            best = np.argpartition(-dots, count - 1)[:count] if count else np.zeros(0, dtype=np.intp)
+        else:
+            best = np.arange(len(dots))
+        angle = np.arctan2(np.linalg.norm(np.cross(self.vectors[best], point), axis=1), dots[best])
+        order = np.lexsort((best, angle))
+        return self.airport_idx[best[order]], angle[order] * EARTH_RADIUS_MILES
+
+    def within(self, lat, lon, max_miles):
+        """Indexed airports within a distance of one point, nearest first."""
+        point = unit_vectors(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+        dots = self.vectors @ point
+        inside = np.flatnonzero(dots >= np.cos(min(max_miles / EARTH_RADIUS_MILES, np.pi)))
+        angle = np.arctan2(np.linalg.norm(np.cross(self.vectors[inside], point), axis=1), dots[inside])
+        order = np.argsort(angle, kind='stable')
+        return self.airport_idx[inside[order]], angle[order] * EARTH_RADIUS_MILES
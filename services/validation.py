@@ -0,0 +1,110 @@
+"""Bulk validation of airport codes in route requests."""
+import numpy as np
+
+# Offending rows kept per reason for error messages
+VALIDATION_SAMPLE_SIZE = 5
+
+VALIDATION_REASONS = ("unknown_origin", "unknown_destination", "same_airport")
+
+
+class ValidationReport:
+    # Resolved indices and validity for every request row, plus error counts
+    #
+    # origin_idx / dest_idx are -1 where a code is unknown. A row with both
+    # codes unknown counts under both reasons; same_airport only counts rows
+    # whose codes are both known.
+
+    def __init__(self, origin_idx, dest_idx, counts, samples):
+        self.origin_idx = origin_idx
+        self.dest_idx = dest_idx
+        self.known = (origin_idx >= 0) & (dest_idx >= 0)
+        self.valid = self.known & (origin_idx != dest_idx)
+        self.counts = counts
+        self.samples = samples
+
+    def __len__(self):
+        return len(self.valid)
+
+    def get_valid_count(self):
+        return int(np.count_nonzero(self.valid))
+
+    def get_unknown_count(self):
+        # Rows with at least one unknown code
+        return len(self) - int(np.count_nonzero(self.known))
+
+    def get_error_counts(self):
+        return {reason: count for reason, count in self.counts.items() if count}
+
+
+def normalize_codes(codes):
+    """Strip and upper-case an array of codes (vectorized)."""
+    return np.char.upper(np.char.strip(np.asarray(codes, dtype=str)))
+
+
+def resolve_codes(codes, columns, sorter=None):
+    """
+    Airport index for each code, or -1 when unknown.
+
+    Codes are looked up as given first, with one binary search over the
+    sorted airport codes; only the misses are normalized and looked up
+    again, so clean input never pays for string processing.
+
+    Arguments:
+        codes: Array-like of code strings
+        columns: AirportColumns
+        sorter: Optional argsort of columns.codes, reused across calls
+
+    Returns:
+        Array of airport indices (int64)
+    """
+    codes = np.asarray(codes, dtype=str)
+    if sorter is None:
+        sorter = np.argsort(columns.codes, kind='stable')
+    sorted_codes = columns.codes[sorter]
+    indices = np.full(codes.shape, -1, dtype=np.int64)
+    if len(sorted_codes) == 0 or codes.size == 0:
+        return indices
+
+    def lookup(values):
+        position = np.minimum(np.searchsorted(sorted_codes, values), len(sorted_codes) - 1)
+        found = sorted_codes[position] == values
+        return np.where(found, sorter[position], -1)
+
+    indices[...] = lookup(codes)
+    missing = np.flatnonzero(indices < 0)
+    if len(missing):
+        indices[missing] = lookup(normalize_codes(codes[missing]))
+    return indices
+
+
+def validate_route_codes(origin_codes, dest_codes, columns, sample_size=VALIDATION_SAMPLE_SIZE):
+    """
+    Validate many (origin, destination) code pairs at once without printing.
+
+    Arguments:
+        origin_codes, dest_codes: Equal-length arrays of airport codes
+        columns: AirportColumns to resolve codes against
+        sample_size: Offending rows kept per reason
+
+    Returns:
+        ValidationReport with per-reason counts and samples of
+        (row, origin_code, destination_code)
+    """
+    origin_codes = np.asarray(origin_codes, dtype=str)
+    dest_codes = np.asarray(dest_codes, dtype=str)
+    sorter = np.argsort(columns.codes, kind='stable')
+    origin_idx = resolve_codes(origin_codes, columns, sorter)
+    dest_idx = resolve_codes(dest_codes, columns, sorter)
+
+    offenders = {
+        "unknown_origin": origin_idx < 0,
+        "unknown_destination": dest_idx < 0,
+        "same_airport": (origin_idx >= 0) & (origin_idx == dest_idx),
+    }
+    counts = {reason: int(np.count_nonzero(mask)) for reason, mask in offenders.items()}
+    samples = {}
+    for reason, mask in offenders.items():
+        rows = np.flatnonzero(mask)[:sample_size]
+        samples[reason] = [(int(row), str(origin_codes[row]), str(dest_codes[row])) for row in rows]
+
+    return ValidationReport(origin_idx, dest_idx, counts, samples)
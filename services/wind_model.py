@@ -0,0 +1,186 @@
+"""Gridded wind fields and wind-corrected flight time estimation."""
+from pathlib import Path
+import numpy as np
+from config.constants import (
+    AVERAGE_CRUISE_SPEED_MPH,
+    DEFAULT_FLIGHT_LEVEL,
+    WIND_PATH_SAMPLES,
+    MIN_GROUND_SPEED_FRACTION
+)
+from services.geo_arrays import (
+    haversine_distance_array,
+    initial_bearing_array,
+    sample_great_circle
+)
+
+# Conversion factors from supported wind file units to miles per hour
+WIND_UNIT_TO_MPH = {
+    'mph': 1.0,
+    'knots': 1.150779,
+    'm/s': 2.236936,
+}
+
+# Routes processed together when integrating along paths (bounds memory use)
+ROUTE_CHUNK_SIZE = 20000
+
+
+def _fractional_index(values, axis_values):
+    """Return (lower index, upper index, weight) of values on an ascending axis."""
+    positions = np.interp(values, axis_values, np.arange(len(axis_values)))
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(axis_values) - 1)
+    return lower, upper, positions - lower
+
+
+class WindField:
+    # Eastward (u) and northward (v) wind components on a lat/lon grid per flight level
+
+    def __init__(self, latitudes, longitudes, levels, u_mph, v_mph):
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.u_mph = np.asarray(u_mph, dtype=np.float64)
+        self.v_mph = np.asarray(v_mph, dtype=np.float64)
+
+        expected_shape = (len(self.levels), len(self.latitudes), len(self.longitudes))
+        if self.u_mph.shape != expected_shape or self.v_mph.shape != expected_shape:
+            raise ValueError(f"Wind components must have shape {expected_shape} "
+                             f"(levels, latitudes, longitudes)")
+        for name, axis in (("latitudes", self.latitudes),
+                           ("longitudes", self.longitudes),
+                           ("levels", self.levels)):
+            if np.any(np.diff(axis) <= 0):
+                raise ValueError(f"Wind field {name} must be strictly ascending")
+
+        # A grid spanning the whole globe wraps across the antimeridian
+        self.is_global = self.longitudes[-1] - self.longitudes[0] + np.min(
+            np.diff(self.longitudes), initial=360.0) >= 360.0 - 1e-9
+
+    def _longitude_index(self, lon):
+        """Fractional longitude index, wrapping around the globe when possible."""
+        if not self.is_global:
+            return _fractional_index(lon, self.longitudes)
+
+        origin = self.longitudes[0]
+        wrapped = (np.asarray(lon) - origin) % 360.0 + origin
+        extended = np.append(self.longitudes, origin + 360.0)
+        lower, upper, weight = _fractional_index(wrapped, extended)
+        count = len(self.longitudes)
+        return lower % count, upper % count, weight
+
+    def wind_at(self, lat, lon, level=DEFAULT_FLIGHT_LEVEL):
+        """
+        Interpolate wind components at arbitrary points (trilinear).
+
+        Arguments:
+            lat, lon: Arrays of positions in decimal degrees
+            level: Flight level, scalar or array broadcastable to lat/lon
+
+        Returns:
+            Tuple of (u, v) arrays in miles per hour
+        """
+        lat, lon, level = np.broadcast_arrays(
+            np.asarray(lat, dtype=np.float64),
+            np.asarray(lon, dtype=np.float64),
+            np.asarray(level, dtype=np.float64)
+        )
+        z0, z1, zw = _fractional_index(level, self.levels)
+        y0, y1, yw = _fractional_index(lat, self.latitudes)
+        x0, x1, xw = self._longitude_index(lon)
+
+        def interpolate(grid):
+            lower = ((grid[z0, y0, x0] * (1 - xw) + grid[z0, y0, x1] * xw) * (1 - yw) +
+                     (grid[z0, y1, x0] * (1 - xw) + grid[z0, y1, x1] * xw) * yw)
+            upper = ((grid[z1, y0, x0] * (1 - xw) + grid[z1, y0, x1] * xw) * (1 - yw) +
+                     (grid[z1, y1, x0] * (1 - xw) + grid[z1, y1, x1] * xw) * yw)
+            return lower * (1 - zw) + upper * zw
+
+        return interpolate(self.u_mph), interpolate(self.v_mph)
+
+    def estimate_flight_hours(self, origin_lat, origin_lon, dest_lat, dest_lon,
+                              cruise_speed_mph=AVERAGE_CRUISE_SPEED_MPH,
+                              flight_level=DEFAULT_FLIGHT_LEVEL,
+                              samples=WIND_PATH_SAMPLES):
+        """
+        Estimate wind-corrected flight times for a batch of routes.
+
+        Each great-circle path is split into segments; ground speed on a segment
+        is the airspeed corrected for crosswind plus the along-track wind, using
+        the mean wind at the segment's endpoints.
+
+        Arguments:
+            origin_lat, origin_lon: Arrays of departure coordinates
+            dest_lat, dest_lon: Arrays of arrival coordinates
+            cruise_speed_mph: True airspeed, scalar or per route
+            flight_level: Flight level, scalar or per route
+            samples: Points sampled along each path
+
+        Returns:
+            Array of flight times in hours, one per route
+        """
+        origin_lat, origin_lon, dest_lat, dest_lon = (
+            np.atleast_1d(np.asarray(values, dtype=np.float64))
+            for values in (origin_lat, origin_lon, dest_lat, dest_lon)
+        )
+        route_count = len(origin_lat)
+        airspeed = np.broadcast_to(np.asarray(cruise_speed_mph, dtype=np.float64), (route_count,))
+        levels = np.broadcast_to(np.asarray(flight_level, dtype=np.float64), (route_count,))
+        hours = np.empty(route_count, dtype=np.float64)
+
+        for start in range(0, route_count, ROUTE_CHUNK_SIZE):
+            chunk = slice(start, start + ROUTE_CHUNK_SIZE)
+            lat, lon = sample_great_circle(origin_lat[chunk], origin_lon[chunk],
+                                           dest_lat[chunk], dest_lon[chunk], samples)
+            u, v = self.wind_at(lat, lon, levels[chunk, None])
+
+            segment_miles = haversine_distance_array(lat[:, :-1], lon[:, :-1], lat[:, 1:], lon[:, 1:])
+            track = np.radians(initial_bearing_array(lat[:, :-1], lon[:, :-1], lat[:, 1:], lon[:, 1:]))
+            u_mid = (u[:, :-1] + u[:, 1:]) / 2
+            v_mid = (v[:, :-1] + v[:, 1:]) / 2
+
+            sin_track, cos_track = np.sin(track), np.cos(track)
+            along_wind = u_mid * sin_track + v_mid * cos_track
+            cross_wind = u_mid * cos_track - v_mid * sin_track
+
+            tas = airspeed[chunk, None]
+            ground_speed = np.sqrt(np.maximum(tas ** 2 - cross_wind ** 2, 0.0)) + along_wind
+            ground_speed = np.maximum(ground_speed, tas * MIN_GROUND_SPEED_FRACTION)
+
+            hours[chunk] = np.sum(segment_miles / ground_speed, axis=1)
+
+        return hours
+
+
+def load_wind_field(filepath):
+    """
+    Load a gridded wind field from a NumPy .npz archive.
+
+    The archive holds 'latitudes', 'longitudes' and 'levels' axes (ascending)
+    plus 'u' and 'v' components shaped (levels, latitudes, longitudes). An
+    optional 'units' entry selects 'mph' (default), 'knots' or 'm/s'.
+
+    Returns:
+        WindField, or None if the file is missing or malformed
+    """
+    filepath = Path(filepath)
+    try:
+        with np.load(filepath) as data:
+            units = str(data['units']) if 'units' in data.files else 'mph'
+            if units not in WIND_UNIT_TO_MPH:
+                raise ValueError(f"unsupported wind units '{units}'")
+            factor = WIND_UNIT_TO_MPH[units]
+            wind_field = WindField(
+                latitudes=data['latitudes'],
+                longitudes=data['longitudes'],
+                levels=data['levels'],
+                u_mph=data['u'] * factor,
+                v_mph=data['v'] * factor
+            )
+        print(f"  Loaded wind field from '{filepath.name}'")
+        return wind_field
+    except FileNotFoundError:
+        print(f"  Wind field '{filepath.absolute()}' not found!")
+        return None
+    except (KeyError, ValueError) as e:
+        print(f"  Invalid wind field '{filepath.name}': {e}")
+        return None
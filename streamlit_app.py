@@ -3,6 +3,9 @@ Flight Path Distance Calculator - Streamlit Frontend
 """
 import streamlit as st
 import os
+import tempfile
+import time
+import weakref
 from pathlib import Path
 
 # Add project root to path BEFORE importing our modules
@@ -11,8 +14,11 @@ if str(project_root) not in os.sys.path:
     os.sys.path.insert(0, str(project_root))
 
 from models.airport import Airport, FlightRoute
-from services.airport_loader import load_airport_database, AIRPORTS_CSV
+from services.airport_loader import AIRPORTS_CSV
 from services.route_calculator import calculate_flight_route, validate_airport_codes
+from services.batch_stream import BatchJob
+from utils.app_resources import get_airport_database, get_aircraft_profiles, get_airport_columns
+from utils.display import describe_time_basis
 
 # Page configuration
 st.set_page_config(
@@ -66,8 +72,8 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Load airport database - NO CACHING for debugging
-airports = load_airport_database()
+# Load airport database once per server process; every session shares it
+airports = get_airport_database()
 
 # DEBUG: Show what happened during load
 if 'debug_load' not in st.session_state:
@@ -106,6 +112,15 @@ dest_selection = st.sidebar.selectbox(
 origin_code = origin_selection.split(" - ")[0]
 dest_code = dest_selection.split(" - ")[0]
 
+# Aircraft selection (optional performance profile)
+aircraft_profiles = get_aircraft_profiles()
+aircraft_choice = st.sidebar.selectbox(
+    "🛩️ Aircraft Type",
+    ["Generic jet"] + sorted(aircraft_profiles),
+    format_func=lambda code: str(aircraft_profiles[code]) if code in aircraft_profiles else code
+)
+aircraft = aircraft_profiles.get(aircraft_choice)
+
 # Calculate route button
 st.sidebar.markdown("---")
 if st.sidebar.button("✈️ Calculate Route", type="primary", use_container_width=True):
@@ -113,7 +128,7 @@ if st.sidebar.button("✈️ Calculate Route", type="primary", use_container_wid
     origin_airport, dest_airport = validate_airport_codes(origin_code, dest_code, airports)
     
     if origin_airport and dest_airport:
-        route = calculate_flight_route(origin_airport, dest_airport)
+        route = calculate_flight_route(origin_airport, dest_airport, aircraft=aircraft)
         
         if route:
             # Store route in session state for display
@@ -204,6 +219,13 @@ with col2:
             value=f"{hours}h {minutes}m",
             delta=f"({route.estimated_flight_hours:.2f} hours total)"
         )
+        
+        if route.block_hours is not None:
+            st.metric(
+                label=f"Block Time ({route.aircraft_type})",
+                value=f"{route.block_hours:.2f} h",
+                delta=f"{route.fuel_burn_kg:,.0f} kg fuel"
+            )
 
 # Detailed Analysis Section (full width)
 if 'route' in st.session_state:
@@ -242,10 +264,85 @@ if 'route' in st.session_state:
         st.markdown(f"""
         - **Duration:** {hours}h {minutes}m
         - **Total Hours:** {route.estimated_flight_hours:.2f}
-        - **Speed Assumption:** 500 mph
+        - **Based on:** {describe_time_basis(route)}
         """)
         st.markdown('</div>', unsafe_allow_html=True)
 
+# Batch upload section (full width)
+st.markdown("---")
+st.subheader("📂 Batch Route Upload")
+st.caption("Upload a CSV of origin,destination airport code pairs. Files are processed "
+           "in chunks on a background worker, so processing keeps memory flat; the results "
+           "file stays on disk and is only read when you download it.")
+
+
+def _remove_file(path):
+    # Delete a batch results file, ignoring one that is already gone
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+uploaded_routes = st.file_uploader("Route pairs CSV", type=["csv", "txt"])
+if uploaded_routes is not None and st.button("▶️ Run Batch Analysis"):
+    uploaded_routes.seek(0)
+    output_handle, output_path = tempfile.mkstemp(prefix="batch_routes_", suffix=".csv")
+    os.close(output_handle)
+    previous_job = st.session_state.get("batch_job")
+    if previous_job is not None:
+        # Stops in the background; its results file goes once it is dropped (below)
+        previous_job.cancel()
+    batch_job = BatchJob(
+        uploaded_routes,
+        uploaded_routes.size,
+        get_airport_columns(),
+        output_path,
+        aircraft=aircraft
+    )
+    # The results file goes when the job is dropped: replaced, session ended or app exit
+    weakref.finalize(batch_job, _remove_file, output_path)
+    st.session_state.batch_job = batch_job.start()
+
+batch_job = st.session_state.get("batch_job")
+if batch_job is not None:
+    if not batch_job.is_done():
+        st.progress(batch_job.get_progress(),
+                    text=f"Processed {batch_job.rows_processed:,} rows...")
+        time.sleep(0.5)
+        st.rerun()
+    elif batch_job.error is not None:
+        st.error(f"❌ Batch analysis failed: {batch_job.error}")
+    else:
+        partial = batch_job.partial
+        st.success(f"✅ Processed {partial.request_rows:,} rows")
+        if partial.skipped_unknown or partial.skipped_same_airport:
+            st.warning(f"Skipped {partial.skipped_unknown:,} rows with unknown airport codes and "
+                       f"{partial.skipped_same_airport:,} with the same origin and destination")
+        
+        if partial.route_count:
+            analysis = partial.to_batch_analysis(batch_job.columns)
+            bcol1, bcol2, bcol3, bcol4 = st.columns(4)
+            bcol1.metric("Routes Analyzed", f"{analysis.get_total_routes():,}")
+            bcol2.metric("Total Distance", f"{analysis.total_distance_miles:,.0f} mi")
+            bcol3.metric("Average Distance", f"{analysis.average_distance_miles:,.0f} mi")
+            bcol4.metric("Total Flight Time", f"{analysis.total_flight_time_hours:,.1f} h")
+            st.markdown(f"""
+            - **Shortest:** {analysis.shortest_route.origin.code} → {analysis.shortest_route.destination.code} 
+              ({analysis.shortest_route.distance_miles:,.2f} mi)
+            - **Longest:** {analysis.longest_route.origin.code} → {analysis.longest_route.destination.code} 
+              ({analysis.longest_route.distance_miles:,.2f} mi)
+            """)
+            
+            # Deferred: the file is read when the button is clicked, not on every rerun
+            st.download_button(
+                "⬇️ Download Results CSV",
+                data=Path(batch_job.output_path).read_bytes,
+                file_name="batch_route_results.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+
 # Footer with debug info in dev mode
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,32 @@
+"""Tests for the differential distance accuracy harness."""
+import numpy as np
+from services.accuracy_harness import (adversarial_coordinates, reference_angle,
+                                       run_accuracy_harness)
+from services.geo_arrays import earth_radius, unit_vectors
+from services.screening import chord_distance_array
+
+
+def test_all_engines_within_configured_tolerances():
+    report = run_accuracy_harness(random_pairs=5000, seed=1)
+    assert report.is_passing(), report.format_table()
+    engines = {(row['engine'], row['quantity']) for row in report.get_rows()}
+    assert ("scalar", "bearing") in engines and ("shared_matrix", "distance") in engines
+    assert ("global_top_k", "bearing") in engines and ("all_pairs_tile", "distance") in engines
+
+
+def test_reference_and_failure_reporting():
+    lat1, lon1, lat2, lon2, labels = adversarial_coordinates()
+    angle = reference_angle(lat1, lon1, lat2, lon2)
+    assert np.all(angle[labels == "identical"] == 0)
+    assert np.allclose(angle[labels == "exact antipodes"].astype(float), np.pi, atol=1e-12)
+
+    def chord(lat1, lon1, lat2, lon2, unit):
+        return chord_distance_array(unit_vectors(lat1, lon1), unit_vectors(lat2, lon2), unit), None
+
+    report = run_accuracy_harness(random_pairs=100, engines={"chord": chord},
+                                  tolerances={"chord": {"distance": 1.0}}, units=("km",))
+    [failure] = report.get_failures()
+    # The chord is worst for (near) antipodes: 2R instead of πR
+    assert "antipodes" in failure['worst_case'] or "pole" in failure['worst_case']
+    assert np.isclose(failure['max'], (np.pi - 2) * earth_radius('km'), rtol=1e-3)
+    assert "FAIL" in report.format_table()
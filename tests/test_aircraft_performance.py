@@ -0,0 +1,59 @@
+"""Tests for table-driven aircraft performance estimates."""
+import numpy as np
+import pytest
+from models.airport import Airport
+from models.aircraft import AircraftProfile
+from services.aircraft_performance import PerformanceTable, load_aircraft_profiles
+from services.route_calculator import calculate_flight_route
+
+
+def _profile(type_code="TEST", cruise_speed_mph=500):
+    return AircraftProfile(type_code, "Test jet", cruise_speed_mph,
+                           climb_minutes=20, climb_distance_miles=100,
+                           descent_minutes=20, descent_distance_miles=100,
+                           taxi_out_minutes=12, taxi_in_minutes=6,
+                           climb_fuel_kg=1000, cruise_fuel_kg_per_hour=2500,
+                           descent_fuel_kg=200, taxi_fuel_kg_per_minute=10)
+
+
+def test_long_leg_adds_cruise_to_climb_and_descent():
+    table = PerformanceTable([_profile()])
+    airborne, block, fuel = table.evaluate([1200.0], [0])
+
+    # 40 min climb/descent for 200 miles, then 1000 miles at 500 mph
+    assert airborne[0] == pytest.approx(40 / 60 + 2.0)
+    assert block[0] == pytest.approx(airborne[0] + 18 / 60)
+    assert fuel[0] == pytest.approx(1200 + 2500 * 2.0 + 180)
+
+
+def test_short_leg_scales_climb_and_descent():
+    table = PerformanceTable([_profile()])
+    airborne, _, _ = table.evaluate(100.0, 0)
+    assert airborne == pytest.approx(20 / 60)
+
+
+def test_vectorized_lookup_across_types():
+    table = PerformanceTable([_profile("SLOW", 400), _profile("FAST", 600)])
+    rows = table.index_of(["slow", "FAST", "SLOW"])
+    airborne, _, _ = table.evaluate(np.array([1400.0, 1400.0, 200.0]), rows)
+
+    assert airborne[0] == pytest.approx(40 / 60 + 1200 / 400)
+    assert airborne[1] == pytest.approx(40 / 60 + 1200 / 600)
+    assert airborne[2] == pytest.approx(40 / 60)
+
+
+def test_route_carries_block_time_and_fuel():
+    lax = Airport("LAX", "Los Angeles International", "Los Angeles", "USA", 33.9425, -118.4081)
+    jfk = Airport("JFK", "John F. Kennedy International", "New York", "USA", 40.6413, -73.7781)
+
+    route = calculate_flight_route(lax, jfk, aircraft=_profile())
+
+    assert route.aircraft_type == "TEST"
+    assert route.block_hours == pytest.approx(route.estimated_flight_hours + 18 / 60)
+    assert route.fuel_burn_kg > 0
+
+
+def test_bundled_profiles_load():
+    profiles = load_aircraft_profiles()
+    assert "A320" in profiles
+    assert profiles["B77W"].cruise_speed_mph > profiles["A320"].cruise_speed_mph
@@ -0,0 +1,83 @@
+"""Tests for the SQLite airport repository."""
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from models.airport import Airport
+from models.airport_columns import AirportColumns
+from services.airport_loader import AIRPORT_BACKEND_ENV, load_airport_database, load_airports
+from services.airport_repository import SQLiteAirportRepository, build_airport_database
+from services.route_calculator import calculate_flight_route, validate_airport_codes
+
+
+@pytest.fixture(scope="module")
+def airports():
+    return load_airport_database()
+
+
+@pytest.fixture
+def repository(airports, tmp_path):
+    return SQLiteAirportRepository(build_airport_database(airports, tmp_path / "airports.sqlite"))
+
+
+def test_repository_is_a_drop_in_for_the_csv_dict(airports, repository):
+    assert len(repository) == len(airports)
+    assert list(repository) == sorted(airports)
+    assert "LAX" in repository and "XXX" not in repository
+    with pytest.raises(KeyError):
+        repository["XXX"]
+
+    origin, destination = validate_airport_codes("LAX", "JFK", repository)
+    assert calculate_flight_route(origin, destination).distance_miles == \
+        calculate_flight_route(airports["LAX"], airports["JFK"]).distance_miles
+    columns = AirportColumns.from_airports(repository)
+    assert list(columns.codes) == sorted(airports)
+
+
+def test_airports_are_loaded_lazily_and_cached(repository):
+    assert repository._cache == {}
+    first = repository["SYD"]
+    assert set(repository._cache) == {"SYD"}
+    assert repository["SYD"] is first
+    assert set(repository.get_many(["LAX", "NRT", "XXX"])) == {"LAX", "NRT"}
+
+
+def test_country_and_bounding_box_queries(airports, repository):
+    assert [a.code for a in repository.in_country("USA")] == ["JFK", "LAX", "ORD"]
+    europe = repository.in_bounding_box(40.0, 60.0, -10.0, 20.0)
+    assert [a.code for a in europe] == ["CDG", "FRA", "LHR"]
+    # Box crossing the antimeridian: Tokyo and Sydney longitudes, plus the Americas
+    wrapped = repository.in_bounding_box(-40.0, 45.0, 100.0, -70.0)
+    expected = sorted(code for code, a in airports.items()
+                      if -40 <= a.latitude <= 45 and (a.longitude >= 100 or a.longitude <= -70))
+    assert [a.code for a in wrapped] == expected
+
+
+def test_bounding_box_includes_airports_on_its_edges(airports, tmp_path):
+    # float32 R*Tree bounds round 40.1 / 10.3 outward; the exact filter must still match
+    edge = dict(airports)
+    edge["EDG"] = Airport("EDG", "Edge", "Edge", "Nowhere", 40.1, 10.3)
+    repository = SQLiteAirportRepository(build_airport_database(edge, tmp_path / "edge.sqlite"))
+    for box in [(40.1, 50, 10.3, 20), (30, 40.1, 0, 10.3), (40.1, 40.1, 10.3, 10.3),
+                (30, 40.1, 170, 10.3)]:
+        assert "EDG" in [a.code for a in repository.in_bounding_box(*box)], box
+    assert "EDG" not in [a.code for a in repository.in_bounding_box(40.10001, 50, 0, 20)]
+
+
+def test_sqlite_backend_is_selectable_from_the_loader_and_cli(airports, monkeypatch):
+    with pytest.raises(ValueError):
+        load_airports("parquet")
+    monkeypatch.setenv(AIRPORT_BACKEND_ENV, "sqlite")
+    repository = load_airports()
+    assert isinstance(repository, SQLiteAirportRepository)
+    validate_airport_codes("LAX", "JFK", repository)
+    assert set(repository._cache) == {"LAX", "JFK"}
+    assert isinstance(load_airports("csv"), dict)
+
+    def route(*options):
+        return subprocess.run([sys.executable, "main.py", *options, "route", "LAX", "JFK", "--brief"],
+                              cwd=Path(__file__).parent.parent, capture_output=True, text=True,
+                              check=True).stdout
+
+    monkeypatch.delenv(AIRPORT_BACKEND_ENV)
+    assert route("--airports", "sqlite") == route()
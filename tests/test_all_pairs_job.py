@@ -0,0 +1,57 @@
+"""Tests for the resumable all-pairs job runner."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.all_pairs_job import AllPairsJob, tile_path
+from services.shared_store import fill_distance_matrix
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return AirportColumns.from_airports(load_airport_database())
+
+
+def _expected(columns):
+    return fill_distance_matrix(columns, np.zeros((len(columns), len(columns)), dtype=np.float32))
+
+
+def test_tiled_matrix_matches_direct_computation(columns, tmp_path):
+    job = AllPairsJob(columns, tmp_path, tile_size=3)
+    assert job.run(workers=2) == len(job.all_tiles())
+    assert np.array_equal(job.load_matrix(), _expected(columns))
+
+
+def test_resume_after_interruption_skips_finished_tiles(columns, tmp_path):
+    job = AllPairsJob(columns, tmp_path, tile_size=3)
+    job.run()
+    # Simulate a crash: one tile missing from the manifest, one listed but lost
+    tile_path(tmp_path, 0, 1).unlink()
+    tile_path(tmp_path, 2, 3).unlink()
+    manifest = (tmp_path / "manifest.json").read_text()
+    (tmp_path / "manifest.json").write_text(manifest.replace("[2, 3]", "[0, 0]"))
+
+    resumed = AllPairsJob(columns, tmp_path, tile_size=3)
+    assert resumed.pending_tiles() == [(0, 1), (2, 3)]
+    assert resumed.run() == 2
+    assert np.array_equal(resumed.load_matrix(), _expected(columns))
+
+
+def test_incomplete_job_refuses_to_load_and_rejects_other_tiling(columns, tmp_path):
+    job = AllPairsJob(columns, tmp_path, tile_size=4)
+    job._write_manifest(set())
+    with pytest.raises(ValueError):
+        job.load_matrix()
+    with pytest.raises(ValueError):
+        AllPairsJob(columns, tmp_path, tile_size=5).pending_tiles()
+
+
+def test_tiles_without_a_manifest_are_recomputed(columns, tmp_path):
+    # Stale tiles from some other airport set, with no manifest to vouch for them
+    for row_tile, col_tile in AllPairsJob(columns, tmp_path, tile_size=3).all_tiles():
+        np.save(tile_path(tmp_path, row_tile, col_tile), np.full((3, 3), -1.0, dtype=np.float32))
+
+    job = AllPairsJob(columns, tmp_path, tile_size=3)
+    assert job.pending_tiles() == job.all_tiles()
+    assert job.run() == len(job.all_tiles())
+    assert np.array_equal(job.load_matrix(), _expected(columns))
@@ -0,0 +1,32 @@
+"""Tests for the legacy app.py dict adapters."""
+import app
+
+AIRPORTS = {
+    row[0]: {'name': row[1], 'city': row[2], 'country': row[3],
+             'latitude': float(row[4]), 'longitude': float(row[5])}
+    for row in app.AIRPORT_DATA[1:]
+}
+
+
+def test_route_dict_has_destination_coordinates():
+    route = app.calculate_flight_route("LAX", "JFK", AIRPORTS)
+    assert route['origin']['coordinates'] == (33.9425, -118.4081)
+    assert route['destination']['coordinates'] == (40.6413, -73.7781)
+    assert 2400 < route['distance']['miles'] < 2600 and route['compass_direction'] == "ENE"
+    assert app.calculate_flight_route("LAX", "LAX", AIRPORTS) is None
+    assert app.calculate_flight_route("LAX", "XXX", AIRPORTS) is None
+
+
+def test_batch_matches_single_routes_and_skips_invalid_rows():
+    pairs = [("LAX", "JFK"), ("JFK", "LAX"), ("SYD", "LHR"), ("LAX", "JFK"), ("XXX", "JFK"), ("CDG", "CDG")]
+    analysis = app.batch_route_analysis(pairs, AIRPORTS)
+    assert analysis['total_routes'] == 4
+
+    for route, (origin, destination) in zip(analysis['routes_analyzed'], pairs):
+        single = app.calculate_flight_route(origin, destination, AIRPORTS)
+        assert route['destination'] == single['destination']
+        assert route['distance']['miles'] == single['distance']['miles']
+        assert route['bearing'] == single['bearing']
+    assert analysis['longest_route']['origin']['code'] == "SYD"
+    assert analysis['shortest_route'] is analysis['routes_analyzed'][0]
+    assert app.batch_route_analysis([("XXX", "YYY")], AIRPORTS) == {}
@@ -0,0 +1,89 @@
+"""Tests for chunked route file processing."""
+import csv
+import io
+import pytest
+from main import analyze_batch_routes
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.batch_engine import BatchPartial
+from services.batch_stream import BatchJob, iter_route_chunks, process_route_stream
+
+
+@pytest.fixture(scope="module")
+def airports():
+    return load_airport_database()
+
+
+ROUTE_FILE = (b"origin_code,destination_code\n"
+              b"LAX,JFK\n"
+              b"jfk,lax\n"
+              b"\n"
+              b"SYD,LAX\n"
+              b"XXX,LHR\n"
+              b"LHR\n"
+              b"DXB,LHR\n")
+
+
+def test_chunks_detect_header_and_keep_malformed_rows():
+    chunks = list(iter_route_chunks(io.BytesIO(ROUTE_FILE), chunk_rows=2))
+
+    assert [len(pairs) for pairs, _ in chunks] == [2, 2, 2]
+    assert chunks[0][0][0] == ("LAX", "JFK")
+    assert chunks[2][0][0] == ("", "")
+    assert chunks[-1][1] == len(ROUTE_FILE)
+
+
+def test_streamed_totals_match_in_memory_batch(airports):
+    columns = AirportColumns.from_airports(airports)
+    output = io.StringIO()
+
+    partial = process_route_stream(io.BytesIO(ROUTE_FILE), columns, output, chunk_rows=2)
+    streamed = partial.to_batch_analysis(columns)
+    expected = analyze_batch_routes([("LAX", "JFK"), ("JFK", "LAX"), ("SYD", "LAX"), ("DXB", "LHR")],
+                                    airports)
+
+    assert partial.request_rows == 6
+    assert partial.skipped_unknown == 2
+    assert streamed.get_total_routes() == 4
+    assert streamed.total_distance_miles == pytest.approx(expected.total_distance_miles)
+    assert streamed.longest_route.origin.code == "SYD"
+
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+    assert rows[0][:2] == ["Origin", "Destination"]
+    assert rows[2][:2] == ["JFK", "LAX"]
+    assert len(rows) == 5
+
+
+def test_partials_merge_and_round_trip(airports):
+    columns = AirportColumns.from_airports(airports)
+    first = process_route_stream(io.BytesIO(b"LAX,JFK\nSYD,LAX\n"), columns)
+    second = process_route_stream(io.BytesIO(b"DXB,LHR\n"), columns)
+
+    merged = BatchPartial.from_dict(first.to_dict()).merge(second)
+
+    assert merged.route_count == 3
+    assert merged.shortest['origin'] == "LAX"
+    assert merged.longest['origin'] == "SYD"
+
+
+def test_background_job_reports_completion(airports, tmp_path):
+    columns = AirportColumns.from_airports(airports)
+    job = BatchJob(io.BytesIO(ROUTE_FILE), len(ROUTE_FILE), columns, tmp_path / "out.csv").start()
+
+    assert job.wait(timeout=30)
+    assert job.error is None
+    assert job.get_progress() == 1.0
+    assert job.partial.route_count == 4
+    assert (tmp_path / "out.csv").read_text().count("\n") == 5
+
+
+def test_cancelled_job_stops_without_a_result(airports, tmp_path):
+    columns = AirportColumns.from_airports(airports)
+    job = BatchJob(io.BytesIO(ROUTE_FILE * 50), 50 * len(ROUTE_FILE), columns,
+                   tmp_path / "out.csv", chunk_rows=2)
+    job.cancel()
+    job.start()
+
+    assert job.wait(timeout=30)
+    assert job.cancelled and job.partial is None and job.error is None
+    assert job.rows_processed == 0
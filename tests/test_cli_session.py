@@ -0,0 +1,68 @@
+"""Tests for the persistent interactive planner session."""
+import numpy as np
+import pytest
+import cli
+from cli import RouteSession
+from services.airport_loader import load_airport_database
+
+
+@pytest.fixture
+def session():
+    session = RouteSession(load_airport_database())
+    yield session
+    session.close()
+
+
+def test_routes_are_cached(session, monkeypatch):
+    calculated = []
+    calculate = cli.calculate_flight_route
+
+    def counting_calculate(origin, destination):
+        calculated.append((origin.code, destination.code))
+        return calculate(origin, destination)
+
+    monkeypatch.setattr(cli, "calculate_flight_route", counting_calculate)
+    monkeypatch.setattr(cli, "ROUTE_CACHE_SIZE", 2)
+
+    first = session.get_route("lax", "JFK")
+    assert session.get_route("LAX", " jfk") is first
+    assert calculated == [("LAX", "JFK")]
+
+    # Least recently used pairs are dropped first
+    session.get_route("SYD", "LHR")
+    session.get_route("LAX", "JFK")
+    session.get_route("DXB", "LHR")
+    assert session.get_route("LAX", "JFK") is first
+    session.get_route("SYD", "LHR")
+    assert calculated == [("LAX", "JFK"), ("SYD", "LHR"), ("DXB", "LHR"), ("SYD", "LHR")]
+    assert session.get_route("XXX", "JFK") is None
+
+
+def test_nearest_and_range_commands(session, capsys):
+    assert session.execute("nearest LHR 2")
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert [line.split("|")[0].strip("• ") for line in lines] == ["CDG", "FRA"]
+
+    session.execute("range CDG 400")
+    assert "2 airports within 400 miles of CDG" in capsys.readouterr().out
+    session.execute("nearest 1.3 103.9 1")
+    assert "SIN" in capsys.readouterr().out
+    assert session.execute("nearest 51")
+    assert "Usage: nearest" in capsys.readouterr().out
+
+    indices, miles = session.index.k_nearest(51.47, -0.45, 4)
+    all_indices, all_miles = session.index.within(51.47, -0.45, 30000)
+    assert list(indices) == list(all_indices[:4]) and np.allclose(miles, all_miles[:4])
+
+
+def test_batch_and_background_save(session, tmp_path, capsys):
+    route_file = tmp_path / "routes.csv"
+    route_file.write_text("origin,destination\nLAX,JFK\nSYD,LHR\n")
+    session.execute(f"batch {route_file}")
+    assert "Total Routes Analyzed: 2" in capsys.readouterr().out
+
+    report = tmp_path / "batch.txt"
+    session.execute(f"save {report}")
+    session.close()
+    assert "BATCH ROUTE ANALYSIS" in report.read_text()
+    assert session.execute("quit") is False
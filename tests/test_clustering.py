@@ -0,0 +1,78 @@
+"""Tests for spherical airport clustering and hub evaluation."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.clustering import (cluster_airports, distance_distribution, evaluate_hubs,
+                                 load_airport_weights)
+from services.geo_arrays import haversine_distance_array
+from utils.display import display_clusters
+
+
+def _columns(lat, lon):
+    codes = np.array([f"A{i:03d}" for i in range(len(lat))])
+    return AirportColumns(codes, codes, codes, np.zeros(len(lat), dtype=np.int32), ["X"],
+                          np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+
+
+@pytest.fixture(scope="module")
+def columns():
+    # Three tight groups, one straddling the antimeridian
+    rng = np.random.default_rng(3)
+    centers = [(51.0, 0.0), (35.0, 179.5), (-33.0, 151.0)]
+    lat = np.concatenate([rng.normal(c_lat, 1.0, 60) for c_lat, _ in centers])
+    lon = np.concatenate([rng.normal(c_lon, 1.0, 60) for _, c_lon in centers])
+    return _columns(lat, (lon + 180) % 360 - 180)
+
+
+@pytest.mark.parametrize("method", ["kmeans", "kmedoids"])
+def test_recovers_separated_groups_with_nearest_hub_distances(columns, method):
+    result = cluster_airports(columns, 3, method=method, seed=1)
+    groups = np.repeat(np.arange(3), 60)
+    for group in range(3):
+        assert len(set(result.assignment[groups == group])) == 1
+    assert sorted(result.get_cluster_sizes()) == [60, 60, 60]
+
+    # Every airport's reported distance is to its nearest center
+    center_distance = haversine_distance_array(
+        columns.latitudes[:, None], columns.longitudes[:, None],
+        result.center_lat[None, :], result.center_lon[None, :])
+    assert np.array_equal(result.assignment, np.argmin(center_distance, axis=1))
+    assert np.allclose(result.distance_miles, center_distance.min(axis=1), atol=1e-6)
+    if method == "kmedoids":
+        assert np.all(result.distance_miles[result.hub_idx] < 1e-6)
+
+
+def test_weights_pull_hubs_and_evaluate_candidate_sets(columns, tmp_path):
+    weights_file = tmp_path / "traffic.csv"
+    weights_file.write_text("Airport_Code,Weight\nA005,1000\nA070,1000\nA150,1000\nZZZ,5\nA001,-1\n")
+    weights = load_airport_weights(weights_file, columns, default_weight=1.0)
+    assert weights[5] == 1000 and weights[1] == 1.0 and weights.sum() == 3000 + 177
+
+    result = cluster_airports(columns, 3, method="kmedoids", weights=weights, seed=0)
+    assert sorted(result.hub_idx.tolist()) == [5, 70, 150]
+
+    hubs = evaluate_hubs(columns, ["a005", "A070"], weights)
+    assert np.array_equal(hubs.hub_idx, [5, 70])
+    assert hubs.get_cost() > result.get_cost()
+    assert [row['hub'] for row in hubs.get_rows()][0] in ("A005", "A070")
+    with pytest.raises(ValueError):
+        evaluate_hubs(columns, ["NOPE"])
+    with pytest.raises(ValueError):
+        cluster_airports(columns, 3, method="dbscan")
+
+
+def test_weighted_distance_distribution():
+    summary = distance_distribution([10.0, 20.0, 30.0, 40.0], [1, 1, 1, 7], percentiles=(25, 50))
+    assert summary == {'mean_miles': 34.0, 'p25_miles': 30.0, 'p50_miles': 40.0, 'max_miles': 40.0}
+    assert distance_distribution([10.0, 20.0], percentiles=(50,))['p50_miles'] == 10.0
+
+
+def test_empty_cluster_rows_and_display(capsys):
+    # Two hubs at the same place: every airport goes to the first, the second is empty
+    columns = _columns([10.0, 10.0, 20.0, 30.0], [20.0, 20.0, 25.0, 30.0])
+
+    result = evaluate_hubs(columns, ["A000", "A001"])
+    empty = [row for row in result.get_rows() if row['airports'] == 0]
+    assert len(empty) == 1 and np.isnan(empty[0]['max_miles'])
+    display_clusters(result)
+    assert "CLUSTERS" in capsys.readouterr().out
@@ -0,0 +1,107 @@
+"""Tests for route traffic density rasters."""
+import io
+import struct
+import zlib
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.density_raster import DensityRaster, rasterize_route_file
+from services.geo_arrays import unit_vectors
+
+
+@pytest.fixture(scope="module")
+def columns():
+    # Equator airports 10° apart, a pair either side of the antimeridian, one pole
+    lat = np.array([0.0, 0.0, 0.0, 0.0, 89.9])
+    lon = np.array([0.5, 10.5, 175.5, -175.5, 0.0])
+    codes = np.array(["AAA", "BBB", "CCC", "DDD", "POL"])
+    return AirportColumns(codes, codes, codes, np.zeros(5, dtype=np.int32), ["X"], lat, lon)
+
+
+def test_each_crossed_cell_counts_a_route_once_with_its_weight(columns):
+    raster = DensityRaster(1.0).add_routes(columns, [0, 3], [1, 2], weights=[3.0, 1.0])
+    equator = raster.grid[90]
+
+    # 0.5° -> 10.5° covers columns 180..190; the antimeridian route takes the
+    # short way over 175.5° -> 180° -> -175.5°
+    assert np.array_equal(np.flatnonzero(equator == 3.0), np.arange(180, 191))
+    assert np.array_equal(np.flatnonzero(equator == 1.0), np.r_[0:5, 355:360])
+    assert raster.grid.sum() == 3.0 * 11 + 10
+    assert raster.get_cell(0.2, 5.0) == 3.0 and raster.get_cell(0.2, 179.9) == 1.0
+
+    polar = DensityRaster(1.0).add_routes(columns, [0], [4])
+    assert polar.grid[:, 180].sum() >= 89 and polar.grid.max() == 1.0
+    with pytest.raises(ValueError):
+        raster.merge(DensityRaster(2.0))
+
+
+def test_route_file_to_npz_and_png(columns, tmp_path):
+    csv = b"origin,destination\nAAA,BBB\nbbb,aaa\nAAA,BBB\nCCC,DDD\nAAA,AAA\nXXX,BBB\n"
+    raster = rasterize_route_file(io.BytesIO(csv), columns, cell_degrees=2.0, chunk_rows=2)
+    assert raster.total_weight == 4 and raster.grid.shape == (90, 180)
+    assert raster.route_count == 2
+    assert raster.get_cell(0.0, 5.0) == 3.0
+
+    path = raster.save_npz(tmp_path / "density.npz")
+    loaded = DensityRaster.from_npz(path)
+    assert np.load(path)['grid'].dtype == np.uint32
+    assert np.array_equal(loaded.grid, raster.grid) and loaded.cell_degrees == 2.0
+    assert loaded.merge(raster).total_weight == 8
+
+    png = raster.to_png_bytes()
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (180, 90)
+    idat_length = struct.unpack(">I", png[33:37])[0]
+    pixels = zlib.decompress(png[41:41 + idat_length])
+    assert len(pixels) == height * (1 + width * 3)
+
+
+def test_fine_cells_have_no_gaps_along_routes():
+    # 0.25° cells are ~17 miles tall, and ~6 miles wide at 70°N
+    lat = np.array([10.0, 50.0, 70.0, 70.0])
+    lon = np.array([5.0, 5.0, 0.0, 40.0])
+    codes = np.array(["AAA", "BBB", "CCC", "DDD"])
+    columns = AirportColumns(codes, codes, codes, np.zeros(4, dtype=np.int32), ["X"], lat, lon)
+
+    meridian = DensityRaster(0.25).add_routes(columns, [0], [1]).grid
+    assert np.all(meridian[400:560, 740] == 1.0)
+
+    northern = DensityRaster(0.25).add_routes(columns, [2], [3]).grid
+    assert np.all(northern[:, 720:880].max(axis=0) == 1.0)
+
+
+def test_route_count_is_distinct_pairs_across_chunks(columns):
+    csv = b"origin,destination\n" + b"AAA,BBB\n" * 6 + b"XXX,YYY\n" * 2
+    raster = rasterize_route_file(io.BytesIO(csv), columns, chunk_rows=2)
+    assert raster.route_count == 1 and raster.total_weight == 6
+    assert raster.get_cell(0.0, 5.0) == 6.0
+
+
+def test_cells_match_densely_sampled_great_circles():
+    # Polar, antimeridian and random routes; points every ~1/8 mile along each
+    # great circle must all land in cells the raster counted for that route
+    rng = np.random.default_rng(5)
+    n = 60
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    lat[:5], lat[5:10] = rng.uniform(85, 90, 5), rng.uniform(-90, -85, 5)
+    lon[10:20] = rng.choice([-1, 1], 10) * rng.uniform(179, 180, 10)
+    codes = np.array([f"A{i:02d}" for i in range(n)])
+    columns = AirportColumns(codes, codes, codes, np.zeros(n, dtype=np.int32), ["X"], lat, lon)
+    origin, dest = rng.integers(0, n, 40), rng.integers(0, n, 40)
+
+    vectors = unit_vectors(lat, lon)
+    for a, b in zip(origin, dest):
+        grid = DensityRaster(2.0).add_routes(columns, [a], [b]).grid
+        angle = np.arccos(np.clip(vectors[a] @ vectors[b], -1.0, 1.0))
+        if angle < 1e-9:
+            continue
+        t = np.linspace(0.0, 1.0, max(2, int(angle * 3959 * 8)))[:, None]
+        points = (np.sin((1 - t) * angle) * vectors[a] + np.sin(t * angle) * vectors[b]) / np.sin(angle)
+        sampled = np.zeros(grid.size)
+        sampled[DensityRaster(2.0)._cells_of(*points.T)] = 1.0
+        assert grid.max() == 1.0
+        assert np.all(grid.ravel()[sampled > 0] == 1.0)
+        # Anything extra is a corner the samples stepped over
+        assert (grid.ravel() > sampled).sum() <= 3
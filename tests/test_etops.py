@@ -0,0 +1,77 @@
+"""Tests for ETOPS diversion coverage analysis."""
+import numpy as np
+import pytest
+import services.etops as etops
+from models.airport_columns import AirportColumns
+from services.etops import analyze_etops_coverage
+from services.geo_arrays import haversine_distance_array
+from services.spatial_index import NearestAirportIndex
+
+
+def _equator_columns():
+    # Two endpoints 60° apart on the equator plus a mid-ocean island, far north
+    return AirportColumns(
+        codes=np.array(["AAA", "BBB", "ISL", "NTH"]),
+        names=np.array(["A", "B", "Island", "North"]),
+        cities=np.array(["A", "B", "Island", "North"]),
+        country_ids=np.zeros(4, dtype=np.int32),
+        country_names=["Testland"],
+        latitudes=np.array([0.0, 0.0, 0.0, 80.0]),
+        longitudes=np.array([0.0, 60.0, 30.0, 30.0])
+    )
+
+
+def test_gap_between_endpoints_without_island():
+    columns = _equator_columns()
+    no_island = np.array([True, True, False, False])
+
+    coverage = analyze_etops_coverage(columns, [0], [1], limit_minutes=120,
+                                      alternate_mask=no_island, diversion_speed_mph=460)
+
+    half_leg = 30 * np.pi / 180 * 3959
+    assert coverage.max_diversion_minutes[0] == pytest.approx(half_leg / 460 * 60, rel=1e-3)
+    assert not coverage.is_covered()[0]
+    [(gap_start, gap_end)] = coverage.gaps_for_leg(0)
+    assert gap_start == pytest.approx(920, abs=25)
+    assert gap_end == pytest.approx(2 * half_leg - 920, abs=25)
+
+
+def test_island_alternate_closes_gap():
+    coverage = analyze_etops_coverage(_equator_columns(), [0, 1], [1, 0], limit_minutes=150)
+
+    assert np.all(coverage.is_covered())
+    assert len(coverage.uncovered_leg) == 0
+    assert coverage.worst_alternate_idx[0] in (0, 1, 2)
+
+
+def test_parallel_legs_match_serial(monkeypatch):
+    columns = _equator_columns()
+    origins, destinations = np.array([0, 1, 0, 3, 2]), np.array([1, 0, 3, 1, 3])
+    no_island = np.array([True, True, False, True])
+
+    serial = analyze_etops_coverage(columns, origins, destinations, 120, alternate_mask=no_island)
+    monkeypatch.setattr(etops, "ETOPS_LEGS_PER_TASK", 2)
+    parallel = analyze_etops_coverage(columns, origins, destinations, 120,
+                                      alternate_mask=no_island, workers=2)
+
+    assert np.allclose(parallel.max_diversion_minutes, serial.max_diversion_minutes)
+    assert np.array_equal(parallel.uncovered_leg, serial.uncovered_leg)
+
+
+def test_nearest_index_matches_brute_force():
+    rng = np.random.default_rng(3)
+    count = 500
+    columns = AirportColumns(
+        codes=np.array([f"A{i}" for i in range(count)]), names=np.array(["x"] * count),
+        cities=np.array(["x"] * count), country_ids=np.zeros(count, dtype=np.int32),
+        country_names=["T"], latitudes=rng.uniform(-80, 80, count),
+        longitudes=rng.uniform(-180, 180, count)
+    )
+    index = NearestAirportIndex(columns)
+    lat, lon = rng.uniform(-80, 80, 200), rng.uniform(-180, 180, 200)
+
+    nearest, miles = index.nearest(lat, lon)
+
+    brute = haversine_distance_array(lat[:, None], lon[:, None], columns.latitudes, columns.longitudes)
+    assert np.array_equal(nearest, np.argmin(brute, axis=1))
+    assert np.allclose(miles, brute.min(axis=1), atol=1e-6)
@@ -0,0 +1,55 @@
+"""Tests for the blocked global top-K route search."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+import services.global_top_k as global_top_k
+from services.geo_arrays import haversine_distance_array
+
+
+@pytest.fixture(scope="module")
+def columns():
+    rng = np.random.default_rng(11)
+    n = 1500
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    # A co-located pair (zero distance) and an exact antipodal pair
+    lat[10], lon[10] = lat[11], lon[11]
+    lat[20], lon[20] = -lat[21], lon[21] - 180 if lon[21] > 0 else lon[21] + 180
+    # A cluster of co-located airports larger than k, in one block
+    lat[100:160], lon[100:160] = 10.0, 20.0
+    codes = np.array([f"A{i:04d}" for i in range(n)])
+    return AirportColumns(codes, codes, codes, np.zeros(n, dtype=np.int32), ["X"], lat, lon)
+
+
+@pytest.mark.parametrize("largest", [True, False])
+def test_matches_brute_force_over_every_pair(columns, largest):
+    origin, dest = np.triu_indices(len(columns), k=1)
+    distance = haversine_distance_array(columns.latitudes[origin], columns.longitudes[origin],
+                                        columns.latitudes[dest], columns.longitudes[dest])
+    if not largest:
+        keep = distance > 0
+        origin, dest, distance = origin[keep], dest[keep], distance[keep]
+    expected = np.lexsort((dest, origin, -distance if largest else distance))[:40]
+
+    batch = global_top_k.global_top_k_routes(columns, 40, largest=largest, block_size=64)
+    assert np.array_equal(batch.origin_idx, origin[expected])
+    assert np.array_equal(batch.dest_idx, dest[expected])
+    assert np.array_equal(batch.distance_miles, distance[expected])
+    assert batch.route(0).distance_miles == round(float(distance[expected[0]]), 2)
+
+
+def test_prunes_block_pairs_and_handles_small_inputs(columns, monkeypatch):
+    screened = []
+    original = global_top_k.haversine_distance_array
+    monkeypatch.setattr(global_top_k, "haversine_distance_array",
+                        lambda *args: screened.append(len(args[0])) or original(*args))
+
+    global_top_k.global_top_k_routes(columns, 5, largest=False, block_size=64)
+    blocks = -(-len(columns) // 64)
+    assert len(screened) < blocks * (blocks + 1) // 2
+    assert sum(screened) < 20 * len(screened)
+
+    assert len(global_top_k.global_top_k_routes(columns, 0)) == 0
+    assert len(global_top_k.global_top_k_routes(columns.__class__(
+        columns.codes[:2], columns.names[:2], columns.cities[:2], columns.country_ids[:2],
+        ["X"], columns.latitudes[:2], columns.longitudes[:2]), 10)) == 1
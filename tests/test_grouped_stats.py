@@ -0,0 +1,67 @@
+"""Tests for grouped batch statistics."""
+import io
+from collections import defaultdict
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.batch_engine import compute_route_batch
+from services.batch_stream import process_route_stream
+from services.grouped_stats import GroupedPartial, group_route_batch
+from utils.file_io import save_grouped_csv, save_route_analysis
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return AirportColumns.from_airports(load_airport_database())
+
+
+@pytest.fixture(scope="module")
+def batch(columns):
+    origin, dest = np.nonzero(~np.eye(len(columns), dtype=bool))
+    return compute_route_batch(columns, origin, dest)
+
+
+def test_country_pair_groups_match_a_plain_loop(batch):
+    expected = defaultdict(list)
+    for route in batch:
+        expected[f"{route.origin.country} → {route.destination.country}"].append(route.distance_miles)
+
+    rows = {row['group']: row for row in group_route_batch(batch, "country_pair").get_rows()}
+    assert set(rows) == set(expected)
+    for label, distances in expected.items():
+        assert rows[label]['routes'] == len(distances)
+        assert rows[label]['total_distance_miles'] == pytest.approx(sum(distances))
+        assert rows[label]['longest_miles'] == max(distances)
+
+
+def test_partials_merge_like_one_pass(batch):
+    whole = group_route_batch(batch, "origin_country")
+    merged = GroupedPartial("origin_country")
+    for start in range(0, len(batch), 17):
+        part = group_route_batch(batch.take(slice(start, start + 17)), "origin_country")
+        merged.merge(GroupedPartial.from_dict(part.to_dict()))
+
+    for merged_row, whole_row in zip(merged.get_rows(), whole.get_rows()):
+        assert merged_row['group'] == whole_row['group']
+        assert merged_row['routes'] == whole_row['routes']
+        assert merged_row['shortest_miles'] == whole_row['shortest_miles']
+        assert merged_row['total_distance_miles'] == pytest.approx(whole_row['total_distance_miles'])
+    assert sum(r['routes'] for r in merged.get_rows()) == len(batch)
+    with pytest.raises(ValueError):
+        merged.merge(GroupedPartial("distance_band"))
+
+
+def test_distance_bands_in_band_order_from_a_stream(columns, tmp_path):
+    route_file = io.BytesIO(b"LAX,JFK\nJFK,LHR\nSYD,LHR\nCDG,FRA\nLHR,CDG\n")
+    bands = GroupedPartial("distance_band")
+    process_route_stream(route_file, columns, chunk_rows=2, grouped=[bands])
+
+    rows = bands.get_rows()
+    assert [row['group'] for row in rows] == ["0-500 mi", "2,000-3,000 mi", "3,000-4,500 mi", "8,000+ mi"]
+    assert [row['routes'] for row in rows] == [2, 1, 1, 1]
+
+    assert save_route_analysis(bands, str(tmp_path / "bands.txt"))
+    assert "ROUTES BY DISTANCE BAND" in (tmp_path / "bands.txt").read_text()
+    assert save_grouped_csv(bands, str(tmp_path / "bands.csv"))
+    assert len((tmp_path / "bands.csv").read_text().splitlines()) == len(rows) + 1
@@ -0,0 +1,106 @@
+"""Tests for batch request canonicalization and deduplication."""
+import numpy as np
+import pytest
+import services.batch_engine as batch_engine
+from main import analyze_batch_routes
+from models.airport import Airport
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.batch_engine import (
+    compute_canonical_batch,
+    compute_route_batch,
+    compute_route_batch_parallel
+)
+from services.pair_dedup import canonicalize_pairs
+from services.route_calculator import calculate_flight_route
+from services.shared_store import publish_airport_data
+
+
+@pytest.fixture(scope="module")
+def airports():
+    return load_airport_database()
+
+
+def test_canonicalize_merges_directions_and_drops_bad_rows(airports):
+    columns = AirportColumns.from_airports(airports)
+    pairs = [("lax", " JFK"), ("JFK", "LAX"), ("LAX", "JFK"), ("LAX", "LAX"),
+             ("XXX", "JFK"), ("LHR", "CDG")]
+
+    canonical = canonicalize_pairs(pairs, columns)
+
+    assert canonical.get_unique_count() == 2
+    assert canonical.get_kept_count() == 4
+    assert list(canonical.kept_rows) == [0, 1, 2, 5]
+    assert canonical.skipped_unknown == 1
+    assert canonical.skipped_same_airport == 1
+
+
+def test_scattered_results_match_per_route_calculation(airports):
+    columns = AirportColumns.from_airports(airports)
+    pairs = [("LAX", "JFK"), ("JFK", "LAX"), ("NRT", "LAX"), ("LAX", "NRT"), ("LAX", "JFK")]
+
+    batch = compute_canonical_batch(columns, canonicalize_pairs(pairs, columns))
+
+    for (origin, destination), route in zip(pairs, batch):
+        expected = calculate_flight_route(airports[origin], airports[destination])
+        assert route.origin.code == origin
+        assert route.destination.code == destination
+        assert route.distance_miles == expected.distance_miles
+        assert route.bearing_degrees == expected.bearing_degrees
+
+
+def test_parallel_path_matches_serial(monkeypatch):
+    # Enough airports that the unique pairs cross PARALLEL_CHUNK_SIZE
+    rng = np.random.default_rng(5)
+    count = 400
+    airports = {f"A{i:03d}": Airport(f"A{i:03d}", "Airport", "City", f"C{i % 7}",
+                                      np.degrees(np.arcsin(rng.uniform(-1, 1))), rng.uniform(-180, 180))
+                for i in range(count)}
+    codes = list(airports)
+    pairs = [(o, d) for o in codes for d in codes]
+    assert count * (count - 1) // 2 > batch_engine.PARALLEL_CHUNK_SIZE
+
+    pools = []
+    pool_class = batch_engine.ProcessPoolExecutor
+    monkeypatch.setattr(batch_engine, "ProcessPoolExecutor",
+                        lambda *args, **kwargs: pools.append(kwargs) or pool_class(*args, **kwargs))
+
+    serial = analyze_batch_routes(pairs, airports)
+    assert pools == []
+    parallel = analyze_batch_routes(pairs, airports, workers=2)
+    assert len(pools) == 1 and pools[0]['max_workers'] == 2
+    # Workers get a store directory to map, not a pickled copy of the columns
+    assert not any(isinstance(arg, AirportColumns) for arg in pools[0]['initargs'])
+
+    assert parallel.get_total_routes() == serial.get_total_routes() == count * (count - 1)
+    for name in ('origin_idx', 'dest_idx', 'distance_miles', 'bearing_degrees', 'flight_hours'):
+        assert np.array_equal(getattr(parallel.routes, name), getattr(serial.routes, name)), name
+    assert parallel.total_distance_miles == serial.total_distance_miles
+
+
+def test_process_pool_chunks_match_serial(airports):
+    columns = AirportColumns.from_airports(airports)
+    canonical = canonicalize_pairs([(o, d) for o in airports for d in airports], columns)
+
+    serial = compute_route_batch(columns, canonical.low_idx, canonical.high_idx)
+    pooled = compute_route_batch_parallel(columns, canonical.low_idx, canonical.high_idx,
+                                          workers=2, chunk_size=10)
+
+    assert pooled.columns is columns
+    assert np.array_equal(pooled.distance_miles, serial.distance_miles)
+
+
+def test_pool_workers_map_published_columns_when_they_match(airports, tmp_path, monkeypatch):
+    columns = AirportColumns.from_airports(airports)
+    monkeypatch.setattr(batch_engine, "SHARED_DATA_DIR", tmp_path / "shared")
+    monkeypatch.setattr(batch_engine, "_worker_state", {})
+    scratch = tmp_path / "scratch"
+
+    assert batch_engine._store_directory_for(columns, scratch) == scratch
+    publish_airport_data(airports, tmp_path / "shared", include_distance_matrix=False)
+    assert batch_engine._store_directory_for(columns, scratch) == tmp_path / "shared"
+
+    batch_engine._init_worker(str(scratch), None, None)
+    mapped = batch_engine._worker_state['columns']
+    assert isinstance(mapped.latitudes, np.memmap)
+    assert np.array_equal(mapped.latitudes, columns.latitudes)
@@ -0,0 +1,49 @@
+"""Tests for bulk report archives."""
+import tarfile
+import zipfile
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.batch_engine import compute_route_batch
+from services.report_archive import write_report_archive
+from utils.file_io import save_route_analysis
+
+
+@pytest.fixture(scope="module")
+def batch():
+    columns = AirportColumns.from_airports(load_airport_database())
+    origin, dest = np.nonzero(~np.eye(len(columns), dtype=bool))
+    return compute_route_batch(columns, origin, dest)
+
+
+def _without_timestamp(text):
+    return [line for line in text.splitlines() if not line.startswith("Generated:")]
+
+
+def test_zip_reports_match_save_route_analysis(batch, tmp_path):
+    archive = tmp_path / "reports.zip"
+    assert write_report_archive(batch, archive, workers=2, chunk_size=7) == len(batch)
+
+    with zipfile.ZipFile(archive) as reports:
+        names = reports.namelist()
+        assert len(names) == len(batch)
+        route = batch[13]
+        save_route_analysis(route, str(tmp_path / "single.txt"))
+        text = reports.read(f"000013_route_{route.origin.code}_to_{route.destination.code}.txt").decode()
+    assert _without_timestamp(text) == _without_timestamp((tmp_path / "single.txt").read_text())
+
+
+def test_tar_and_sharded_directory_output(batch, tmp_path, monkeypatch):
+    assert write_report_archive(batch, tmp_path / "reports.tar.gz", archive_format="tar") == len(batch)
+    with tarfile.open(tmp_path / "reports.tar.gz") as reports:
+        assert len(reports.getnames()) == len(batch)
+
+    monkeypatch.setattr("services.report_archive.REPORTS_PER_SHARD_DIR", 40)
+    progress = []
+    write_report_archive(batch, tmp_path / "reports", archive_format="dir", chunk_size=25,
+                         progress_callback=lambda done, total: progress.append(done))
+    shards = sorted(p.name for p in (tmp_path / "reports").iterdir())
+    assert shards == ["shard_0000", "shard_0001", "shard_0002"]
+    assert sum(len(list(p.iterdir())) for p in (tmp_path / "reports").iterdir()) == len(batch)
+    assert progress == [25, 50, 75, 90]
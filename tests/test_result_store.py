@@ -0,0 +1,89 @@
+"""Tests for the persistent route result store."""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.aircraft_performance import load_aircraft_profiles
+from services.airport_loader import load_airport_database
+from services.batch_engine import compute_canonical_batch, compute_route_batch
+from services.pair_dedup import canonicalize_pairs
+from services.result_store import RouteResultStore
+
+PAIRS = [("LAX", "JFK"), ("JFK", "LAX"), ("SYD", "LHR"), ("NRT", "DXB"), ("CDG", "ORD")]
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return AirportColumns.from_airports(load_airport_database())
+
+
+def _assert_same(a, b):
+    for name in ('origin_idx', 'dest_idx', 'distance_miles', 'bearing_degrees',
+                 'flight_hours', 'block_hours', 'fuel_burn_kg'):
+        left, right = getattr(a, name), getattr(b, name)
+        assert (left is None and right is None) or np.array_equal(left, right)
+
+
+@pytest.mark.parametrize("aircraft_type", [None, "B789"])
+def test_stored_results_match_fresh_computation(columns, tmp_path, aircraft_type):
+    aircraft = load_aircraft_profiles()[aircraft_type] if aircraft_type else None
+    store = RouteResultStore(tmp_path / "results.sqlite")
+    canonical = canonicalize_pairs(PAIRS, columns)
+    fresh = compute_canonical_batch(columns, canonical, aircraft=aircraft)
+
+    first = compute_canonical_batch(columns, canonical, aircraft=aircraft, store=store)
+    assert store.get_row_count() == canonical.get_unique_count()
+
+    calls = []
+    hit, _ = store.get_routes(columns, canonical.low_idx, canonical.high_idx, aircraft)
+    assert hit.all()
+    second = store.read_through(columns, canonical.low_idx, canonical.high_idx, aircraft,
+                                lambda o, d: calls.append(len(o)))
+    assert not calls
+    _assert_same(first, fresh)
+    _assert_same(second, compute_route_batch(columns, canonical.low_idx, canonical.high_idx, aircraft))
+
+
+def test_moved_airport_and_other_model_miss(columns, tmp_path):
+    store = RouteResultStore(tmp_path / "results.sqlite")
+    canonical = canonicalize_pairs(PAIRS, columns)
+    compute_canonical_batch(columns, canonical, store=store)
+
+    hit, _ = store.get_routes(columns, canonical.low_idx, canonical.high_idx,
+                              load_aircraft_profiles()["A320"])
+    assert not hit.any()
+
+    airports = load_airport_database()
+    airports["LAX"].latitude += 0.5
+    moved = AirportColumns.from_airports(airports)
+    hit, _ = store.get_routes(moved, canonical.low_idx, canonical.high_idx)
+    lax = moved.index_of("LAX")
+    assert np.array_equal(hit, (canonical.low_idx != lax) & (canonical.high_idx != lax))
+
+
+def test_prune_keeps_newest_rows(columns, tmp_path):
+    store = RouteResultStore(tmp_path / "results.sqlite", max_rows=3)
+    origin, dest = np.triu_indices(len(columns), k=1)
+    store.put_routes(compute_route_batch(columns, origin[:5], dest[:5]))
+    assert store.get_row_count() == 3
+    hit, _ = store.get_routes(columns, origin[:5], dest[:5])
+    assert hit.tolist() == [False, False, True, True, True]
+
+
+def _write_from_process(args):
+    path, start = args
+    columns = AirportColumns.from_airports(load_airport_database())
+    origin, dest = np.triu_indices(len(columns), k=1)
+    store = RouteResultStore(path)
+    for offset in range(0, 20, 4):
+        rows = slice(start + offset, start + offset + 4)
+        store.read_through(columns, origin[rows], dest[rows], None,
+                           lambda o, d: compute_route_batch(columns, o, d))
+    return store.get_row_count()
+
+
+def test_concurrent_processes_share_one_store(tmp_path):
+    path = tmp_path / "results.sqlite"
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        list(pool.map(_write_from_process, [(path, 0), (path, 10), (path, 20)]))
+    assert RouteResultStore(path).get_row_count() == 40
@@ -0,0 +1,68 @@
+"""Tests for the RouteBatch container and batch engine."""
+import numpy as np
+import pytest
+from main import analyze_batch_routes, POPULAR_ROUTES
+from models.airport_columns import AirportColumns
+from models.route_batch import RouteBatch
+from services.airport_loader import load_airport_database
+from services.batch_engine import compute_route_batch
+from services.route_calculator import calculate_flight_route
+
+
+@pytest.fixture(scope="module")
+def airports():
+    return load_airport_database()
+
+
+@pytest.fixture(scope="module")
+def batch(airports):
+    columns = AirportColumns.from_airports(airports)
+    codes = sorted(airports)
+    pairs = [(o, d) for o in codes for d in codes if o != d]
+    origin_idx = [columns.index_of(o) for o, _ in pairs]
+    dest_idx = [columns.index_of(d) for _, d in pairs]
+    return compute_route_batch(columns, origin_idx, dest_idx)
+
+
+def test_materialized_routes_match_scalar_path(airports, batch):
+    for i in range(0, len(batch), 7):
+        route = batch[i]
+        expected = calculate_flight_route(route.origin, route.destination)
+        assert route.distance_miles == expected.distance_miles
+        assert route.distance_km == expected.distance_km
+        assert route.distance_nautical_miles == expected.distance_nautical_miles
+        assert route.bearing_degrees == expected.bearing_degrees
+        assert route.compass_direction == expected.compass_direction
+        assert route.estimated_flight_hours == pytest.approx(expected.estimated_flight_hours)
+
+
+def test_slicing_filtering_and_sorting_stay_compact(batch):
+    assert isinstance(batch[:5], RouteBatch)
+    assert len(batch[:5]) == 5
+
+    long_haul = batch.filter(batch.distance_miles > 5000)
+    assert len(long_haul) > 0
+    assert np.all(long_haul.distance_miles > 5000)
+
+    ordered = batch.sort_by('distance_miles', descending=True)
+    assert np.all(np.diff(ordered.distance_miles) <= 0)
+
+
+def test_top_k_matches_full_sort(batch):
+    top = batch.top_k(5)
+    expected = np.sort(batch.distance_miles)[::-1][:5]
+    assert np.array_equal(top.distance_miles, expected)
+    shortest = batch.top_k(3, largest=False)
+    assert shortest.distance_miles[0] == batch.distance_miles.min()
+
+
+def test_memory_per_route_is_tens_of_bytes(batch):
+    assert batch.get_nbytes() / len(batch) <= 32
+
+
+def test_analyze_batch_routes_uses_route_batch(airports):
+    analysis = analyze_batch_routes(POPULAR_ROUTES, airports)
+    assert isinstance(analysis.routes, RouteBatch)
+    assert analysis.get_total_routes() == len(POPULAR_ROUTES)
+    assert analysis.longest_route.origin.code == "SYD"
+    assert analysis.shortest_route.origin.code == "LAX"
@@ -0,0 +1,102 @@
+"""Tests for slicing the precomputed distance matrix in the route explorer."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.route_explorer import RouteQuery, airport_mask, distance_histogram, select_routes
+from services.shared_store import fill_distance_matrix
+
+
+@pytest.fixture(scope="module")
+def explorer():
+    columns = AirportColumns.from_airports(load_airport_database())
+    matrix = fill_distance_matrix(columns, np.zeros((len(columns), len(columns)), dtype=np.float32))
+    return columns, matrix
+
+
+def test_all_pairs_one_direction(explorer):
+    columns, matrix = explorer
+    everywhere = airport_mask(columns)
+
+    one_way = select_routes(columns, matrix, everywhere, everywhere)
+    both_ways = select_routes(columns, matrix, everywhere, everywhere, one_direction=False)
+
+    n = len(columns)
+    assert len(one_way) == n * (n - 1) // 2
+    assert len(both_ways) == n * (n - 1)
+
+
+def test_region_filter_and_distance_range(explorer):
+    columns, matrix = explorer
+    usa = airport_mask(columns, countries=["USA"])
+    europe = airport_mask(columns, regions=["Europe"])
+
+    selection = select_routes(columns, matrix, usa, europe, min_miles=3500)
+
+    rows = selection.to_rows()
+    assert rows
+    assert all(row["Origin Country"] == "USA" for row in rows)
+    assert all(row["Destination Country"] in ("UK", "France", "Germany") for row in rows)
+    assert all(row["Distance (mi)"] >= 3500 for row in rows)
+
+
+def test_sorting_paging_and_leaderboard(explorer):
+    columns, matrix = explorer
+    everywhere = airport_mask(columns)
+    selection = select_routes(columns, matrix, everywhere, everywhere)
+
+    ordered = selection.page(0, len(selection), "distance", descending=True)
+    assert np.all(np.diff(ordered.distance_miles) <= 0)
+    assert len(selection.page(1, 10)) == 10
+    assert selection.page(0, 10, descending=True).distance_miles[0] == selection.top_k(1).distance_miles[0]
+
+    counts, _ = distance_histogram(selection, bins=5)
+    assert counts.sum() == len(selection)
+
+
+@pytest.mark.parametrize("one_direction", [True, False])
+def test_lazy_pages_match_sorting_the_full_selection(explorer, one_direction):
+    columns, matrix = explorer
+    usa_europe = airport_mask(columns, countries=["USA"], regions=["Europe"])
+    # Two matrix rows per block, so pages span and skip blocks
+    query = RouteQuery(columns, matrix, usa_europe, airport_mask(columns), min_miles=500,
+                       one_direction=one_direction, block_cells=2 * len(columns))
+    full = query.materialize()
+    assert len(full) == len(query) > 10
+
+    for field in ("distance", "origin", "destination"):
+        for descending in (False, True):
+            expected = full.sort_by(field, descending=descending)
+            for page_number in range(3):
+                page = query.page(page_number, 7, field, descending)
+                want = expected.page(page_number, 7)
+                assert np.array_equal(page.distance_miles, want.distance_miles)
+                if field != "distance":
+                    assert np.array_equal(page.origin_idx if field == "origin" else page.dest_idx,
+                                          want.origin_idx if field == "origin" else want.dest_idx)
+
+    counts, edges = query.histogram(6)
+    assert np.array_equal(counts, np.histogram(full.distance_miles, bins=6)[0])
+    assert np.array_equal(query.top_k(3, longest=False).distance_miles,
+                          np.sort(full.distance_miles)[:3])
+
+
+def test_distance_pages_reuse_the_kept_best_routes(explorer, monkeypatch):
+    columns, matrix = explorer
+    everywhere = airport_mask(columns)
+    query = RouteQuery(columns, matrix, everywhere, everywhere, block_cells=2 * len(columns))
+    expected = query.materialize().sort_by("distance", descending=True)
+    block_count = len(query._blocks(False))
+
+    reads = []
+    matches = query._matches
+    monkeypatch.setattr(query, "_matches", lambda *args: reads.append(args) or matches(*args))
+    pages = [query.page(page_number, 4, "distance", descending=True) for page_number in range(8)]
+
+    # One pass to count, then pages 0..7 need 4, 8, 12 ... 32 routes: scans
+    # for 4, 8, 16 and 32
+    assert len(reads) == 5 * block_count
+    for page_number, page in enumerate(pages):
+        assert np.array_equal(page.distance_miles, expected.page(page_number, 4).distance_miles)
+    query.page(2, 4, "distance", descending=True)
+    assert len(reads) == 5 * block_count
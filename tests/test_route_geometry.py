@@ -0,0 +1,57 @@
+"""Tests for route corridor queries."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.geo_arrays import haversine_distance_array, sample_great_circle
+from services.route_geometry import airports_along_route, corridor_query
+
+
+def _random_columns(count, seed=7):
+    rng = np.random.default_rng(seed)
+    return AirportColumns(
+        codes=np.array([f"A{i:04d}" for i in range(count)]),
+        names=np.array(["Test"] * count),
+        cities=np.array(["Test"] * count),
+        country_ids=np.zeros(count, dtype=np.int32),
+        country_names=["Testland"],
+        latitudes=np.degrees(np.arcsin(rng.uniform(-1, 1, count))),
+        longitudes=rng.uniform(-180, 180, count)
+    )
+
+
+def test_corridor_matches_brute_force_sampling():
+    columns = _random_columns(3000)
+    origins, destinations = np.array([0, 1, 2]), np.array([10, 11, 12])
+
+    result = corridor_query(columns, origins, destinations, max_miles=300)
+
+    for route in range(3):
+        lat, lon = sample_great_circle(columns.latitudes[origins[route]], columns.longitudes[origins[route]],
+                                       columns.latitudes[destinations[route]], columns.longitudes[destinations[route]],
+                                       4000)
+        nearest = haversine_distance_array(columns.latitudes[:, None], columns.longitudes[:, None],
+                                           lat, lon).min(axis=1)
+        expected = set(np.flatnonzero(nearest <= 300)) - {origins[route], destinations[route]}
+        found, along, _ = result.for_route(route)
+
+        borderline = set(np.flatnonzero(np.abs(nearest - 300) < 2))
+        assert set(found) ^ expected <= borderline
+        assert np.all(np.diff(along) >= 0)
+
+
+def test_airports_along_route_reports_midway_airport():
+    airports = load_airport_database()
+    corridor = airports_along_route(airports, "LAX", "LHR", max_miles=1000)
+
+    codes = [airport.code for airport, _, _ in corridor]
+    assert "ORD" in codes
+    assert "LAX" not in codes and "LHR" not in codes
+    _, along, cross = corridor[codes.index("ORD")]
+    assert 0 < along < 5456
+    assert 0 < -cross <= 1000  # south of the polar track
+
+
+def test_unknown_code_raises():
+    with pytest.raises(ValueError):
+        airports_along_route(load_airport_database(), "LAX", "ZZZ", 100)
@@ -0,0 +1,78 @@
+"""Tests for flight schedule ingestion and schedule totals."""
+import io
+from datetime import date
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.schedule import (count_operating_days, load_schedule, parse_day_mask,
+                               summarize_schedule, weekday_of)
+
+SCHEDULE_CSV = b"""Flight_No,Origin,Destination,Days,Valid_From,Valid_To
+ab1,AAA,BBB,1234567,2025-01-01,2025-01-28
+AB2,BBB,AAA,1.3.5..,2025-01-06,2025-01-19
+AB3,AAA,CCC,......7,2025-01-01,2025-01-28
+XX9,AAA,ZZZ,1234567,2025-01-01,2025-01-28
+XX8,AAA,AAA,1234567,2025-01-01,2025-01-28
+XX7,AAA,BBB,,2025-01-01,2025-01-28
+XX6,AAA,BBB,1,2025-02-01,2025-01-01
+"""
+
+
+@pytest.fixture(scope="module")
+def columns():
+    lat = np.array([0.0, 0.0, 10.0])
+    lon = np.array([0.0, 10.0, 0.0])
+    codes = np.array(["AAA", "BBB", "CCC"])
+    return AirportColumns(codes, codes, codes, np.array([0, 1, 1], dtype=np.int32), ["P", "Q"], lat, lon)
+
+
+def test_operating_days_match_day_by_day_count():
+    rng = np.random.default_rng(3)
+    masks = rng.integers(1, 128, 500)
+    first = np.datetime64("2024-12-01") + rng.integers(0, 60, 500)
+    last = first + rng.integers(-5, 120, 500)
+    expected = [sum(1 for day in np.arange(a, b + 1) if mask >> int(weekday_of(day)) & 1)
+                for mask, a, b in zip(masks, first, last)]
+    assert np.array_equal(count_operating_days(masks, first, last), expected)
+    assert parse_day_mask("1.3.5..") == parse_day_mask(" 135") == 0b10101
+    assert weekday_of(np.datetime64("2025-01-06")) == 0   # a Monday
+
+
+def test_load_skips_invalid_rows_and_expands_legs_lazily(columns):
+    schedule = load_schedule(io.BytesIO(SCHEDULE_CSV), columns, chunk_rows=3)
+    assert list(schedule.flight_numbers) == ["AB1", "AB2", "AB3"]
+    assert schedule.skipped == {"unknown_airport": 1, "same_airport": 1, "invalid_days_or_dates": 2}
+    assert list(schedule.operating_days()) == [28, 6, 4]
+
+    legs = list(schedule.iter_legs(period_end="2025-01-12"))
+    assert len(legs) == 12 + 3 + 2
+    ab2 = [leg[3] for leg in legs if leg[0] == "AB2"]
+    assert ab2 == [date(2025, 1, 6), date(2025, 1, 8), date(2025, 1, 10)]
+    assert all(day.weekday() == 6 for flight, _, _, day in legs if flight == "AB3")
+
+
+def test_summary_weights_pair_metrics_by_legs(columns):
+    schedule = load_schedule(io.BytesIO(SCHEDULE_CSV), columns)
+    summary = summarize_schedule(schedule)
+    assert summary.unique_pairs == 2 and summary.total_legs == 38 and summary.get_weeks() == 4.0
+
+    rows = {row['label']: row for row in summary.get_rows()}
+    assert rows['AB1']['weekly_legs'] == 7.0
+    assert rows['AB1']['distance_miles'] == pytest.approx(28 * rows['AB2']['distance_miles'] / 6)
+    assert rows['AB1']['block_hours'] is None
+
+    pairs = {row['label']: row for row in summary.get_rows("country_pair")}
+    assert pairs['P → Q']['legs'] == 32 and pairs['Q → P']['legs'] == 6
+    totals = summary.get_totals()
+    assert totals['distance_miles'] == pytest.approx(sum(row['distance_miles'] for row in pairs.values()))
+
+    january = summarize_schedule(schedule, period_start="2025-01-06", period_end="2025-01-12")
+    assert january.total_legs == 7 + 3 + 1
+    with pytest.raises(ValueError):
+        summary.get_rows("origin_region")
+
+    assert [row['label'] for row in summary.get_rows(sort_by="label")] == ['AB1', 'AB2', 'AB3']
+    assert [row['legs'] for row in summary.get_rows(sort_by="legs")] == [28, 6, 4]
+    assert len(summary.get_rows(sort_by="weekly_block_hours")) == 3
+    with pytest.raises(ValueError):
+        summary.get_rows(sort_by="airline")
@@ -0,0 +1,63 @@
+"""Tests for screened threshold and top-k distance queries."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.distance_calculator import haversine_distance
+from services.screening import chord_distance_array, top_k_by_distance, within_distance
+from services.geo_arrays import haversine_distance_array, unit_vectors
+
+
+@pytest.fixture(scope="module")
+def columns():
+    rng = np.random.default_rng(7)
+    n = 400
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    codes = np.array([f"A{i:03d}" for i in range(n)])
+    return AirportColumns(codes, codes, codes, np.zeros(n, dtype=np.int32), ["X"], lat, lon)
+
+
+@pytest.fixture(scope="module")
+def pairs(columns):
+    origin, dest = np.triu_indices(len(columns), k=1)
+    return origin, dest
+
+
+def _exact(columns, origin, dest, unit='miles'):
+    lat, lon = columns.latitudes, columns.longitudes
+    return np.array([haversine_distance((lat[o], lon[o]), (lat[d], lon[d]), unit)
+                     for o, d in zip(origin, dest)])
+
+
+@pytest.mark.parametrize("unit", ["miles", "nautical_miles"])
+def test_threshold_matches_exact_including_boundary_pairs(columns, pairs, unit):
+    origin, dest = pairs
+    exact = _exact(columns, origin, dest, unit)
+    # Cut-offs equal to real pair distances put pairs exactly on the boundary
+    for max_distance in [3000.0, float(exact[123]), float(exact[4567]) - 0.01, 0.0]:
+        assert np.array_equal(within_distance(columns, origin, dest, max_distance, unit),
+                              exact <= max_distance)
+
+
+@pytest.mark.parametrize("largest", [True, False])
+def test_top_k_matches_exact_sort(columns, pairs, largest):
+    origin, dest = pairs
+    exact = _exact(columns, origin, dest)
+    positions = np.arange(len(exact))
+    expected = np.lexsort((positions, -exact if largest else exact))[:100]
+
+    found, distances = top_k_by_distance(columns, origin, dest, 100, largest=largest)
+    assert np.array_equal(found, expected)
+    assert np.array_equal(distances, exact[expected])
+
+
+def test_chord_error_stays_within_documented_bound(columns, pairs):
+    origin, dest = pairs
+    vectors = unit_vectors(columns.latitudes, columns.longitudes)
+    chord = chord_distance_array(vectors[origin], vectors[dest])
+    arc = haversine_distance_array(columns.latitudes[origin], columns.longitudes[origin],
+                                   columns.latitudes[dest], columns.longitudes[dest])
+    assert np.all(chord <= arc + 1e-6)
+    assert np.all(chord >= arc * 2 / np.pi - 1e-6)
+    short = arc < 1500
+    assert np.all((arc[short] - chord[short]) / arc[short] < 0.007)
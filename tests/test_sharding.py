@@ -0,0 +1,96 @@
+"""Tests for sharded jobs run by independent worker processes."""
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from main import analyze_batch_routes
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services import sharding
+from services.batch_engine import BatchPartial, compute_route_batch
+from services.shared_store import fill_distance_matrix
+from services.sharding import merge_shards, pending_shards, plan_shards, run_shard
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def airports():
+    return load_airport_database()
+
+
+@pytest.fixture(scope="module")
+def columns(airports):
+    return AirportColumns.from_airports(airports)
+
+
+def _run_workers(job_dir, shard_ids):
+    # Each shard runs in its own interpreter, as it would on another machine
+    workers = [subprocess.Popen([sys.executable, "main.py", "shard", "run", str(job_dir), str(i)],
+                                cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+               for i in shard_ids]
+    assert all(worker.wait(timeout=120) == 0 for worker in workers)
+
+
+def test_all_pairs_shards_merge_into_full_matrix(columns, tmp_path):
+    shards = plan_shards(columns, tmp_path, 3, kind="all_pairs")
+    with pytest.raises(ValueError):
+        merge_shards(tmp_path, columns)
+
+    _run_workers(tmp_path, [s["id"] for s in shards])
+    merged = merge_shards(tmp_path, columns)
+
+    n = len(columns)
+    expected = fill_distance_matrix(columns, np.zeros((n, n), dtype=np.float32))
+    assert np.array_equal(np.load(tmp_path / "distance_matrix.npy"), expected)
+    assert merged.route_count == n * (n - 1) // 2
+
+
+def test_batch_shards_match_single_process_analysis(airports, columns, tmp_path):
+    pairs = [("LAX", "JFK"), ("jfk", "lax"), ("SYD", "LHR"), ("XXX", "JFK"),
+             ("CDG", "CDG"), ("NRT", "DXB"), ("DXB", "NRT"), ("ORD", "LAX")]
+    route_file = tmp_path / "routes.csv"
+    route_file.write_text("origin,destination\n" + "".join(f"{o},{d}\n" for o, d in pairs))
+
+    plan_shards(columns, tmp_path, 4, kind="batch", route_file=route_file)
+    _run_workers(tmp_path, [0, 2])
+    assert pending_shards(tmp_path) == [1, 3]
+    _run_workers(tmp_path, [1, 3])
+
+    merged = merge_shards(tmp_path, columns)
+    expected = analyze_batch_routes(pairs, airports)
+    analysis = merged.to_batch_analysis(columns)
+
+    assert merged.request_rows == len(pairs)
+    assert merged.skipped_unknown == 1 and merged.skipped_same_airport == 1
+    assert analysis.get_total_routes() == expected.get_total_routes()
+    assert analysis.total_distance_miles == pytest.approx(expected.total_distance_miles)
+    assert analysis.longest_route.origin.code == expected.longest_route.origin.code
+    assert len((tmp_path / "results.csv").read_text().splitlines()) == expected.get_total_routes() + 1
+
+
+def test_all_pairs_summary_runs_in_bounded_batches(tmp_path, monkeypatch):
+    rng = np.random.default_rng(3)
+    n = 700
+    codes = np.array([f"A{i:03d}" for i in range(n)])
+    columns = AirportColumns(codes, codes, codes, np.zeros(n, dtype=np.int32), ["X"],
+                             rng.uniform(-80, 80, n), rng.uniform(-180, 180, n))
+    batch_sizes = []
+
+    def recording_batch(*args, **kwargs):
+        batch = compute_route_batch(*args, **kwargs)
+        batch_sizes.append(len(batch))
+        return batch
+
+    monkeypatch.setattr(sharding, "ALL_PAIRS_SUMMARY_PAIRS", 5000)
+    monkeypatch.setattr(sharding, "compute_route_batch", recording_batch)
+    plan_shards(columns, tmp_path, 2, kind="all_pairs")
+    merged = run_shard(tmp_path, 0, columns).merge(run_shard(tmp_path, 1, columns))
+
+    low, high = np.triu_indices(n, k=1)
+    expected = BatchPartial().add_batch(compute_route_batch(columns, low, high))
+    assert max(batch_sizes) <= 5000 and sum(batch_sizes) == n * (n - 1) // 2
+    assert merged.route_count == expected.route_count
+    assert merged.total_distance_miles == pytest.approx(expected.total_distance_miles)
+    assert merged.longest == expected.longest and merged.shortest == expected.shortest
@@ -0,0 +1,51 @@
+"""Tests for memory-mapped shared airport data."""
+import numpy as np
+import pytest
+from models.airport import Airport
+from services.distance_calculator import haversine_distance
+from services.shared_store import (
+    attach_airport_data,
+    attach_or_publish,
+    publish_airport_data,
+    prune_generations
+)
+
+
+def _airports():
+    return {
+        "LAX": Airport("LAX", "Los Angeles International", "Los Angeles", "USA", 33.9425, -118.4081),
+        "JFK": Airport("JFK", "John F. Kennedy International", "New York", "USA", 40.6413, -73.7781),
+        "LHR": Airport("LHR", "London Heathrow", "London", "UK", 51.4700, -0.4543),
+    }
+
+
+def test_publish_and_attach_read_only(tmp_path):
+    publish_airport_data(_airports(), tmp_path)
+    shared = attach_airport_data(tmp_path)
+
+    columns = shared.columns
+    assert list(columns.codes) == ["JFK", "LAX", "LHR"]
+    assert columns.country_of(columns.index_of("LHR")) == "UK"
+    assert isinstance(shared.distance_matrix, np.memmap)
+    assert not shared.distance_matrix.flags.writeable
+
+    lax, jfk = columns.index_of("LAX"), columns.index_of("JFK")
+    expected = haversine_distance((33.9425, -118.4081), (40.6413, -73.7781))
+    assert shared.distance_matrix[lax, jfk] == pytest.approx(expected, abs=0.01)
+    assert shared.distance_matrix[lax, lax] == 0.0
+
+
+def test_attach_without_publish_returns_none(tmp_path):
+    assert attach_airport_data(tmp_path) is None
+
+
+def test_changed_coordinates_publish_new_generation(tmp_path):
+    airports = _airports()
+    first = attach_or_publish(airports, tmp_path)
+
+    airports["LHR"] = Airport("LHR", "London Heathrow", "London", "UK", 51.0, 0.0)
+    second = attach_or_publish(airports, tmp_path)
+
+    assert second.fingerprint != first.fingerprint
+    assert prune_generations(tmp_path) == 1
+    assert attach_airport_data(tmp_path).fingerprint == second.fingerprint
@@ -0,0 +1,36 @@
+"""Tests for the nearest-airport index and its candidate grid."""
+import numpy as np
+from models.airport_columns import AirportColumns
+from services.geo_arrays import haversine_distance_array, unit_vectors
+from services.spatial_index import GRID_QUERY_THRESHOLD, NearestAirportIndex
+
+
+def test_grid_matches_scan_including_poles_and_antimeridian():
+    rng = np.random.default_rng(8)
+    n = 3000
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    # Airports hugging the poles and both sides of the antimeridian
+    lat[:20], lon[:20] = rng.uniform(88.0, 90.0, 20), rng.uniform(-180, 180, 20)
+    lat[20:40], lon[20:40] = rng.uniform(-90.0, -88.0, 20), rng.uniform(-180, 180, 20)
+    lat[40:80], lon[40:80] = rng.uniform(-60, 60, 40), np.r_[rng.uniform(179.0, 180.0, 20),
+                                                             rng.uniform(-180.0, -179.0, 20)]
+    codes = np.array([f"A{i:04d}" for i in range(n)])
+    columns = AirportColumns(codes, codes, codes, np.zeros(n, dtype=np.int32), ["X"], lat, lon)
+    # A subset index, so airport_idx differs from the vector positions
+    index = NearestAirportIndex(columns, mask=np.arange(n) % 3 != 1, cell_degrees=2.0)
+
+    q = GRID_QUERY_THRESHOLD + 5000
+    query_lat = np.degrees(np.arcsin(rng.uniform(-1, 1, q)))
+    query_lon = rng.uniform(-180, 180, q)
+    query_lat[:2000] = rng.uniform(89.0, 90.0, 2000) * rng.choice([-1, 1], 2000)
+    query_lon[2000:4000] = rng.choice([-1, 1], 2000) * rng.uniform(179.9, 180.0, 2000)
+    query_lat[4000:4002], query_lon[4000:4002] = [90.0, -90.0], [0.0, 180.0]
+
+    nearest, miles = index.nearest(query_lat, query_lon)
+    assert index._grid is not None
+
+    scan = index.airport_idx[index._nearest_by_scan(unit_vectors(query_lat, query_lon))]
+    scan_miles = haversine_distance_array(query_lat, query_lon, lat[scan], lon[scan])
+    assert np.array_equal(nearest, scan)
+    assert np.allclose(miles, scan_miles, atol=1e-6)
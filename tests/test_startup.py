@@ -0,0 +1,18 @@
+"""Tests for the lazy-import entry point and startup profiling."""
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_route_command_skips_numpy_and_profiles_to_stderr():
+    script = ("import sys, runpy; sys.argv = ['main.py', '--profile-startup', 'route', 'LAX', 'JFK', "
+              "'--brief']\ntry:\n    runpy.run_path('main.py', run_name='__main__')\n"
+              "except SystemExit as exit:\n    assert not exit.code\n"
+              "print('numpy' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    route_line, numpy_loaded = result.stdout.strip().splitlines()
+    assert route_line.split("\t")[:2] == ["LAX", "JFK"] and numpy_loaded == "False"
+    assert "STARTUP PROFILE" in result.stderr and "services.route_calculator" in result.stderr
@@ -0,0 +1,44 @@
+"""Tests for bulk airport-code validation."""
+import numpy as np
+import pytest
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airport_database
+from services.pair_dedup import canonicalize_codes
+from services.validation import validate_route_codes
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return AirportColumns.from_airports(load_airport_database())
+
+
+def test_reasons_counts_and_samples(columns):
+    origins = ["LAX", " jfk", "XXX", "LHR", "YYY", "cdg "]
+    dests = ["JFK", "lax", "JFK", "ZZZ", "QQQ", "CDG"]
+    report = validate_route_codes(origins, dests, columns)
+
+    assert report.valid.tolist() == [True, True, False, False, False, False]
+    assert report.get_error_counts() == {"unknown_origin": 2, "unknown_destination": 2, "same_airport": 1}
+    assert report.get_unknown_count() == 3
+    assert report.samples["unknown_origin"] == [(2, "XXX", "JFK"), (4, "YYY", "QQQ")]
+    assert report.samples["same_airport"] == [(5, "cdg ", "CDG")]
+    assert columns.codes[report.origin_idx[1]] == "JFK"
+
+
+def test_million_rows_match_scalar_lookups_quietly(columns, capsys):
+    rng = np.random.default_rng(1)
+    codes = np.append(columns.codes, ["BAD", " lax"])
+    origins = codes[rng.integers(0, len(codes), 1000000)]
+    dests = codes[rng.integers(0, len(codes), 1000000)]
+
+    canonical = canonicalize_codes(origins, dests, columns)
+
+    # Same answers as looking each normalized code up one by one
+    lookup = {str(code): i for i, code in enumerate(columns.codes)}
+    scalar = lambda values: [lookup.get(str(code).strip().upper(), -1) for code in values]
+    assert np.array_equal(canonical.validation.origin_idx, scalar(origins))
+    assert np.array_equal(canonical.validation.dest_idx, scalar(dests))
+    assert canonical.skipped_unknown == np.count_nonzero((origins == "BAD") | (dests == "BAD"))
+    assert canonical.get_kept_count() + canonical.skipped_unknown + \
+        canonical.skipped_same_airport == len(origins)
+    assert capsys.readouterr().out == ""
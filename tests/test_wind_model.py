@@ -0,0 +1,60 @@
+"""Tests for wind-corrected flight time estimation."""
+import numpy as np
+import pytest
+from models.airport import Airport
+from services.route_calculator import calculate_flight_route, AVERAGE_CRUISE_SPEED_MPH
+from services.wind_model import WindField, load_wind_field
+
+
+def _uniform_field(u_mph, v_mph=0.0):
+    """Build a global wind field with constant components at two flight levels."""
+    latitudes = np.arange(-90.0, 90.1, 10.0)
+    longitudes = np.arange(-180.0, 180.0, 10.0)
+    levels = np.array([300.0, 400.0])
+    shape = (len(levels), len(latitudes), len(longitudes))
+    return WindField(latitudes, longitudes, levels,
+                     np.full(shape, u_mph), np.full(shape, v_mph))
+
+
+def test_calm_field_matches_still_air_estimate():
+    """With no wind, integrated time equals distance / cruise speed."""
+    lax = Airport("LAX", "Los Angeles International", "Los Angeles", "USA", 33.9425, -118.4081)
+    jfk = Airport("JFK", "John F. Kennedy International", "New York", "USA", 40.6413, -73.7781)
+
+    still = calculate_flight_route(lax, jfk)
+    calm = calculate_flight_route(lax, jfk, wind_field=_uniform_field(0.0))
+
+    assert abs(calm.estimated_flight_hours - still.estimated_flight_hours) < 0.01
+
+
+def test_tailwind_and_headwind_along_equator():
+    """An eastbound flight gains time in a westerly wind; westbound loses it."""
+    field = _uniform_field(100.0)
+    hours = field.estimate_flight_hours([0.0, 0.0], [0.0, 20.0], [0.0, 0.0], [20.0, 0.0])
+
+    distance = 20.0 * np.pi / 180.0 * 3959.0
+    assert hours[0] == pytest.approx(distance / (AVERAGE_CRUISE_SPEED_MPH + 100.0), rel=1e-3)
+    assert hours[1] == pytest.approx(distance / (AVERAGE_CRUISE_SPEED_MPH - 100.0), rel=1e-3)
+
+
+def test_interpolation_wraps_antimeridian():
+    """Points near 180° interpolate between the last and first longitude columns."""
+    latitudes = np.array([-10.0, 10.0])
+    longitudes = np.arange(-180.0, 180.0, 90.0)
+    u = np.zeros((1, 2, 4))
+    u[:, :, 0] = 40.0   # -180
+    u[:, :, 3] = 20.0   # 90
+    field = WindField(latitudes, longitudes, [350.0], u, np.zeros_like(u))
+
+    wind_u, _ = field.wind_at([0.0], [135.0], 350)
+    assert wind_u[0] == pytest.approx(30.0)
+
+
+def test_load_wind_field_converts_units(tmp_path):
+    path = tmp_path / "winds.npz"
+    np.savez(path, latitudes=[-10.0, 10.0], longitudes=[0.0, 10.0], levels=[350.0],
+             u=np.full((1, 2, 2), 10.0), v=np.zeros((1, 2, 2)), units='knots')
+
+    field = load_wind_field(path)
+    assert field.u_mph[0, 0, 0] == pytest.approx(11.50779)
+    assert load_wind_field(tmp_path / "missing.npz") is None
@@ -0,0 +1,49 @@
+"""Process-wide cached resources shared by every Streamlit page and session."""
+import streamlit as st
+from models.airport_columns import AirportColumns
+from services.airport_loader import load_airports
+from services.aircraft_performance import load_aircraft_profiles
+from services.shared_store import attach_airport_data
+
+
+@st.cache_resource
+def get_airport_database():
+    return load_airports()
+
+
+@st.cache_resource
+def get_aircraft_profiles():
+    return load_aircraft_profiles()
+
+
+@st.cache_resource
+def get_airport_columns():
+    """Airport columns alone, for pages that do not need the distance matrix."""
+    return AirportColumns.from_airports(get_airport_database())
+
+
+@st.cache_resource
+def _attach_shared_airport_data():
+    return attach_airport_data()
+
+
+def get_shared_airport_data():
+    """
+    Attach read-only to the memory-mapped airport columns and distance matrix.
+
+    Publishing is left to `python main.py publish` (it can take minutes), so
+    this returns None until that has run; a miss is not cached.
+    """
+    shared = _attach_shared_airport_data()
+    if shared is None:
+        _attach_shared_airport_data.clear()
+    return shared
+
+
+@st.cache_resource
+def get_max_route_distance():
+    """Longest distance in the shared matrix (miles), scanned once per process."""
+    shared = get_shared_airport_data()
+    if shared is None or shared.distance_matrix is None or len(shared.columns) == 0:
+        return 0.0
+    return float(shared.distance_matrix.max())
@@ -1,4 +1,13 @@
 """Presentation logic for flight route information."""
+from config.constants import AVERAGE_CRUISE_SPEED_MPH
+
+
+def describe_time_basis(route):
+    """Describe what a route's flight time estimate is based on."""
+    if route.aircraft_type:
+        return f"{route.aircraft_type} climb/cruise/descent profile"
+    return f"{AVERAGE_CRUISE_SPEED_MPH:.0f} mph average commercial speed"
+
 
 def display_route_info(route):
     """Display formatted flight route information."""
@@ -32,14 +41,19 @@ def display_route_info(route):
     print(f"\n  ESTIMATED FLIGHT TIME:")
     print(f"   Duration: {hours}h {minutes}m")
     print(f"   Total Hours: {route.estimated_flight_hours:.2f}")
-    print(f"   (Based on 500 mph average commercial speed)")
+    print(f"   (Based on {describe_time_basis(route)})")
+    
+    if route.block_hours is not None:
+        print(f"\n  BLOCK TIME & FUEL ({route.aircraft_type}):")
+        print(f"   Block Hours: {route.block_hours:.2f}")
+        print(f"   Fuel Burn: {route.fuel_burn_kg:,.0f} kg")
     
     print("\n" + "="*70)
 
 
 def display_batch_analysis(analysis):
     """Display summary statistics for batch route analysis."""
-    if not analysis.routes:
+    if not analysis.get_total_routes():
         print("  No routes to analyze")
         return
     
@@ -54,6 +68,9 @@ def display_batch_analysis(analysis):
     print(f"   Average Distance: {analysis.average_distance_miles:,.2f} miles")
     print(f"   Total Flight Time: {analysis.total_flight_time_hours:.2f} hours")
     print(f"   Average Flight Time: {analysis.average_flight_time_hours:.2f} hours")
+    if analysis.total_block_hours is not None:
+        print(f"   Total Block Time: {analysis.total_block_hours:.2f} hours")
+        print(f"   Total Fuel Burn: {analysis.total_fuel_burn_kg:,.0f} kg")
     
     # Shortest route
     if analysis.shortest_route:
@@ -72,6 +89,96 @@ def display_batch_analysis(analysis):
     print("\n" + "="*70)
 
 
+def display_grouped_analysis(grouped, limit=None):
+    """Display grouped batch statistics (a GroupedPartial) as a table."""
+    rows = grouped.get_rows()
+    if not rows:
+        print("  No routes to group")
+        return
+    
+    title = grouped.group_by.replace("_", " ").upper()
+    print("\n" + "="*70)
+    print(f"ROUTES BY {title}")
+    print("="*70)
+    print(f"   {'Group':<32s} {'Routes':>7s} {'Avg Miles':>10s} {'Longest':>9s} {'Hours':>9s}")
+    for row in rows[:limit]:
+        print(f"   {row['group'][:32]:<32s} {row['routes']:>7,d} "
+              f"{row['average_distance_miles']:>10,.0f} {row['longest_miles']:>9,.0f} "
+              f"{row['total_flight_hours']:>9,.1f}")
+    if limit is not None and len(rows) > limit:
+        print(f"   ... {len(rows) - limit} more groups")
+    print("="*70)
+
+
+def display_top_routes(batch, title):
+    """Display a ranked RouteBatch (e.g. from global_top_k_routes) as a table."""
+    if not len(batch):
+        print("  No routes found")
+        return
+    
+    print("\n" + "="*70)
+    print(title.upper())
+    print("="*70)
+    print(f"   {'#':>4s}  {'Route':<12s} {'Miles':>10s} {'Km':>10s} {'Bearing':>8s} {'Hours':>7s}")
+    for rank, route in enumerate(batch, start=1):
+        print(f"   {rank:>4d}  {route.origin.code + ' → ' + route.destination.code:<12s} "
+              f"{route.distance_miles:>10,.2f} {route.distance_km:>10,.2f} "
+              f"{route.bearing_degrees:>7.1f}° {route.estimated_flight_hours:>7.2f}")
+    print("="*70)
+
+
+def display_clusters(result, limit=None):
+    """Display hub clusters (a ClusteringResult) and the airport-to-hub distance distribution."""
+    rows = result.get_rows()
+    if not rows:
+        print("  No clusters to show")
+        return
+    
+    print("\n" + "="*70)
+    print(f"AIRPORT CLUSTERS ({result.method.upper()}, {len(result)} HUBS)")
+    print("="*70)
+    distribution = result.get_distance_distribution()
+    print("   Distance to hub: " + ", ".join(
+        f"{name.replace('_miles', '')} {miles:,.0f} mi" for name, miles in distribution.items()))
+    print(f"\n   {'Hub':<16s} {'Airports':>8s} {'Weight':>10s} {'Mean':>8s} {'P90':>8s} {'Max':>8s}")
+    for row in rows[:limit]:
+        # Empty clusters have NaN distance stats
+        miles = [f"{row[key]:>8,.0f}" if row[key] == row[key] else f"{'-':>8s}"
+                 for key in ('mean_miles', 'p90_miles', 'max_miles')]
+        print(f"   {row['hub']:<16s} {row['airports']:>8,d} {row['weight']:>10,.0f} {' '.join(miles)}")
+    if limit is not None and len(rows) > limit:
+        print(f"   ... {len(rows) - limit} more clusters")
+    print("="*70)
+
+
+def display_schedule_summary(summary, group_by="flight_number", limit=None):
+    """Display weekly schedule totals (a ScheduleSummary) per flight number or country pair."""
+    rows = summary.get_rows(group_by)
+    if not rows:
+        print("  No scheduled legs in the period")
+        return
+    
+    hours = "block_hours" if summary.has_performance else "flight_hours"
+    print("\n" + "="*70)
+    print(f"SCHEDULE TOTALS BY {group_by.replace('_', ' ').upper()}")
+    print("="*70)
+    print(f"   Period: {summary.period_start} to {summary.period_end} ({summary.get_weeks():.1f} weeks)")
+    print(f"   Legs: {summary.total_legs:,} from {summary.schedule_rows:,} schedule rows "
+          f"({summary.unique_pairs:,} unique airport pairs)")
+    skipped = {reason: count for reason, count in summary.skipped.items() if count}
+    if skipped:
+        print("   Skipped rows: " + ", ".join(f"{reason.replace('_', ' ')} {count:,}"
+                                            for reason, count in skipped.items()))
+    hours_label = "Block h/wk" if summary.has_performance else "Air h/wk"
+    print(f"\n   {'Group':<24s} {'Legs/wk':>8s} {'Miles/wk':>12s} {hours_label:>10s}")
+    for row in rows[:limit]:
+        print(f"   {row['label']:<24s} {row['weekly_legs']:>8,.1f} "
+              f"{row['weekly_distance_miles']:>12,.0f} {row[f'weekly_{hours}']:>10,.1f}")
+    if limit is not None and len(rows) > limit:
+        print(f"   ... {len(rows) - limit} more groups")
+    print("="*70)
+
+
 def display_available_airports(airports):
     """Display available airports in a clean, sorted format."""
     print("\nAVAILABLE AIRPORTS:")
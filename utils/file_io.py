@@ -1,13 +1,51 @@
 """File I/O operations for saving analysis results."""
+import csv
 import os
 from datetime import datetime
+from utils.display import describe_time_basis
+
+REPORT_HEADER_TEMPLATE = (
+    "FLIGHT ROUTE ANALYSIS REPORT\n"
+    + "="*60 + "\n"
+    + "Generated: {generated}\n"
+    + "Tool: Flight Path Distance Calculator\n"
+    + "="*60 + "\n\n"
+)
+REPORT_FOOTER = "\n" + "="*60 + "\nReport generated by Flight Path Distance Calculator"
+
+# Single-route report body; formatted once per route with format_map
+ROUTE_REPORT_TEMPLATE = (
+    "SINGLE ROUTE ANALYSIS\n"
+    + "-"*60 + "\n\n"
+    + "Route: {origin.code} → {destination.code}\n"
+    + "From: {origin.name} ({origin.city}, {origin.country})\n"
+    + "To: {destination.name} ({destination.city}, {destination.country})\n"
+    + "Coordinates: {origin_coordinates} → {destination_coordinates}\n\n"
+    + "DISTANCE:\n"
+    + "   Miles:          {distance_miles:,.2f}\n"
+    + "   Kilometers:     {distance_km:,.2f}\n"
+    + "   Nautical Miles: {distance_nautical_miles:,.2f}\n\n"
+    + "NAVIGATION:\n"
+    + "   Initial Bearing:    {bearing_degrees}°\n"
+    + "   Compass Direction:  {compass_direction}\n\n"
+    + "ESTIMATED FLIGHT TIME:\n"
+    + "   Duration:     {hours}h {minutes}m\n"
+    + "   Total Hours:  {estimated_flight_hours:.2f}\n"
+    + "   (Based on {time_basis})\n"
+)
+ROUTE_PERFORMANCE_TEMPLATE = (
+    "\nBLOCK TIME & FUEL ({aircraft_type}):\n"
+    + "   Block Hours:  {block_hours:.2f}\n"
+    + "   Fuel Burn:    {fuel_burn_kg:,.0f} kg\n"
+)
+
 
 def save_route_analysis(analysis, filename="flight_analysis.txt"):
     """
     Save flight route analysis to a text file.
     
     Args:
-        analysis: FlightRoute or BatchAnalysis object
+        analysis: FlightRoute, BatchAnalysis or GroupedPartial object
         filename: Output filename
     
     Returns:
@@ -20,11 +58,8 @@ def save_route_analysis(analysis, filename="flight_analysis.txt"):
             os.makedirs(output_dir)
         
         with open(filename, 'w') as file:
-            file.write("FLIGHT ROUTE ANALYSIS REPORT\n")
-            file.write("="*60 + "\n")
-            file.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            file.write(f"Tool: Flight Path Distance Calculator\n")
-            file.write("="*60 + "\n\n")
+            file.write(REPORT_HEADER_TEMPLATE.format(
+                generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
             
             # Handle single route
             if hasattr(analysis, 'origin') and hasattr(analysis, 'destination'):
@@ -34,8 +69,11 @@ def save_route_analysis(analysis, filename="flight_analysis.txt"):
             elif hasattr(analysis, 'routes'):
                 _write_batch_analysis(file, analysis)
             
-            file.write("\n" + "="*60)
-            file.write("\nReport generated by Flight Path Distance Calculator")
+            # Handle grouped statistics
+            elif hasattr(analysis, 'group_by'):
+                _write_grouped_analysis(file, analysis)
+            
+            file.write(REPORT_FOOTER)
         
         print(f"  Analysis saved to '{filename}'")
         return True
@@ -45,30 +83,24 @@ def save_route_analysis(analysis, filename="flight_analysis.txt"):
         return False
 
 
+def format_route_report(route):
+    """Render the single-route report body for a FlightRoute."""
+    hours, minutes = route.get_duration_minutes()
+    fields = dict(vars(route),
+                  origin_coordinates=route.origin.get_coordinates(),
+                  destination_coordinates=route.destination.get_coordinates(),
+                  hours=hours,
+                  minutes=minutes,
+                  time_basis=describe_time_basis(route))
+    text = ROUTE_REPORT_TEMPLATE.format_map(fields)
+    if route.block_hours is not None:
+        text += ROUTE_PERFORMANCE_TEMPLATE.format_map(fields)
+    return text
+
+
 def _write_single_route(file, route):
     """Helper to write single route details to file."""
-    file.write("SINGLE ROUTE ANALYSIS\n")
-    file.write("-"*60 + "\n\n")
-    
-    file.write(f"Route: {route.origin.code} → {route.destination.code}\n")
-    file.write(f"From: {route.origin.name} ({route.origin.city}, {route.origin.country})\n")
-    file.write(f"To: {route.destination.name} ({route.destination.city}, {route.destination.country})\n")
-    file.write(f"Coordinates: {route.origin.get_coordinates()} → {route.destination.get_coordinates()}\n\n")
-    
-    file.write("DISTANCE:\n")
-    file.write(f"   Miles:          {route.distance_miles:,.2f}\n")
-    file.write(f"   Kilometers:     {route.distance_km:,.2f}\n")
-    file.write(f"   Nautical Miles: {route.distance_nautical_miles:,.2f}\n\n")
-    
-    file.write("NAVIGATION:\n")
-    file.write(f"   Initial Bearing:    {route.bearing_degrees}°\n")
-    file.write(f"   Compass Direction:  {route.compass_direction}\n\n")
-    
-    hours, minutes = route.get_duration_minutes()
-    file.write("ESTIMATED FLIGHT TIME:\n")
-    file.write(f"   Duration:     {hours}h {minutes}m\n")
-    file.write(f"   Total Hours:  {route.estimated_flight_hours:.2f}\n")
-    file.write(f"   (Based on 500 mph average speed)\n")
+    file.write(format_route_report(route))
 
 
 def _write_batch_analysis(file, analysis):
@@ -81,7 +113,11 @@ def _write_batch_analysis(file, analysis):
     file.write(f"   Total Distance:      {analysis.total_distance_miles:,.2f} miles\n")
     file.write(f"   Average Distance:    {analysis.average_distance_miles:,.2f} miles\n")
     file.write(f"   Total Flight Time:   {analysis.total_flight_time_hours:.2f} hours\n")
-    file.write(f"   Average Flight Time: {analysis.average_flight_time_hours:.2f} hours\n\n")
+    file.write(f"   Average Flight Time: {analysis.average_flight_time_hours:.2f} hours\n")
+    if analysis.total_block_hours is not None:
+        file.write(f"   Total Block Time:    {analysis.total_block_hours:.2f} hours\n")
+        file.write(f"   Total Fuel Burn:     {analysis.total_fuel_burn_kg:,.0f} kg\n")
+    file.write("\n")
     
     if analysis.shortest_route:
         file.write("SHORTEST ROUTE:\n")
@@ -101,4 +137,48 @@ def _write_batch_analysis(file, analysis):
         file.write(f"\nRoute {i}: {route.origin.code} → {route.destination.code}\n")
         file.write(f"Distance: {route.distance_miles:,.2f} miles | "
                   f"Bearing: {route.bearing_degrees}° ({route.compass_direction}) | "
-                  f"Time: {route.estimated_flight_hours:.2f}h")
\ No newline at end of file
+                  f"Time: {route.estimated_flight_hours:.2f}h")
+
+
+def _write_grouped_analysis(file, grouped):
+    """Helper to write grouped batch statistics to file."""
+    file.write(f"ROUTES BY {grouped.group_by.replace('_', ' ').upper()}\n")
+    file.write("-"*60 + "\n")
+    
+    for row in grouped.get_rows():
+        file.write(f"\n{row['group']}\n")
+        file.write(f"   Routes:            {row['routes']:,}\n")
+        file.write(f"   Total Distance:    {row['total_distance_miles']:,.2f} miles\n")
+        file.write(f"   Average Distance:  {row['average_distance_miles']:,.2f} miles\n")
+        file.write(f"   Shortest/Longest:  {row['shortest_miles']:,.2f} / {row['longest_miles']:,.2f} miles\n")
+        file.write(f"   Total Flight Time: {row['total_flight_hours']:.2f} hours\n")
+        if 'total_block_hours' in row:
+            file.write(f"   Total Block Time:  {row['total_block_hours']:.2f} hours\n")
+            file.write(f"   Total Fuel Burn:   {row['total_fuel_burn_kg']:,.0f} kg\n")
+
+
+def save_grouped_csv(grouped, filename):
+    """
+    Save grouped batch statistics as CSV, one row per group.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        output_dir = os.path.dirname(filename)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        rows = grouped.get_rows()
+        with open(filename, 'w', newline='') as file:
+            fieldnames = list(rows[0]) if rows else ['group', 'routes']
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        print(f"  Grouped statistics saved to '{filename}'")
+        return True
+        
+    except Exception as e:
+        print(f"  Error saving grouped statistics to '{filename}': {e}")
+        return False
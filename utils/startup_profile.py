@@ -0,0 +1,77 @@
+"""Import-time and startup profiling for short-lived command-line runs."""
+import builtins
+import sys
+import time
+
+# Slowest imports listed in the report
+STARTUP_PROFILE_TOP = 15
+
+
+class StartupProfiler:
+    # Times every first-time import while installed, plus total run time
+    #
+    # builtins.__import__ is wrapped so each import that loads new modules
+    # is recorded with its inclusive time and its self time (inclusive minus
+    # the imports it triggered). The report goes to stderr so stdout stays
+    # clean for pipelines.
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.installed_at = None
+        self.records = []
+        self._stack = []
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in sys.modules and not fromlist:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        modules_before = len(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if len(sys.modules) > modules_before:
+                package = globals.get('__package__') if level and globals else None
+                label = f"{'.' * level}{name}" + (f" (from {package})" if package else "")
+                self.records.append((label, elapsed, elapsed - nested))
+
+    def install(self):
+        self.installed_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        return self
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def format_report(self, top=STARTUP_PROFILE_TOP):
+        """Startup summary and the slowest imports by self time."""
+        total = time.perf_counter() - self.started
+        imports = sum(self_time for _, _, self_time in self.records)
+        installed_at = self.installed_at or self.started
+        lines = [
+            "",
+            "  STARTUP PROFILE",
+            f"   Total run time:        {total * 1000:8.1f} ms",
+            f"   Before profiling:      {(installed_at - self.started) * 1000:8.1f} ms",
+            f"   Imports while running: {imports * 1000:8.1f} ms "
+            f"({len(self.records)} imports, {len(sys.modules)} modules loaded)",
+            "   Interpreter startup is not included; compare with 'python -X importtime'.",
+            "",
+            f"   {'Self ms':>8s} {'Incl. ms':>9s}  Import",
+        ]
+        for label, inclusive, self_time in sorted(self.records, key=lambda r: -r[2])[:top]:
+            lines.append(f"   {self_time * 1000:8.1f} {inclusive * 1000:9.1f}  {label}")
+        return "\n".join(lines)
+
+    def report(self, stream=None):
+        self.uninstall()
+        print(self.format_report(), file=stream or sys.stderr)